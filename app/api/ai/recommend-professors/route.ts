@@ -1,5 +1,7 @@
 import { NextResponse } from "next/server";
-import { recommendProfessors } from "@/lib/ai";
+import { recommendProfessors, streamProfessorRecommendations } from "@/lib/ai";
+
+const NDJSON = "application/x-ndjson";
 
 export async function POST(req: Request) {
   const { query } = await req.json();
@@ -7,6 +9,13 @@ export async function POST(req: Request) {
     return NextResponse.json({ error: "Query is required" }, { status: 400 });
   }
 
+  // Callers that accept NDJSON get the teachers first and the explanation as it is written
+  if (req.headers.get("accept")?.includes(NDJSON)) {
+    return new Response(toNdjson(streamProfessorRecommendations(query)), {
+      headers: { "Content-Type": NDJSON, "Cache-Control": "no-cache" },
+    });
+  }
+
   const { teachers, explanation } = await recommendProfessors(query);
 
   return NextResponse.json({
@@ -14,3 +23,29 @@ export async function POST(req: Request) {
     explanation,
   });
 }
+
+/**
+ * Serialize chunks as newline-delimited JSON, one line per chunk.
+ * Chunks are pulled only when the client reads, so slow readers apply backpressure.
+ */
+function toNdjson(chunks: AsyncGenerator<object>): ReadableStream<Uint8Array> {
+  const encoder = new TextEncoder();
+  return new ReadableStream({
+    async pull(controller) {
+      try {
+        const { value, done } = await chunks.next();
+        if (done) {
+          controller.close();
+        } else {
+          controller.enqueue(encoder.encode(JSON.stringify(value) + "\n"));
+        }
+      } catch (error) {
+        console.error("Recommendation stream failed:", error);
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await chunks.return(undefined);
+    },
+  });
+}
@@ -12,7 +12,11 @@
 
 import OpenAI from "openai";
 import { prisma } from "./prisma";
-import type { ProfessorRecommendationResponse, TeacherProfileWithUser } from "@/types";
+import type {
+  ProfessorRecommendationChunk,
+  ProfessorRecommendationResponse,
+  TeacherProfileWithUser,
+} from "@/types";
 
 /**
  * Initialize OpenAI client with API key from environment
@@ -54,39 +58,7 @@ export async function recommendProfessors(
       throw new Error("Query cannot be empty");
     }
 
-    const normalizedQuery = query.trim().toLowerCase();
-
-    // Search database for matching teachers
-    const teachers = await prisma.teacherProfile.findMany({
-      where: {
-        AND: [
-          { isActive: true },
-          {
-            OR: [
-              { bio: { contains: normalizedQuery, mode: "insensitive" } },
-              { subjects: { hasSome: [normalizedQuery] } },
-              {
-                user: {
-                  name: { contains: normalizedQuery, mode: "insensitive" },
-                },
-              },
-            ],
-          },
-        ],
-      },
-      include: {
-        user: {
-          select: {
-            id: true,
-            name: true,
-            email: true,
-            image: true,
-          },
-        },
-      },
-      orderBy: [{ rating: "desc" }, { totalReviews: "desc" }],
-      take: limit,
-    });
+    const teachers = await findMatchingTeachers(query, limit);
 
     // If OpenAI is not configured, return database results only
     if (!openai || !process.env.OPENAI_API_KEY) {
@@ -106,20 +78,8 @@ export async function recommendProfessors(
       };
     }
 
-    // Prepare teacher data for AI
-    const teacherSummaries = teachers
-      .map(
-        (t, idx) =>
-          `${idx + 1}. ${t.user.name ?? "Professor"} (Rating: ${t.rating.toFixed(1)}/5.0, Reviews: ${t.totalReviews})
-   - Subjects: ${t.subjects.join(", ")}
-   - Languages: ${t.languages.join(", ")}
-   - Rate: $${t.hourlyRate}/hour
-   - Bio: ${t.bio?.substring(0, 200) ?? "Experienced educator"}`
-      )
-      .join("\n\n");
-
     // Generate AI explanation
-    const explanation = await generateAIExplanation(query, teacherSummaries);
+    const explanation = await generateAIExplanation(query, summarizeTeachers(teachers));
 
     return {
       teachers: teachers.map(formatTeacherForResponse),
@@ -134,41 +94,177 @@ export async function recommendProfessors(
 }
 
 /**
- * Generate AI explanation for professor recommendations
+ * Stream professor recommendations as they become available
  *
- * @param {string} query - Student's original query
- * @param {string} teacherSummaries - Formatted teacher data
- * @returns {Promise<string>} AI-generated explanation
- * @private
+ * Yields the matching teachers as soon as the database answers, then the AI
+ * explanation in pieces as the model writes it. The next piece is only read
+ * from OpenAI when the consumer asks for it, so a slow reader slows the model
+ * stream down instead of piling it up in memory.
+ *
+ * @param {string} query - Student's learning request
+ * @param {number} limit - Maximum number of teachers to return (default: 5)
+ * @yields {ProfessorRecommendationChunk} Teachers first, then explanation pieces
+ * @throws {Error} If the query is empty or the database query fails
  */
-async function generateAIExplanation(query: string, teacherSummaries: string): Promise<string> {
-  if (!openai) {
-    return "AI recommendations unavailable.";
+export async function* streamProfessorRecommendations(
+  query: string,
+  limit: number = 5
+): AsyncGenerator<ProfessorRecommendationChunk> {
+  if (!query || query.trim().length === 0) {
+    throw new Error("Query cannot be empty");
+  }
+
+  const teachers = await findMatchingTeachers(query, limit);
+  yield { teachers: teachers.map(formatTeacherForResponse) };
+
+  if (!openai || !process.env.OPENAI_API_KEY) {
+    yield {
+      explanation:
+        "OpenAI API key is not configured. Showing matching professors from database based on your search criteria.",
+    };
+    return;
+  }
+  if (teachers.length === 0) {
+    yield {
+      explanation:
+        "No professors found matching your query. Try broadening your search or contact support for personalized recommendations.",
+    };
+    return;
   }
 
   try {
-    const chat = await openai.chat.completions.create({
-      model: "gpt-4o-mini",
-      temperature: 0.7,
-      max_tokens: 500,
-      messages: [
+    const stream = await openai.chat.completions.create({
+      ...explanationRequest(query, summarizeTeachers(teachers)),
+      stream: true,
+    });
+    for await (const chunk of stream) {
+      const delta = chunk.choices[0]?.delta?.content;
+      if (delta) {
+        yield { explanation: delta };
+      }
+    }
+  } catch (error) {
+    console.error("OpenAI API error:", error);
+    yield {
+      explanation:
+        "I've found professors matching your request. Please review their profiles above to find the best fit for your learning goals.",
+    };
+  }
+}
+
+/**
+ * Search the database for active teachers matching a query
+ *
+ * @param {string} query - Student's learning request
+ * @param {number} limit - Maximum number of teachers to return
+ * @returns Best rated matches first, with their user profile
+ * @private
+ */
+async function findMatchingTeachers(query: string, limit: number) {
+  const normalizedQuery = query.trim().toLowerCase();
+
+  return prisma.teacherProfile.findMany({
+    where: {
+      AND: [
+        { isActive: true },
         {
-          role: "system",
-          content: `You are a helpful educational advisor that matches students with professors for 1-on-1 online lessons.
+          OR: [
+            { bio: { contains: normalizedQuery, mode: "insensitive" } },
+            { subjects: { hasSome: [normalizedQuery] } },
+            {
+              user: {
+                name: { contains: normalizedQuery, mode: "insensitive" },
+              },
+            },
+          ],
+        },
+      ],
+    },
+    include: {
+      user: {
+        select: {
+          id: true,
+          name: true,
+          email: true,
+          image: true,
+        },
+      },
+    },
+    orderBy: [{ rating: "desc" }, { totalReviews: "desc" }],
+    take: limit,
+  });
+}
+
+/**
+ * Format teachers as a numbered list for the AI prompt
+ *
+ * @param {TeacherProfileWithUser[]} teachers - Teachers from findMatchingTeachers
+ * @returns {string} One paragraph per teacher
+ * @private
+ */
+function summarizeTeachers(teachers: TeacherProfileWithUser[]): string {
+  return teachers
+    .map(
+      (t, idx) =>
+        `${idx + 1}. ${t.user.name ?? "Professor"} (Rating: ${t.rating.toFixed(1)}/5.0, Reviews: ${t.totalReviews})
+   - Subjects: ${t.subjects.join(", ")}
+   - Languages: ${t.languages.join(", ")}
+   - Rate: $${t.hourlyRate}/hour
+   - Bio: ${t.bio?.substring(0, 200) ?? "Experienced educator"}`
+    )
+    .join("\n\n");
+}
+
+/**
+ * Build the chat completion request behind recommendation explanations
+ *
+ * @param {string} query - Student's original query
+ * @param {string} teacherSummaries - Formatted teacher data
+ * @returns Model, sampling settings and prompt messages
+ * @private
+ */
+function explanationRequest(query: string, teacherSummaries: string) {
+  return {
+    model: "gpt-4o-mini",
+    temperature: 0.7,
+    max_tokens: 500,
+    messages: [
+      {
+        role: "system",
+        content: `You are a helpful educational advisor that matches students with professors for 1-on-1 online lessons.
 Your task is to analyze the student's request and recommend 2-3 professors from the available list, explaining why they're a good match.
 Be friendly, concise, and focus on how each professor's expertise aligns with the student's needs.`,
-        },
-        {
-          role: "user",
-          content: `Student request: "${query}"
+      },
+      {
+        role: "user",
+        content: `Student request: "${query}"
 
 Available professors:
 ${teacherSummaries}
 
 Please recommend the 2-3 best professors for this student and explain why they're a great match. Keep your response under 150 words.`,
-        },
-      ],
-    });
+      },
+    ],
+  } satisfies OpenAI.Chat.ChatCompletionCreateParamsNonStreaming;
+}
+
+/**
+ * Generate AI explanation for professor recommendations
+ *
+ * @param {string} query - Student's original query
+ * @param {string} teacherSummaries - Formatted teacher data
+ * @returns {Promise<string>} AI-generated explanation
+ * @private
+ */
+async function generateAIExplanation(query: string, teacherSummaries: string): Promise<string> {
+  if (!openai) {
+    return "AI recommendations unavailable.";
+  }
+
+  try {
+    const chat = await openai.chat.completions.create(
+      explanationRequest(query, teacherSummaries)
+    );
 
     return (
       chat.choices[0]?.message?.content ??
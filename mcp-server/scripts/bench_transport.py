@@ -0,0 +1,154 @@
+"""
+Transport Benchmark: Unix Domain Socket vs Loopback TCP
+=======================================================
+
+Measures request latency, throughput and client CPU time for the shared
+API client (learnai_mcp.client.ApiClient) over loopback TCP and over a Unix
+domain socket. The workload is a small GET like the one get_booking_status
+sends.
+
+By default a stub backend is started twice, once per transport, in separate
+processes, so only the transport differs. Use --tcp-url / --unix-url to
+measure a real backend instead (for example a Next.js custom server
+listening on both).
+
+Usage:
+    python scripts/bench_transport.py --requests 5000 --concurrency 16
+    python scripts/bench_transport.py --tcp-url http://localhost:3000 \\
+        --unix-url unix:///run/learnai/api.sock --path /api/bookings/demo
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from learnai_mcp.client import ApiClient
+
+_BOOKING = (
+    b'{"id":"demo","status":"confirmed","subject":"Mathematics",'
+    b'"scheduledFor":"2026-03-01T14:00:00Z","durationMinutes":60,'
+    b'"teacher":{"name":"Dr. Bob Chen"}}'
+)
+
+
+async def stub_app(scope, receive, send):  # type: ignore[no-untyped-def]
+    """Minimal ASGI backend answering every request with a booking."""
+    if scope["type"] != "http":
+        return
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": _BOOKING})
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def _start_stub(bind: list[str]) -> subprocess.Popen[bytes]:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "bench_transport:stub_app",
+            "--app-dir", str(Path(__file__).parent), "--log-level", "warning",
+            "--no-access-log", *bind,
+        ]
+    )
+
+
+async def _wait_ready(api: ApiClient, path: str, timeout: float = 10.0) -> None:
+    client = await api.get()
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get(path)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def _run(url: str, path: str, requests: int, concurrency: int) -> dict[str, float]:
+    api = ApiClient(url, max_connections=concurrency, max_keepalive=concurrency)
+    await _wait_ready(api, path)
+    client = await api.get()
+    latencies: list[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    await api.aclose()
+
+    latencies.sort()
+    return {
+        "rps": requests / wall,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "cpu_us_per_req": 1e6 * cpu / requests,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare UDS and loopback TCP transports")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--path", default="/api/bookings/demo")
+    parser.add_argument("--tcp-url", help="Existing backend over TCP (default: start a stub)")
+    parser.add_argument("--unix-url", help="Existing backend over UDS (default: start a stub)")
+    args = parser.parse_args()
+
+    stubs: list[subprocess.Popen[bytes]] = []
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        tcp_url = args.tcp_url
+        if tcp_url is None:
+            port = _free_port()
+            stubs.append(_start_stub(["--host", "127.0.0.1", "--port", str(port)]))
+            tcp_url = f"http://127.0.0.1:{port}"
+        unix_url = args.unix_url
+        if unix_url is None:
+            sock = os.path.join(tmp.name, "api.sock")
+            stubs.append(_start_stub(["--uds", sock]))
+            unix_url = f"unix://{sock}"
+
+        print(f"{'transport':<10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'cpu us/req':>11}")
+        for name, url in (("tcp", tcp_url), ("unix", unix_url)):
+            result = asyncio.run(_run(url, args.path, args.requests, args.concurrency))
+            print(
+                f"{name:<10} {result['rps']:>10.0f} {result['p50_ms']:>8.3f} "
+                f"{result['p99_ms']:>8.3f} {result['cpu_us_per_req']:>11.1f}"
+            )
+    finally:
+        for stub in stubs:
+            stub.terminate()
+            stub.wait()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ agents can request tutoring matches, create bookings, and manage sessions.
 
 Usage:
     python -m learnai_mcp.a2a.agent --port 9200
+    python -m learnai_mcp.a2a.agent --port 9200 --workers 0 --max-requests 50000
 
 Registration with MCP Context Forge:
     curl -X POST "http://localhost:4444/a2a" \\
@@ -25,21 +26,120 @@ Registration with MCP Context Forge:
 """
 
 import argparse
+import asyncio
 import logging
 import os
 import uuid
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, aclosing, asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Annotated, Any, TypeVar
 
 import httpx
-import uvicorn
-from fastapi import FastAPI, Header, HTTPException, Request
-from pydantic import BaseModel
+from fastapi import (
+    Body,
+    FastAPI,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from starlette.types import Receive, Scope, Send
+
+from learnai_mcp import deadline, runner
+from learnai_mcp.a2a.tasks import TaskFailed, TaskStore
+from learnai_mcp.client import ApiClient
+from learnai_mcp.codec import JsonCodec, loads
+from learnai_mcp.limiter import Bulkhead, Overloaded
 
 logger = logging.getLogger(__name__)
 
 LEARNAI_API_URL = os.environ.get("LEARNAI_API_URL", "http://localhost:3000")
 LEARNAI_A2A_TOKEN = os.environ.get("LEARNAI_A2A_TOKEN", "")
 
-app = FastAPI(title="LearnAI A2A Agent", version="1.0.0")
+# Admission control: concurrent requests, bounded wait queue, max queue wait (seconds)
+LEARNAI_A2A_MAX_CONCURRENCY = int(os.environ.get("LEARNAI_A2A_MAX_CONCURRENCY", "32"))
+LEARNAI_A2A_MAX_QUEUE = int(os.environ.get("LEARNAI_A2A_MAX_QUEUE", "64"))
+LEARNAI_A2A_MAX_QUEUE_WAIT = float(os.environ.get("LEARNAI_A2A_MAX_QUEUE_WAIT", "2"))
+
+# Time budget per request in seconds (0 = none); callers may tighten it with
+# an X-Request-Timeout-Ms header. Keep it below the gateway's
+# MCPGATEWAY_A2A_DEFAULT_TIMEOUT (30s) so callers get an answer, not a timeout.
+LEARNAI_A2A_TIMEOUT = float(os.environ.get("LEARNAI_A2A_TIMEOUT", "25"))
+
+# JSON-RPC batches: maximum requests per batch, and how many of them run at once
+LEARNAI_A2A_MAX_BATCH = int(os.environ.get("LEARNAI_A2A_MAX_BATCH", "100"))
+LEARNAI_A2A_BATCH_CONCURRENCY = int(os.environ.get("LEARNAI_A2A_BATCH_CONCURRENCY", "8"))
+
+# WebSocket transport: requests in flight per connection before the agent stops
+# reading from it, and protocol ping interval / pong timeout in seconds (0 = off)
+LEARNAI_A2A_WS_MAX_IN_FLIGHT = int(os.environ.get("LEARNAI_A2A_WS_MAX_IN_FLIGHT", "32"))
+LEARNAI_A2A_WS_PING_INTERVAL = float(os.environ.get("LEARNAI_A2A_WS_PING_INTERVAL", "20"))
+LEARNAI_A2A_WS_PING_TIMEOUT = float(os.environ.get("LEARNAI_A2A_WS_PING_TIMEOUT", "20"))
+
+# Seconds a stream may outlive its deadline while a slow reader drains the last events
+LEARNAI_A2A_STREAM_GRACE = float(os.environ.get("LEARNAI_A2A_STREAM_GRACE", "5"))
+
+# Background tasks (params "async": true): tasks held at once, tasks running at
+# once, seconds a finished task is kept, seconds a task may run (0 = unbounded),
+# and the largest result kept, in bytes
+LEARNAI_A2A_MAX_TASKS = int(os.environ.get("LEARNAI_A2A_MAX_TASKS", "1000"))
+LEARNAI_A2A_TASK_CONCURRENCY = int(os.environ.get("LEARNAI_A2A_TASK_CONCURRENCY", "16"))
+LEARNAI_A2A_TASK_TTL = float(os.environ.get("LEARNAI_A2A_TASK_TTL", "300"))
+LEARNAI_A2A_TASK_TIMEOUT = float(os.environ.get("LEARNAI_A2A_TASK_TIMEOUT", "300"))
+LEARNAI_A2A_TASK_MAX_RESULT_BYTES = int(
+    os.environ.get("LEARNAI_A2A_TASK_MAX_RESULT_BYTES", str(256 * 1024))
+)
+
+# JSON-RPC error codes: unparsable JSON, invalid request, unknown or finished
+# task, and a request shed or out of time
+PARSE_ERROR_CODE = -32700
+INVALID_REQUEST_ERROR_CODE = -32600
+TASK_NOT_FOUND_ERROR_CODE = -32001
+TASK_NOT_CANCELABLE_ERROR_CODE = -32002
+OVERLOADED_ERROR_CODE = -32003
+DEADLINE_EXCEEDED_ERROR_CODE = -32004
+
+T = TypeVar("T")
+
+_api = ApiClient(LEARNAI_API_URL)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the upstream connection pool at startup and close it at shutdown."""
+    await _api.start()
+    try:
+        yield
+    finally:
+        _tasks.clear()
+        await _api.aclose()
+
+
+app = FastAPI(title="LearnAI A2A Agent", version="1.0.0", lifespan=_lifespan)
+
+_admission = Bulkhead(
+    "a2a",
+    LEARNAI_A2A_MAX_CONCURRENCY,
+    max_queue=LEARNAI_A2A_MAX_QUEUE,
+    max_wait=LEARNAI_A2A_MAX_QUEUE_WAIT,
+)
+
+_tasks = TaskStore(
+    max_tasks=LEARNAI_A2A_MAX_TASKS,
+    max_running=LEARNAI_A2A_TASK_CONCURRENCY,
+    ttl=LEARNAI_A2A_TASK_TTL,
+    max_result_bytes=LEARNAI_A2A_TASK_MAX_RESULT_BYTES,
+)
+
+# Methods that can run as background tasks
+_TASK_METHODS = frozenset({"invoke", "match_tutor", "create_booking", "check_availability"})
 
 
 # ---------------------------------------------------------------------------
@@ -50,37 +150,211 @@ app = FastAPI(title="LearnAI A2A Agent", version="1.0.0")
 class JSONRPCRequest(BaseModel):
     jsonrpc: str = "2.0"
     method: str
-    params: dict = {}
+    params: dict[str, Any] = {}
     id: str | int | None = None
 
 
 class JSONRPCResponse(BaseModel):
     jsonrpc: str = "2.0"
-    result: dict | None = None
-    error: dict | None = None
+    result: dict[str, Any] | None = None
+    error: dict[str, Any] | None = None
     id: str | int | None = None
 
 
+_rpc_response: JsonCodec[JSONRPCResponse] = JsonCodec(JSONRPCResponse)
+_rpc_batch: JsonCodec[list[JSONRPCResponse]] = JsonCodec(list[JSONRPCResponse])
+
+
+def _reply(rpc: JSONRPCResponse | list[JSONRPCResponse]) -> Response:
+    """Encode JSON-RPC responses directly, skipping FastAPI's re-validation and stdlib JSON.
+
+    Overloaded errors add a Retry-After header (the longest one for a batch).
+    """
+    responses = rpc if isinstance(rpc, list) else [rpc]
+    retry_after_ms = [
+        r.error["data"]["retry_after_ms"]
+        for r in responses
+        if r.error is not None and r.error.get("code") == OVERLOADED_ERROR_CODE
+    ]
+    headers = None
+    if retry_after_ms:
+        # Fail fast instead of queueing until the gateway times out.
+        headers = {"Retry-After": str(max(1, round(max(retry_after_ms) / 1000)))}
+    content = _rpc_batch.encode(rpc) if isinstance(rpc, list) else _rpc_response.encode(rpc)
+    return Response(content, media_type="application/json", headers=headers)
+
+
 # ---------------------------------------------------------------------------
 # A2A Endpoint
 # ---------------------------------------------------------------------------
 
 
-@app.post("/a2a")
+@app.post("/a2a", response_model=JSONRPCResponse | list[JSONRPCResponse])
 async def handle_a2a(
-    request: JSONRPCRequest,
+    http_request: Request,
+    payload: Annotated[JSONRPCRequest | list[Any], Body()],
     authorization: str | None = Header(default=None),
-) -> JSONRPCResponse:
-    """Handle A2A JSON-RPC requests from the MCP Context Forge gateway."""
-    # Validate bearer token if configured
-    if LEARNAI_A2A_TOKEN:
-        expected = f"Bearer {LEARNAI_A2A_TOKEN}"
-        if authorization != expected:
-            raise HTTPException(status_code=401, detail="Invalid A2A token")
+    x_request_timeout_ms: str | None = Header(default=None),
+) -> Response:
+    """Handle A2A JSON-RPC requests from the MCP Context Forge gateway.
+
+    The body is one request or a JSON-RPC 2.0 batch (an array of requests).
+    Batch items run concurrently, up to LEARNAI_A2A_BATCH_CONCURRENCY at a
+    time; each gets its own response (or error) with its id, and
+    notifications (items without an id) get none.
+
+    Streaming methods (``match_tutor.stream``) answer a single request with
+    Server-Sent Events instead; see :class:`_EventStreamResponse`. Other
+    methods called with ``"async": true`` in their params return a task at
+    once; see :func:`_submit_task`.
+
+    The request runs within LEARNAI_A2A_TIMEOUT, or the caller's
+    X-Request-Timeout-Ms if sooner, and is cancelled when the caller
+    disconnects, so upstream calls nobody waits for stop holding capacity.
+    """
+    if not _authorized(authorization):
+        raise HTTPException(status_code=401, detail="Invalid A2A token")
+
+    budget = deadline.tightest(LEARNAI_A2A_TIMEOUT, deadline.parse_timeout_ms(x_request_timeout_ms))
+    work: Awaitable[JSONRPCResponse | list[JSONRPCResponse]]
+    request_id: str | int | None = None
+    if isinstance(payload, JSONRPCRequest):
+        request_id = payload.id if payload.id is not None else str(uuid.uuid4())
+        if payload.method in _STREAMING_METHODS:
+            return await _open_stream(payload, request_id, budget)
+        work = _respond(payload, request_id)
+    elif not payload:
+        return _reply(_invalid_request("Empty batch"))
+    elif len(payload) > LEARNAI_A2A_MAX_BATCH:
+        return _reply(_invalid_request(f"At most {LEARNAI_A2A_MAX_BATCH} requests per batch"))
+    else:
+        work = _run_batch(payload)
+
+    result: JSONRPCResponse | list[JSONRPCResponse] | None
+    with deadline.scope(budget):
+        result = await _until_disconnected(http_request, work)
+    if result is None:
+        logger.info(
+            "A2A caller disconnected, request %s cancelled",
+            "batch" if request_id is None else request_id,
+        )
+        return _reply(
+            JSONRPCResponse(error={"code": -32000, "message": "Client disconnected"}, id=request_id)
+        )
+    if isinstance(result, list) and not result:
+        return Response(status_code=204)  # the batch held only notifications
+    return _reply(result)
+
+
+def _authorized(authorization: str | None) -> bool:
+    """Validate the bearer token, if one is configured."""
+    return not LEARNAI_A2A_TOKEN or authorization == f"Bearer {LEARNAI_A2A_TOKEN}"
+
+
+def _invalid_request(message: str, request_id: str | int | None = None) -> JSONRPCResponse:
+    return JSONRPCResponse(
+        error={"code": INVALID_REQUEST_ERROR_CODE, "message": message}, id=request_id
+    )
+
+
+async def _respond(request: JSONRPCRequest, request_id: str | int) -> JSONRPCResponse:
+    """Run one request within the current deadline, reporting shedding and timeouts as errors."""
+    try:
+        async with deadline.enforce():
+            return await _admitted(request, request_id)
+    except deadline.DeadlineExceeded:
+        return JSONRPCResponse(
+            error={"code": DEADLINE_EXCEEDED_ERROR_CODE, "message": "Deadline exceeded"},
+            id=request_id,
+        )
+    except Overloaded as e:
+        return _overloaded(e, request_id)
+
+
+def _overloaded(e: Overloaded, request_id: str | int) -> JSONRPCResponse:
+    return JSONRPCResponse(
+        error={
+            "code": OVERLOADED_ERROR_CODE,
+            "message": "Server overloaded",
+            "data": {"reason": e.reason, "retry_after_ms": e.retry_after_ms},
+        },
+        id=request_id,
+    )
+
+
+async def _run_batch(items: list[Any]) -> list[JSONRPCResponse]:
+    """Run a JSON-RPC batch concurrently; responses keep request order, minus notifications.
+
+    A malformed item or a failing call only affects its own response.
+    """
+    limiter = asyncio.Semaphore(LEARNAI_A2A_BATCH_CONCURRENCY)
+
+    async def run(item: Any) -> JSONRPCResponse | None:
+        request = _parse_item(item)
+        if isinstance(request, JSONRPCResponse):
+            return request
+        request_id = request.id if request.id is not None else str(uuid.uuid4())
+        async with limiter:
+            response = await _respond(request, request_id)
+        return None if _is_notification(item) else response
+
+    responses = await asyncio.gather(*(run(item) for item in items))
+    return [r for r in responses if r is not None]
+
+
+def _parse_item(item: Any) -> JSONRPCRequest | JSONRPCResponse:
+    """Validate one JSON-RPC request, or build its -32600 error response."""
+    try:
+        return JSONRPCRequest.model_validate(item)
+    except ValidationError:
+        item_id = item.get("id") if isinstance(item, dict) else None
+        return _invalid_request(
+            "Invalid Request", item_id if isinstance(item_id, str | int) else None
+        )
+
+
+def _is_notification(item: Any) -> bool:
+    return isinstance(item, dict) and "id" not in item
+
+
+async def _admitted(request: JSONRPCRequest, request_id: str | int) -> JSONRPCResponse:
+    """Dispatch a request once admission control lets it in."""
+    async with _admission.acquire():
+        return await _dispatch(request, request_id)
+
+
+async def _until_disconnected(http_request: Request, work: Awaitable[T]) -> T | None:
+    """Await ``work``, cancelling it (and returning None) if the client disconnects."""
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        if task.done():
+            return task.result()
+        return None
+    finally:
+        task.cancel()
+        watcher.cancel()
+
+
+async def _wait_for_disconnect(http_request: Request) -> None:
+    # The body has already been read, so the next ASGI message is the disconnect.
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
 
-    request_id = request.id or str(uuid.uuid4())
 
+async def _dispatch(request: JSONRPCRequest, request_id: str | int) -> JSONRPCResponse:
+    """Route a JSON-RPC request to its method handler."""
     try:
+        if request.method in _TASK_METHODS and request.params.get("async") is True:
+            return _submit_task(request, request_id)
+
+        if request.method == "tasks/get":
+            return _get_task(request.params, request_id)
+
+        if request.method == "tasks/cancel":
+            return _cancel_task(request.params, request_id)
+
         if request.method == "invoke":
             result = await _handle_invoke(request.params)
             return JSONRPCResponse(result=result, id=request_id)
@@ -97,6 +371,11 @@ async def handle_a2a(
             result = await _check_availability(request.params)
             return JSONRPCResponse(result=result, id=request_id)
 
+        if request.method in _STREAMING_METHODS:
+            return _invalid_request(
+                f"{request.method} streams its response and cannot be batched", request_id
+            )
+
         return JSONRPCResponse(
             error={"code": -32601, "message": f"Method not found: {request.method}"},
             id=request_id,
@@ -109,12 +388,347 @@ async def handle_a2a(
         )
 
 
+# ---------------------------------------------------------------------------
+# Background Tasks
+# ---------------------------------------------------------------------------
+
+
+def _submit_task(request: JSONRPCRequest, request_id: str | int) -> JSONRPCResponse:
+    """Start ``request`` as a background task and answer with the task at once.
+
+    The task runs within LEARNAI_A2A_TASK_TIMEOUT, counted from when it
+    starts running, instead of the submitting request's deadline.
+    """
+    params = {k: v for k, v in request.params.items() if k != "async"}
+    call = JSONRPCRequest(method=request.method, params=params, id=request_id)
+
+    async def work() -> dict[str, Any]:
+        with deadline.scope(deadline.tightest(LEARNAI_A2A_TASK_TIMEOUT)):
+            try:
+                async with deadline.enforce():
+                    response = await _dispatch(call, request_id)
+            except deadline.DeadlineExceeded:
+                raise TaskFailed(
+                    {"code": DEADLINE_EXCEEDED_ERROR_CODE, "message": "Deadline exceeded"}
+                ) from None
+        if response.error is not None:
+            raise TaskFailed(response.error)
+        return response.result or {}
+
+    try:
+        task = _tasks.submit(request.method, work)
+    except Overloaded as e:
+        return _overloaded(e, request_id)
+    return JSONRPCResponse(result=task.snapshot(), id=request_id)
+
+
+def _get_task(params: dict[str, Any], request_id: str | int) -> JSONRPCResponse:
+    """Report a task's state, with its result or error once it has finished."""
+    task = _tasks.get(str(params.get("task_id", "")))
+    if task is None:
+        return _task_not_found(request_id)
+    return JSONRPCResponse(result=task.snapshot(), id=request_id)
+
+
+def _cancel_task(params: dict[str, Any], request_id: str | int) -> JSONRPCResponse:
+    """Cancel an unfinished task."""
+    task = _tasks.get(str(params.get("task_id", "")))
+    if task is None:
+        return _task_not_found(request_id)
+    if task.done:
+        return JSONRPCResponse(
+            error={
+                "code": TASK_NOT_CANCELABLE_ERROR_CODE,
+                "message": f"Task is already {task.state}",
+            },
+            id=request_id,
+        )
+    _tasks.cancel(task)
+    return JSONRPCResponse(result=task.snapshot(), id=request_id)
+
+
+def _task_not_found(request_id: str | int) -> JSONRPCResponse:
+    return JSONRPCResponse(
+        error={"code": TASK_NOT_FOUND_ERROR_CODE, "message": "Task not found or expired"},
+        id=request_id,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming (Server-Sent Events)
+# ---------------------------------------------------------------------------
+
+
+# One streamed event: its name and payload
+_Event = tuple[str, dict[str, Any]]
+
+
+class _EventBuffer:
+    """Events handed from a producer task to one SSE reader.
+
+    The producer never waits for the reader. Explanation deltas that pile up
+    while the reader is busy are joined into a single event, so a slow reader
+    gets fewer, larger events while the upstream stream is read at full speed
+    and released as early as possible.
+    """
+
+    def __init__(self) -> None:
+        self._events: deque[_Event] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def put(self, kind: str, data: dict[str, Any]) -> None:
+        if kind == "explanation" and self._events and self._events[-1][0] == "explanation":
+            self._events[-1][1]["delta"] += data["delta"]
+        else:
+            self._events.append((kind, data))
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def __aiter__(self) -> AsyncIterator[_Event]:
+        while True:
+            while self._events:
+                yield self._events.popleft()
+            if self._closed:
+                return
+            self._ready.clear()
+            await self._ready.wait()
+
+
+async def _pump(events: AsyncGenerator[_Event, None], buffer: _EventBuffer) -> None:
+    """Move a method's events into ``buffer`` within the current deadline."""
+    try:
+        async with aclosing(events), deadline.enforce():
+            async for kind, data in events:
+                buffer.put(kind, data)
+    except deadline.DeadlineExceeded:
+        buffer.put("error", {"code": DEADLINE_EXCEEDED_ERROR_CODE, "message": "Deadline exceeded"})
+    except Exception as e:  # noqa: BLE001
+        logger.error("A2A stream failed: %s", e)
+        buffer.put("error", {"code": -32000, "message": str(e)})
+    finally:
+        buffer.close()
+
+
+def _event_response(kind: str, data: dict[str, Any], request_id: str | int) -> JSONRPCResponse:
+    """The JSON-RPC response carrying one streamed event."""
+    if kind == "error":
+        return JSONRPCResponse(error=data, id=request_id)
+    return JSONRPCResponse(result={"type": kind, **data}, id=request_id)
+
+
+def _sse(kind: str, rpc: JSONRPCResponse) -> bytes:
+    return b"event: " + kind.encode() + b"\ndata: " + _rpc_response.encode(rpc) + b"\n\n"
+
+
+class _EventStreamResponse(StreamingResponse):
+    """Server-Sent Events answering one streaming JSON-RPC request.
+
+    Each event's data is a JSON-RPC response carrying the request's id. Its
+    ``result.type`` repeats the event name; failures are sent as an ``error``
+    event with a JSON-RPC error. The method runs in its own task, started
+    when the response is sent and bounded by the request's deadline. The
+    task is cancelled and the admission slot released however the response
+    ends: completion, client disconnect, or a reader still behind
+    LEARNAI_A2A_STREAM_GRACE seconds after the deadline.
+    """
+
+    def __init__(
+        self,
+        request_id: str | int,
+        events: AsyncGenerator[_Event, None],
+        budget: float | None,
+        release: Callable[[], Awaitable[None]],
+    ) -> None:
+        self._events = events
+        self._buffer = _EventBuffer()
+        self._budget = budget
+        self._release = release
+        super().__init__(
+            self._frames(request_id),
+            media_type="text/event-stream",
+            # Stop proxies such as nginx from buffering the stream
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def _frames(self, request_id: str | int) -> AsyncIterator[bytes]:
+        async for kind, data in self._buffer:
+            yield _sse(kind, _event_response(kind, data, request_id))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            with deadline.scope(self._budget):
+                producer = asyncio.create_task(_pump(self._events, self._buffer))
+            try:
+                drain_by = None if self._budget is None else self._budget + LEARNAI_A2A_STREAM_GRACE
+                async with asyncio.timeout(drain_by):
+                    await super().__call__(scope, receive, send)
+            except TimeoutError:
+                logger.info("A2A stream reader fell behind its deadline, stream closed")
+            finally:
+                producer.cancel()
+        finally:
+            await self._release()
+
+
+async def _open_stream(
+    request: JSONRPCRequest, request_id: str | int, budget: float | None
+) -> Response:
+    """Admit a streaming request and answer it with Server-Sent Events.
+
+    Admission happens before the stream opens, so a shed request still gets
+    a plain JSON-RPC error and Retry-After header. From then on the response
+    owns the slot; if building it fails, the slot is released here.
+    """
+    slot = AsyncExitStack()
+    try:
+        await slot.enter_async_context(_admission.acquire())
+    except Overloaded as e:
+        return _reply(_overloaded(e, request_id))
+    try:
+        events = _STREAMING_METHODS[request.method](request.params)
+        return _EventStreamResponse(request_id, events, budget, slot.aclose)
+    except BaseException:
+        await slot.aclose()
+        raise
+
+
+# ---------------------------------------------------------------------------
+# WebSocket Transport
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class WebSocketStats:
+    """Counters describing WebSocket connections and the requests they carry."""
+
+    connections: int = 0
+    open: int = 0
+    rejected: int = 0
+    requests: int = 0
+
+
+_ws_stats = WebSocketStats()
+
+
+@app.websocket("/a2a/ws")
+async def a2a_websocket(websocket: WebSocket) -> None:
+    """Serve A2A JSON-RPC over one long-lived WebSocket connection.
+
+    The bearer token is checked once, at the handshake. Each text message
+    holds one request or batch, exactly as for POST /a2a, and answers are
+    sent as they finish, in any order, matched to requests by id. Up to
+    LEARNAI_A2A_WS_MAX_IN_FLIGHT requests run concurrently per connection;
+    beyond that the agent stops reading until one finishes, which pushes
+    back on the sender. Streaming methods send one message per event.
+    Requests still running when the connection closes are cancelled
+    (background tasks keep running).
+    """
+    if not _authorized(websocket.headers.get("authorization")):
+        _ws_stats.rejected += 1
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    _ws_stats.connections += 1
+    _ws_stats.open += 1
+
+    window = asyncio.Semaphore(LEARNAI_A2A_WS_MAX_IN_FLIGHT)
+    send_lock = asyncio.Lock()
+    running: set[asyncio.Task[None]] = set()
+
+    async def send(body: bytes) -> None:
+        async with send_lock:
+            await websocket.send_text(body.decode())
+
+    async def serve(message: str | bytes) -> None:
+        try:
+            await _ws_answer(message, send)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # the connection closed before the answer could be sent
+        finally:
+            window.release()
+
+    try:
+        while True:
+            await window.acquire()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            _ws_stats.requests += 1
+            task = asyncio.create_task(serve(message.get("text") or message.get("bytes") or ""))
+            running.add(task)
+            task.add_done_callback(running.discard)
+    finally:
+        _ws_stats.open -= 1
+        for task in running:
+            task.cancel()
+
+
+async def _ws_answer(message: str | bytes, send: Callable[[bytes], Awaitable[None]]) -> None:
+    """Run one WebSocket message's request or batch and send its answer, if any."""
+    try:
+        payload = loads(message)
+    except ValueError:
+        parse_error = JSONRPCResponse(error={"code": PARSE_ERROR_CODE, "message": "Parse error"})
+        await send(_rpc_response.encode(parse_error))
+        return
+
+    budget = deadline.tightest(LEARNAI_A2A_TIMEOUT)
+    if isinstance(payload, list):
+        if not payload or len(payload) > LEARNAI_A2A_MAX_BATCH:
+            await send(_rpc_response.encode(_invalid_request("Invalid batch size")))
+            return
+        with deadline.scope(budget):
+            responses = await _run_batch(payload)
+        if responses:
+            await send(_rpc_batch.encode(responses))
+        return
+
+    request = _parse_item(payload)
+    if isinstance(request, JSONRPCResponse):
+        await send(_rpc_response.encode(request))
+        return
+    request_id = request.id if request.id is not None else str(uuid.uuid4())
+    if request.method in _STREAMING_METHODS:
+        await _ws_stream(request, request_id, budget, send)
+        return
+    with deadline.scope(budget):
+        response = await _respond(request, request_id)
+    if not _is_notification(payload):
+        await send(_rpc_response.encode(response))
+
+
+async def _ws_stream(
+    request: JSONRPCRequest,
+    request_id: str | int,
+    budget: float | None,
+    send: Callable[[bytes], Awaitable[None]],
+) -> None:
+    """Send a streaming method's events as separate messages with the request's id."""
+    try:
+        async with _admission.acquire():
+            buffer = _EventBuffer()
+            with deadline.scope(budget):
+                events = _STREAMING_METHODS[request.method](request.params)
+                producer = asyncio.create_task(_pump(events, buffer))
+            try:
+                async for kind, data in buffer:
+                    await send(_rpc_response.encode(_event_response(kind, data, request_id)))
+            finally:
+                producer.cancel()
+    except Overloaded as e:
+        await send(_rpc_response.encode(_overloaded(e, request_id)))
+
+
 # ---------------------------------------------------------------------------
 # Method Handlers
 # ---------------------------------------------------------------------------
 
 
-async def _handle_invoke(params: dict) -> dict:
+async def _handle_invoke(params: dict[str, Any]) -> dict[str, Any]:
     """Generic invoke handler - routes to specific methods."""
     action = params.get("action", "match_tutor")
     if action == "match_tutor":
@@ -126,7 +740,12 @@ async def _handle_invoke(params: dict) -> dict:
     return {"error": f"Unknown action: {action}"}
 
 
-async def _match_tutor(params: dict) -> dict:
+async def _get_client() -> httpx.AsyncClient:
+    """Get the shared, pooled HTTP client (see learnai_mcp.client)."""
+    return await _api.get()
+
+
+async def _match_tutor(params: dict[str, Any]) -> dict[str, Any]:
     """Find the best tutor for a student's learning needs."""
     query = params.get("query", "")
     limit = params.get("limit", 5)
@@ -134,13 +753,13 @@ async def _match_tutor(params: dict) -> dict:
     if not query:
         return {"error": "query parameter is required"}
 
-    async with httpx.AsyncClient(base_url=LEARNAI_API_URL, timeout=30.0) as client:
-        response = await client.post(
-            "/api/ai/recommend-professors",
-            json={"query": query, "limit": limit},
-        )
-        response.raise_for_status()
-        data = response.json()
+    client = await _get_client()
+    response = await client.post(
+        "/api/ai/recommend-professors",
+        json={"query": query, "limit": limit},
+    )
+    response.raise_for_status()
+    data = loads(response.content)
 
     return {
         "action": "match_tutor",
@@ -150,17 +769,73 @@ async def _match_tutor(params: dict) -> dict:
     }
 
 
-async def _create_booking(params: dict) -> dict:
+async def _match_tutor_events(params: dict[str, Any]) -> AsyncGenerator[_Event, None]:
+    """Stream a tutor match: candidates, explanation deltas, then the full result.
+
+    The upstream is asked for NDJSON (teachers first, then the explanation
+    as the model writes it). An upstream that answers with plain JSON still
+    works; its explanation then arrives as one delta.
+    """
+    query = params.get("query", "")
+    limit = params.get("limit", 5)
+
+    if not query:
+        yield "done", {"error": "query parameter is required"}
+        return
+
+    teachers: list[dict[str, Any]] = []
+    explanation: list[str] = []
+    client = await _get_client()
+    async with client.stream(
+        "POST",
+        "/api/ai/recommend-professors",
+        json={"query": query, "limit": limit},
+        headers={"Accept": "application/x-ndjson, application/json;q=0.9"},
+    ) as response:
+        response.raise_for_status()
+        chunks: AsyncIterator[Any]
+        if response.headers.get("content-type", "").startswith("application/x-ndjson"):
+            chunks = (loads(line) async for line in response.aiter_lines() if line)
+        else:
+            chunks = _single(loads(await response.aread()))
+        async for chunk in chunks:
+            if "teachers" in chunk:
+                teachers = chunk["teachers"]
+                yield "candidates", {"teachers": teachers}
+            if chunk.get("explanation"):
+                explanation.append(chunk["explanation"])
+                yield "explanation", {"delta": chunk["explanation"]}
+
+    result = {
+        "action": "match_tutor",
+        "teachers": teachers,
+        "explanation": "".join(explanation),
+        "query": query,
+    }
+    yield "done", result
+
+
+async def _single(item: T) -> AsyncIterator[T]:
+    yield item
+
+
+# Methods answered with Server-Sent Events, by name
+_STREAMING_METHODS: dict[str, Callable[[dict[str, Any]], AsyncGenerator[_Event, None]]] = {
+    "match_tutor.stream": _match_tutor_events,
+}
+
+
+async def _create_booking(params: dict[str, Any]) -> dict[str, Any]:
     """Create a tutoring session booking."""
     required = ["teacherId", "subject", "scheduledFor", "durationMinutes", "priceTotal"]
     missing = [f for f in required if f not in params]
     if missing:
         return {"error": f"Missing required fields: {', '.join(missing)}"}
 
-    async with httpx.AsyncClient(base_url=LEARNAI_API_URL, timeout=30.0) as client:
-        response = await client.post("/api/bookings", json=params)
-        response.raise_for_status()
-        data = response.json()
+    client = await _get_client()
+    response = await client.post("/api/bookings", json=params)
+    response.raise_for_status()
+    data = loads(response.content)
 
     return {
         "action": "create_booking",
@@ -169,7 +844,7 @@ async def _create_booking(params: dict) -> dict:
     }
 
 
-async def _check_availability(params: dict) -> dict:
+async def _check_availability(params: dict[str, Any]) -> dict[str, Any]:
     """Check professor availability (placeholder - extend as needed)."""
     teacher_id = params.get("teacherId", "")
     date = params.get("date", "")
@@ -189,12 +864,24 @@ async def _check_availability(params: dict) -> dict:
 
 
 @app.get("/health")
-async def health() -> dict:
+async def health() -> dict[str, Any]:
     return {"status": "healthy", "service": "learnai-a2a-agent"}
 
 
+@app.get("/metrics")
+async def metrics() -> dict[str, Any]:
+    """Runtime counters (admission, deadlines, tasks, WebSockets, connection pool)."""
+    return {
+        "admission": _admission.stats(),
+        "deadlines": deadline.stats(),
+        "tasks": _tasks.stats(),
+        "websocket": asdict(_ws_stats),
+        "http_client": _api.stats(),
+    }
+
+
 @app.get("/.well-known/agent.json")
-async def agent_card() -> dict:
+async def agent_card() -> dict[str, Any]:
     """A2A agent card for discovery."""
     return {
         "name": "learnai-tutor-matching",
@@ -209,6 +896,18 @@ async def agent_card() -> dict:
                     "limit": {"type": "integer", "default": 5},
                 },
             },
+            {
+                "name": "match_tutor.stream",
+                "description": (
+                    "Stream a tutor match as Server-Sent Events: candidate teachers first, "
+                    "then the explanation as it is written, then the full result"
+                ),
+                "streaming": True,
+                "params": {
+                    "query": {"type": "string", "required": True},
+                    "limit": {"type": "integer", "default": 5},
+                },
+            },
             {
                 "name": "create_booking",
                 "description": "Book a tutoring session with a professor",
@@ -228,7 +927,21 @@ async def agent_card() -> dict:
                     "date": {"type": "string", "required": True},
                 },
             },
+            {
+                "name": "tasks/get",
+                "description": (
+                    'Get a background task started with "async": true, '
+                    "with its result once finished"
+                ),
+                "params": {"task_id": {"type": "string", "required": True}},
+            },
+            {
+                "name": "tasks/cancel",
+                "description": "Cancel a background task that has not finished",
+                "params": {"task_id": {"type": "string", "required": True}},
+            },
         ],
+        "capabilities": {"streaming": True, "tasks": True, "websocket": "/a2a/ws"},
         "tags": ["education", "tutoring", "ai-matching", "booking"],
     }
 
@@ -242,8 +955,14 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="LearnAI A2A Agent Server")
     parser.add_argument("--host", default="0.0.0.0")
     parser.add_argument("--port", type=int, default=9200)
+    runner.add_arguments(parser)
     args = parser.parse_args()
-    uvicorn.run(app, host=args.host, port=args.port)
+    runner.serve(
+        "learnai_mcp.a2a.agent:app",
+        args,
+        ws_ping_interval=LEARNAI_A2A_WS_PING_INTERVAL or None,
+        ws_ping_timeout=LEARNAI_A2A_WS_PING_TIMEOUT or None,
+    )
 
 
 if __name__ == "__main__":
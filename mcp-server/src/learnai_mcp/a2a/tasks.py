@@ -0,0 +1,229 @@
+"""
+A2A Task Store
+==============
+
+Bounded in-memory store for A2A calls run as background tasks. Submitting
+returns a task id at once, and the caller polls the task until it finishes,
+so long calls no longer hold an HTTP connection (or hit a gateway timeout)
+for their whole duration.
+
+Tasks move from ``submitted`` (waiting for one of ``max_running`` slots) to
+``working`` and end ``completed``, ``failed`` or ``canceled``. Finished
+tasks are kept for ``ttl`` seconds and then evicted. When the store is full,
+the oldest finished tasks are evicted first; if every task is still
+unfinished, new submissions are refused with ``Overloaded``. Results larger
+than ``max_result_bytes`` are not stored: the task fails instead.
+
+Jobs run in a fresh context, detached from the submitting request and its
+deadline; the work itself sets whatever deadline applies to it.
+
+Usage:
+    tasks = TaskStore(max_tasks=1000, max_running=16, ttl=300.0)
+    task = tasks.submit("match_tutor", lambda: match_tutor(params))
+    ...
+    task = tasks.get(task.id)
+    if task is not None and task.done:
+        return task.snapshot()
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Literal
+
+import orjson
+
+from learnai_mcp.limiter import Bulkhead, Overloaded
+
+logger = logging.getLogger(__name__)
+
+TaskState = Literal["submitted", "working", "completed", "failed", "canceled"]
+
+_FINAL_STATES = ("completed", "failed", "canceled")
+
+
+class TaskFailed(Exception):
+    """Raised by a task's work to fail it with a JSON-RPC error object."""
+
+    def __init__(self, error: dict[str, Any]) -> None:
+        super().__init__(error.get("message", "Task failed"))
+        self.error = error
+
+
+@dataclass
+class TaskStats:
+    """Counters describing background tasks."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    canceled: int = 0
+    expired: int = 0
+    evicted: int = 0
+    rejected: int = 0
+    oversized: int = 0
+
+
+@dataclass
+class Task:
+    """One background call and, once finished, its outcome."""
+
+    id: str
+    method: str
+    state: TaskState = "submitted"
+    result: dict[str, Any] | None = None
+    error: dict[str, Any] | None = None
+    _job: "asyncio.Task[None] | None" = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.state in _FINAL_STATES
+
+    def snapshot(self) -> dict[str, Any]:
+        """The task as reported to callers."""
+        view: dict[str, Any] = {"task_id": self.id, "method": self.method, "state": self.state}
+        if self.result is not None:
+            view["result"] = self.result
+        if self.error is not None:
+            view["error"] = self.error
+        return view
+
+
+class TaskStore:
+    """Runs submitted work in the background and keeps its outcome for a while.
+
+    Args:
+        max_tasks: Maximum tasks held at once, finished or not.
+        max_running: Tasks allowed to run at once; the rest wait as ``submitted``.
+        ttl: Seconds a finished task is kept before it is evicted.
+        max_result_bytes: Largest result (as JSON) a task may store.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        max_tasks: int = 1000,
+        max_running: int = 16,
+        ttl: float = 300.0,
+        max_result_bytes: int = 256 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_tasks = max_tasks
+        self.max_running = max_running
+        self.ttl = ttl
+        self.max_result_bytes = max_result_bytes
+        self._clock = clock
+        self._tasks: dict[str, Task] = {}
+        # Finished task ids by expiry time; finishing order is expiry order
+        self._finished: OrderedDict[str, float] = OrderedDict()
+        self._slots = Bulkhead("a2a-tasks", max_running)
+        self._stats = TaskStats()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, method: str, work: Callable[[], Awaitable[dict[str, Any]]]) -> Task:
+        """Start ``work`` in the background and return its task.
+
+        Raises ``Overloaded`` if the store is full of unfinished tasks.
+        """
+        self._expire()
+        while len(self._tasks) >= self.max_tasks and self._finished:
+            self._evict(next(iter(self._finished)))
+            self._stats.evicted += 1
+        if len(self._tasks) >= self.max_tasks:
+            self._stats.rejected += 1
+            raise Overloaded("task store full", self._slots.retry_after_ms())
+
+        task = Task(id=str(uuid.uuid4()), method=method)
+        self._tasks[task.id] = task
+        self._stats.submitted += 1
+        task._job = asyncio.get_running_loop().create_task(
+            self._run(task, work), context=contextvars.Context()
+        )
+        return task
+
+    def get(self, task_id: str) -> Task | None:
+        """Return a task that has not expired yet."""
+        self._expire()
+        return self._tasks.get(task_id)
+
+    def cancel(self, task: Task) -> None:
+        """Stop an unfinished task; it is kept as ``canceled`` until it expires."""
+        if task.done:
+            return
+        if task._job is not None:
+            task._job.cancel()
+        self._finish(task, "canceled")
+
+    def clear(self) -> None:
+        """Cancel every unfinished task and forget all tasks."""
+        for task in self._tasks.values():
+            if task._job is not None:
+                task._job.cancel()
+        self._tasks.clear()
+        self._finished.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "stored": len(self._tasks),
+            "waiting": self._slots.queued,
+            "running": self._slots.in_flight,
+        }
+
+    async def _run(self, task: Task, work: Callable[[], Awaitable[dict[str, Any]]]) -> None:
+        try:
+            async with self._slots.acquire():
+                task.state = "working"
+                result = await work()
+        except asyncio.CancelledError:
+            self._finish(task, "canceled")
+            raise
+        except TaskFailed as e:
+            task.error = e.error
+            self._finish(task, "failed")
+            return
+        except Exception as e:  # noqa: BLE001
+            logger.error("A2A task %s (%s) failed: %s", task.id, task.method, e)
+            task.error = {"code": -32000, "message": str(e)}
+            self._finish(task, "failed")
+            return
+
+        size = len(orjson.dumps(result, default=str))
+        if size > self.max_result_bytes:
+            self._stats.oversized += 1
+            task.error = {
+                "code": -32000,
+                "message": f"Task result is {size} bytes, over the {self.max_result_bytes} limit",
+            }
+            self._finish(task, "failed")
+            return
+        task.result = result
+        self._finish(task, "completed")
+
+    def _finish(self, task: Task, state: TaskState) -> None:
+        if task.done or task.id not in self._tasks:
+            return
+        task.state = state
+        task._job = None
+        setattr(self._stats, state, getattr(self._stats, state) + 1)
+        self._finished[task.id] = self._clock() + self.ttl
+
+    def _expire(self) -> None:
+        now = self._clock()
+        while self._finished:
+            task_id, expires_at = next(iter(self._finished.items()))
+            if expires_at > now:
+                break
+            self._evict(task_id)
+            self._stats.expired += 1
+
+    def _evict(self, task_id: str) -> None:
+        self._finished.pop(task_id, None)
+        self._tasks.pop(task_id, None)
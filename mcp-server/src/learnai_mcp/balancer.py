@@ -0,0 +1,333 @@
+"""
+Client-Side Load Balancing
+==========================
+
+Spreads LearnAI API requests over several replicas from inside the shared
+HTTP client, as an ``httpx`` transport. Each request is routed to one
+replica:
+
+- GETs use rendezvous (highest-random-weight) hashing on method + path +
+  query when affinity is on. The same URL lands on the same replica, so
+  each replica's caches stay hot. Adding or removing a replica only moves
+  that replica's share of keys.
+- Everything else uses the configured strategy:
+  ``p2c`` (power of two choices) samples two replicas and takes the one with
+  fewer outstanding requests; ``least`` scans all replicas for the fewest.
+
+Replicas are skipped while they are out of rotation:
+
+- Outlier ejection (passive): ``eject_after`` consecutive failures (5xx or
+  connection errors) eject a replica for ``ejection_time`` seconds. The
+  time grows with each repeated ejection. At most ``max_ejected`` of the
+  replicas are ejected at once.
+- Health checks (active): ``check_health`` probes every replica; two
+  consecutive failed probes mark it unhealthy until a probe succeeds.
+
+If every replica is out of rotation, all of them are used ("panic mode")
+rather than failing every request.
+
+Retries and hedges of one call run inside ``tried_replicas()`` and avoid
+the replicas that call has already used, while any other replica is
+available. Otherwise a GET's affinity would send every retry and hedge
+back to the replica that just failed or stalled.
+
+Usage:
+    balancer = LoadBalancer(["http://api-1:3000", "http://api-2:3000"], strategy="p2c")
+    client = httpx.AsyncClient(
+        base_url="http://learnai-api",
+        transport=BalancedTransport(balancer, make_transport),
+    )
+    with tried_replicas():  # retries of this GET try another replica
+        response = await resilience.call(key, lambda: client.get(url), idempotent=True)
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Callable, Collection, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("p2c", "least")
+
+# Names of the replicas the current call has sent attempts to (see tried_replicas)
+_tried: ContextVar[set[str] | None] = ContextVar("learnai_tried_replicas", default=None)
+
+
+@contextmanager
+def tried_replicas() -> Iterator[set[str]]:
+    """Scope one logical call, so its retries and hedges go to replicas it has not tried.
+
+    Attempts started inside the block, including hedges in child tasks,
+    share the returned set of replica names.
+    """
+    tried: set[str] = set()
+    token = _tried.set(tried)
+    try:
+        yield tried
+    finally:
+        _tried.reset(token)
+
+
+@dataclass
+class Replica:
+    """One upstream replica and its routing state."""
+
+    url: httpx.URL
+    uds: str | None = None
+    outstanding: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    healthy: bool = True
+    failed_checks: int = 0
+    requests: int = 0
+    failures: int = 0
+    _hash_seed: bytes = field(default=b"", repr=False)
+
+    @property
+    def name(self) -> str:
+        return f"unix://{self.uds}" if self.uds else str(self.url)
+
+
+class LoadBalancer:
+    """Replica selection, outlier ejection and health state.
+
+    Args:
+        replicas: Replica URLs (``http(s)://...`` or ``unix://<socket path>``).
+        strategy: ``"p2c"`` or ``"least"`` (fewest outstanding requests).
+        affinity: Route GETs by rendezvous hash of their URL.
+        eject_after: Consecutive failures that eject a replica.
+        ejection_time: Base ejection time in seconds (multiplied per repeat, up to 10x).
+        max_ejected: Largest fraction of replicas ejected at once.
+        uds_host: Host used for requests sent over a Unix socket.
+        rng: Random source for power-of-two sampling (overridable for tests).
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        replicas: list[str],
+        strategy: str = "p2c",
+        affinity: bool = True,
+        eject_after: int = 5,
+        ejection_time: float = 30.0,
+        max_ejected: float = 0.5,
+        uds_host: str = "localhost",
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not replicas:
+            raise ValueError("At least one replica is required")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.strategy = strategy
+        self.affinity = affinity
+        self.eject_after = eject_after
+        self.ejection_time = ejection_time
+        self.max_ejected = max_ejected
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self.replicas: list[Replica] = []
+        for url in replicas:
+            if url.startswith("unix://"):
+                replica = Replica(url=httpx.URL(f"http://{uds_host}"), uds=url[len("unix://") :])
+            else:
+                replica = Replica(url=httpx.URL(url))
+            replica._hash_seed = replica.name.encode()
+            self.replicas.append(replica)
+
+    def available(self) -> list[Replica]:
+        """Replicas in rotation, or all of them if none is (panic mode)."""
+        now = self._clock()
+        live = [r for r in self.replicas if r.healthy and r.ejected_until <= now]
+        return live or self.replicas
+
+    def pick(self, affinity_key: str | None = None, exclude: Collection[str] = ()) -> Replica:
+        """Choose the replica for one request, avoiding ``exclude`` (names) if possible."""
+        candidates = self.available()
+        if exclude:
+            candidates = [r for r in candidates if r.name not in exclude] or candidates
+        if len(candidates) == 1:
+            return candidates[0]
+        if affinity_key is not None and self.affinity:
+            key = affinity_key.encode()
+            return max(
+                candidates,
+                key=lambda r: hashlib.blake2b(r._hash_seed + key, digest_size=8).digest(),
+            )
+        if self.strategy == "p2c":
+            first, second = self._rng.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+        fewest = min(r.outstanding for r in candidates)
+        return self._rng.choice([r for r in candidates if r.outstanding == fewest])
+
+    def on_success(self, replica: Replica) -> None:
+        replica.consecutive_failures = 0
+
+    def on_failure(self, replica: Replica) -> None:
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after:
+            self._eject(replica)
+
+    def on_health_check(self, replica: Replica, ok: bool) -> None:
+        if ok:
+            if not replica.healthy:
+                logger.info("Replica %s is healthy again", replica.name)
+            replica.healthy = True
+            replica.failed_checks = 0
+            return
+        replica.failed_checks += 1
+        if replica.failed_checks >= 2 and replica.healthy:
+            logger.warning(
+                "Replica %s failed health checks, taking it out of rotation", replica.name
+            )
+            replica.healthy = False
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            "strategy": self.strategy,
+            "affinity": self.affinity,
+            "replicas": {
+                r.name: {
+                    "outstanding": r.outstanding,
+                    "requests": r.requests,
+                    "failures": r.failures,
+                    "healthy": r.healthy,
+                    "ejected": r.ejected_until > now,
+                    "ejections": r.ejections,
+                }
+                for r in self.replicas
+            },
+        }
+
+    def _eject(self, replica: Replica) -> None:
+        now = self._clock()
+        if replica.ejected_until > now:
+            return
+        ejected = sum(1 for r in self.replicas if r.ejected_until > now)
+        if ejected + 1 > math.floor(self.max_ejected * len(self.replicas)):
+            return
+        replica.ejections += 1
+        replica.ejected_until = now + self.ejection_time * min(replica.ejections, 10)
+        replica.consecutive_failures = 0
+        logger.warning(
+            "Ejecting replica %s for %.0fs after repeated failures",
+            replica.name,
+            replica.ejected_until - now,
+        )
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body wrapper that ends the request's outstanding count on close."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, done: Callable[[], None]) -> None:
+        self._stream = stream
+        self._done = done
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+class BalancedTransport(httpx.AsyncBaseTransport):
+    """``httpx`` transport that routes each request to a replica picked by ``balancer``.
+
+    Args:
+        balancer: Shared routing state (kept across transports).
+        make_transport: Builds the connection pool for one replica.
+    """
+
+    def __init__(
+        self,
+        balancer: LoadBalancer,
+        make_transport: Callable[[Replica], httpx.AsyncBaseTransport],
+    ) -> None:
+        self.balancer = balancer
+        self._transports = {r.name: make_transport(r) for r in balancer.replicas}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        affinity_key = None
+        if request.method == "GET":
+            affinity_key = f"GET {request.url.raw_path.decode()}"
+        tried = _tried.get()
+        replica = self.balancer.pick(affinity_key, exclude=tried or ())
+        if tried is not None:
+            tried.add(replica.name)
+        return await self._send(replica, request)
+
+    async def check_health(self, path: str, timeout: float = 2.0) -> None:
+        """Probe every replica once and update its health."""
+
+        async def probe(replica: Replica) -> None:
+            request = httpx.Request("GET", replica.url.join(path))
+            try:
+                async with asyncio.timeout(timeout):
+                    response = await self._transports[replica.name].handle_async_request(request)
+                    await response.aread()
+                    await response.aclose()
+                ok = response.status_code < 500
+            except (httpx.TransportError, TimeoutError):
+                ok = False
+            self.balancer.on_health_check(replica, ok)
+
+        await asyncio.gather(*(probe(r) for r in self.balancer.replicas))
+
+    async def aclose(self) -> None:
+        for transport in self._transports.values():
+            await transport.aclose()
+
+    async def _send(self, replica: Replica, request: httpx.Request) -> httpx.Response:
+        base = replica.url
+        request.url = request.url.copy_with(
+            scheme=base.scheme,
+            host=base.host,
+            port=base.port,
+            raw_path=base.raw_path.rstrip(b"/") + request.url.raw_path,
+        )
+        request.headers["Host"] = base.netloc.decode()
+
+        replica.outstanding += 1
+        replica.requests += 1
+        finished = False
+
+        def done() -> None:
+            nonlocal finished
+            if not finished:
+                finished = True
+                replica.outstanding -= 1
+
+        try:
+            response = await self._transports[replica.name].handle_async_request(request)
+        except BaseException as e:
+            done()
+            if isinstance(e, httpx.TransportError):
+                self.balancer.on_failure(replica)
+            raise
+        if response.status_code >= 500:
+            self.balancer.on_failure(replica)
+        else:
+            self.balancer.on_success(replica)
+        if isinstance(response.stream, httpx.ByteStream):
+            done()  # body already in memory: nothing left outstanding
+        else:
+            assert isinstance(response.stream, httpx.AsyncByteStream)
+            response.stream = _TrackedStream(response.stream, done)
+        return response
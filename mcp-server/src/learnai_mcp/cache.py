@@ -0,0 +1,225 @@
+"""
+Response Cache
+==============
+
+In-process TTL + LRU cache for read-only tool results. Entries are bounded
+both by count and by their serialized size, and expired entries are served
+immediately while a background task refreshes them (stale-while-revalidate).
+Callers may also opt into stale-if-error: when a reload fails with an error
+they accept (e.g. an open circuit), the last value still held is served,
+however old.
+
+Usage:
+    cache = ResponseCache(ttl=60.0, stale_ttl=300.0)
+    result = await cache.get_or_load(key, lambda: fetch_from_upstream())
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+import orjson
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+def _default_sizeof(value: Any) -> int:
+    """Approximate the memory footprint of a value by its JSON size."""
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    return len(orjson.dumps(value, default=str))
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    stale_if_error: int = 0
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache(Generic[V]):
+    """TTL + LRU cache with stale-while-revalidate semantics.
+
+    Args:
+        ttl: Seconds an entry is considered fresh. ``0`` disables caching.
+        stale_ttl: Extra seconds an expired entry may still be served while
+            it is being refreshed in the background.
+        max_entries: Maximum number of entries kept.
+        max_bytes: Maximum total size of all entries, in bytes.
+        sizeof: Callable estimating the size of a value in bytes.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        max_entries: int = 512,
+        max_bytes: int = 8 * 1024 * 1024,
+        sizeof: Callable[[V], int] = _default_sizeof,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self._bytes = 0
+        self._refreshing: dict[Hashable, asyncio.Task[None]] = {}
+        self._stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[V]],
+        stale_if_error: Callable[[Exception], bool] | None = None,
+    ) -> V:
+        """Return the cached value for ``key``, loading it on a miss.
+
+        Fresh entries are returned directly. Expired entries still inside the
+        stale window are returned immediately and refreshed in the background.
+        Exceptions raised by ``loader`` on a miss propagate and nothing is cached,
+        unless ``stale_if_error`` accepts the exception and an entry for ``key``
+        is still held, however old; that entry is then served instead.
+        """
+        if not self.enabled:
+            self._stats.misses += 1
+            return await loader()
+
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.expires_at:
+                self._stats.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                self._stats.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, loader)
+                return entry.value
+            if stale_if_error is None:
+                self._remove(key)
+
+        self._stats.misses += 1
+        try:
+            value = await loader()
+        except Exception as e:
+            held = self._entries.get(key)
+            if held is None or stale_if_error is None:
+                raise
+            if not stale_if_error(e):
+                if held is entry:
+                    self._remove(key)
+                raise
+            self._stats.stale_if_error += 1
+            return held.value
+        self.set(key, value)
+        return value
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the cached value for ``key`` (fresh or stale) without loading."""
+        entry = self._entries.get(key)
+        if entry is None or self._clock() >= entry.stale_until:
+            return None
+        return entry.value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Insert or replace an entry, evicting least-recently-used entries as needed."""
+        if not self.enabled:
+            return
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        now = self._clock()
+        self._entries[key] = _Entry(
+            value=value,
+            size=size,
+            expires_at=now + self.ttl,
+            stale_until=now + self.ttl + self.stale_ttl,
+        )
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+        self._entries.clear()
+        self._bytes = 0
+        self._stats = CacheStats()
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters plus current occupancy."""
+        lookups = self._stats.hits + self._stats.stale_hits + self._stats.misses
+        return {
+            **asdict(self._stats),
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hit_ratio": (
+                (self._stats.hits + self._stats.stale_hits) / lookups if lookups else 0.0
+            ),
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.get_running_loop().create_task(self._refresh(key, loader))
+        self._refreshing[key] = task
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> None:
+        try:
+            value = await loader()
+        except Exception as e:  # noqa: BLE001
+            self._stats.refresh_errors += 1
+            logger.warning("Background cache refresh failed for %r: %s", key, e)
+        else:
+            self._stats.refreshes += 1
+            self.set(key, value)
+        finally:
+            self._refreshing.pop(key, None)
@@ -0,0 +1,263 @@
+"""
+Columnar Professor Catalog
+==========================
+
+In-memory, NumPy-backed copy of the professor catalog that answers the
+``search_professors`` filters locally instead of round-tripping to the
+LearnAI API.
+
+Layout:
+- ``rating``: float64 column
+- ``hourly_rate``: float64 column (parsed from the upstream decimal string)
+- subjects / languages: one bitset row per professor (uint64 words), one bit
+  per distinct value, matched case-insensitively
+
+Results follow the upstream ordering: rating descending, then id ascending.
+That order is a stable keyset, so ``query(after=(rating, id))`` pages through
+large result sets (see ``learnai_mcp.pagination``).
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from learnai_mcp.pagination import Key
+
+if TYPE_CHECKING:
+    from learnai_mcp.server import ProfessorInfo
+
+
+def _parse_rate(value: str | float | None) -> float:
+    """Parse an upstream hourly rate (decimal string) into a float."""
+    try:
+        return float(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class _Vocabulary:
+    """Case-insensitive value -> bit position mapping plus per-row bitsets."""
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.labels: list[str] = []
+
+    @property
+    def words(self) -> int:
+        return max(1, (len(self.labels) + 63) // 64)
+
+    def encode(self, rows: Sequence[Sequence[str]]) -> np.ndarray:
+        """Encode rows of values as bitsets, growing the vocabulary as needed."""
+        row_ids: list[int] = []
+        positions: list[int] = []
+        for row, values in enumerate(rows):
+            for value in values:
+                key = value.strip().casefold()
+                if not key:
+                    continue
+                pos = self.index.get(key)
+                if pos is None:
+                    pos = self.index[key] = len(self.labels)
+                    self.labels.append(value.strip())
+                row_ids.append(row)
+                positions.append(pos)
+        bits = np.zeros((len(rows), self.words), dtype=np.uint64)
+        pos_arr = np.asarray(positions, dtype=np.uint64)
+        np.bitwise_or.at(
+            bits,
+            (np.asarray(row_ids, dtype=np.intp), (pos_arr >> np.uint64(6)).astype(np.intp)),
+            np.uint64(1) << (pos_arr & np.uint64(63)),
+        )
+        return bits
+
+    def widen(self, bits: np.ndarray) -> np.ndarray:
+        """Pad an existing bitset matrix to the current vocabulary width."""
+        missing = self.words - bits.shape[1]
+        if missing <= 0:
+            return bits
+        return np.pad(bits, ((0, 0), (0, missing)))
+
+    def mask(self, bits: np.ndarray, value: str) -> np.ndarray | None:
+        """Boolean mask of rows containing ``value``, or None if it is unknown."""
+        pos = self.index.get(value.strip().casefold())
+        if pos is None:
+            return None
+        bit = np.uint64(1) << np.uint64(pos & 63)
+        rows: np.ndarray = (bits[:, pos >> 6] & bit) != 0
+        return rows
+
+
+class ProfessorCatalog:
+    """Columnar professor catalog with vectorized filtering and top-k selection.
+
+    Rows can be replaced wholesale with :meth:`load` or changed incrementally
+    with :meth:`upsert` and :meth:`remove`. Updated rows keep their position;
+    new rows are appended; removed rows are tombstoned and compacted away once
+    they make up most of the catalog.
+    """
+
+    def __init__(self, professors: Iterable["ProfessorInfo"] = ()) -> None:
+        self.load(professors)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, professor_id: object) -> bool:
+        return professor_id in self._positions
+
+    @property
+    def professors(self) -> list["ProfessorInfo"]:
+        """Live catalog rows in catalog order."""
+        return [p for p in self._records if p is not None]
+
+    def get(self, professor_id: str) -> "ProfessorInfo | None":
+        row = self._positions.get(professor_id)
+        return None if row is None else self._records[row]
+
+    def load(self, professors: Iterable["ProfessorInfo"]) -> None:
+        """Replace the catalog contents, keeping the given (upstream) order."""
+        self._subjects = _Vocabulary()
+        self._languages = _Vocabulary()
+        self._records: list[ProfessorInfo | None] = []
+        self._positions: dict[str, int] = {}
+        self._ids = np.zeros(0, dtype=str)
+        self._alive = np.zeros(0, dtype=bool)
+        self._rating = np.zeros(0, dtype=np.float64)
+        self._hourly_rate = np.zeros(0, dtype=np.float64)
+        self._subject_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._language_bits = np.zeros((0, 1), dtype=np.uint64)
+        self.upsert(professors)
+
+    def upsert(self, professors: Iterable["ProfessorInfo"]) -> None:
+        """Insert new professors and update existing ones in place (matched by id)."""
+        appended: dict[str, ProfessorInfo] = {}
+        for professor in professors:
+            row = self._positions.get(professor.id)
+            if row is None:
+                appended[professor.id] = professor
+            else:
+                self._set_row(row, professor)
+        if appended:
+            self._append(list(appended.values()))
+
+    def remove(self, professor_ids: Iterable[str]) -> int:
+        """Remove professors by id; returns how many were present."""
+        removed = 0
+        for professor_id in professor_ids:
+            row = self._positions.pop(professor_id, None)
+            if row is None:
+                continue
+            self._records[row] = None
+            self._alive[row] = False
+            removed += 1
+        dead = len(self._records) - len(self._positions)
+        if dead > 1024 and dead > len(self._positions):
+            self.load(self.professors)
+        return removed
+
+    def _append(self, professors: list["ProfessorInfo"]) -> None:
+        start = len(self._records)
+        self._records.extend(professors)
+        for offset, professor in enumerate(professors):
+            self._positions[professor.id] = start + offset
+        count = len(professors)
+        self._ids = np.concatenate([self._ids, np.array([p.id for p in professors], dtype=str)])
+        self._alive = np.concatenate([self._alive, np.ones(count, dtype=bool)])
+        self._rating = np.concatenate(
+            [
+                self._rating,
+                np.nan_to_num(
+                    np.fromiter((p.rating for p in professors), dtype=np.float64, count=count)
+                ),
+            ]
+        )
+        self._hourly_rate = np.concatenate(
+            [
+                self._hourly_rate,
+                np.fromiter(
+                    (_parse_rate(p.hourly_rate) for p in professors),
+                    dtype=np.float64,
+                    count=count,
+                ),
+            ]
+        )
+        subject_bits = self._subjects.encode([p.subjects for p in professors])
+        self._subject_bits = np.concatenate(
+            [self._subjects.widen(self._subject_bits), subject_bits]
+        )
+        language_bits = self._languages.encode([p.languages for p in professors])
+        self._language_bits = np.concatenate(
+            [self._languages.widen(self._language_bits), language_bits]
+        )
+
+    def _set_row(self, row: int, professor: "ProfessorInfo") -> None:
+        self._records[row] = professor
+        self._rating[row] = np.nan_to_num(professor.rating)
+        self._hourly_rate[row] = _parse_rate(professor.hourly_rate)
+        subject_bits = self._subjects.encode([professor.subjects])
+        self._subject_bits = self._subjects.widen(self._subject_bits)
+        self._subject_bits[row] = subject_bits[0]
+        language_bits = self._languages.encode([professor.languages])
+        self._language_bits = self._languages.widen(self._language_bits)
+        self._language_bits[row] = language_bits[0]
+
+    def subjects(self) -> list[str]:
+        """Distinct subjects present in the catalog."""
+        return list(self._subjects.labels)
+
+    def query(
+        self,
+        subject: str = "",
+        language: str = "",
+        min_rating: float = 0.0,
+        max_hourly_rate: float | None = None,
+        limit: int = 10,
+        after: Key | None = None,
+    ) -> list["ProfessorInfo"]:
+        """Return up to ``limit`` professors matching every given filter.
+
+        Args:
+            subject: Required subject (case-insensitive exact match).
+            language: Required teaching language (case-insensitive exact match).
+            min_rating: Minimum rating, inclusive.
+            max_hourly_rate: Maximum hourly rate, inclusive; None disables the filter.
+            limit: Maximum number of results.
+            after: Only return professors sorting after this (rating, id) key.
+        """
+        if limit <= 0 or not self._positions:
+            return []
+
+        mask = self._alive.copy()
+        if subject:
+            subject_mask = self._subjects.mask(self._subject_bits, subject)
+            if subject_mask is None:
+                return []
+            mask &= subject_mask
+        if language:
+            language_mask = self._languages.mask(self._language_bits, language)
+            if language_mask is None:
+                return []
+            mask &= language_mask
+        if min_rating > 0:
+            mask &= self._rating >= min_rating
+        if max_hourly_rate is not None:
+            mask &= self._hourly_rate <= max_hourly_rate
+        if after is not None:
+            rating, professor_id = after
+            mask &= (self._rating < rating) | (
+                (self._rating == rating) & (self._ids > professor_id)
+            )
+
+        candidates = np.flatnonzero(mask)
+        return [self._records[i] for i in self._top_k(candidates, limit)]
+
+    def _top_k(self, candidates: np.ndarray, k: int) -> np.ndarray:
+        """Select the k best candidates by rating desc, ties by id."""
+        if k < len(candidates):
+            ratings = self._rating[candidates]
+            kth = ratings[np.argpartition(-ratings, k - 1)[:k]].min()
+            # keep every tie at the boundary; the sort below picks them by id
+            candidates = candidates[ratings >= kth]
+        order = np.lexsort((self._ids[candidates], -self._rating[candidates]))
+        return candidates[order][:k]
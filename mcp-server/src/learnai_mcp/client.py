@@ -0,0 +1,271 @@
+"""
+Shared API Client
+=================
+
+One pooled ``httpx.AsyncClient`` per process for calls to the LearnAI API,
+shared by the MCP server and the A2A agent. Connections are kept alive and
+reused across requests (no TCP/TLS setup per call). The pool is sized by
+``httpx.Limits``, optionally multiplexed over HTTP/2, pre-opened at startup
+and closed cleanly at shutdown from the application's lifespan.
+
+HTTP/2 needs the optional ``h2`` package (``pip install learnai-mcp-server[http2]``);
+without it the client logs a warning and stays on HTTP/1.1.
+
+A ``unix:///path/to/app.sock`` base URL talks HTTP over a Unix domain socket
+instead of TCP, for a backend running in the same pod or host. Requests keep
+their paths, headers and auth; only the Host header becomes ``localhost``
+(override with LEARNAI_API_UDS_HOST).
+
+A comma-separated list of URLs spreads requests over several API replicas
+(see ``balancer``): GETs stick to one replica per URL so its caches stay
+hot, other requests go to the least loaded replica, and failing replicas are
+ejected or taken out of rotation by periodic health checks.
+
+Usage:
+    api = ApiClient("http://localhost:3000", max_connections=50, prewarm=4)
+    await api.start()                 # at startup: open connections
+    client = await api.get()
+    response = await client.get("/api/explore")
+    await api.aclose()                # at shutdown
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import Any
+
+import httpx
+
+from learnai_mcp.balancer import BalancedTransport, LoadBalancer, Replica
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing: total connections, idle connections kept, idle expiry (seconds)
+LEARNAI_HTTP_MAX_CONNECTIONS = int(os.environ.get("LEARNAI_HTTP_MAX_CONNECTIONS", "100"))
+LEARNAI_HTTP_MAX_KEEPALIVE = int(os.environ.get("LEARNAI_HTTP_MAX_KEEPALIVE", "20"))
+LEARNAI_HTTP_KEEPALIVE_EXPIRY = float(os.environ.get("LEARNAI_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Timeouts per upstream request (seconds)
+LEARNAI_HTTP_TIMEOUT = float(os.environ.get("LEARNAI_HTTP_TIMEOUT", "30"))
+LEARNAI_HTTP_CONNECT_TIMEOUT = float(os.environ.get("LEARNAI_HTTP_CONNECT_TIMEOUT", "5"))
+
+# HTTP/2 multiplexing (requires the optional h2 package)
+LEARNAI_HTTP2 = os.environ.get("LEARNAI_HTTP2", "").lower() in ("1", "true", "yes")
+
+# Connections opened at startup, and the cheap endpoint used to open them
+LEARNAI_HTTP_PREWARM = int(os.environ.get("LEARNAI_HTTP_PREWARM", "0"))
+LEARNAI_HTTP_PREWARM_PATH = os.environ.get("LEARNAI_HTTP_PREWARM_PATH", "/api/health")
+
+
+# Host header sent over a Unix domain socket (unix:// API URLs)
+LEARNAI_API_UDS_HOST = os.environ.get("LEARNAI_API_UDS_HOST", "localhost")
+
+# Load balancing across replicas (comma-separated API URLs): "p2c" or "least"
+LEARNAI_LB_STRATEGY = os.environ.get("LEARNAI_LB_STRATEGY", "p2c")
+
+# Route each GET URL to the same replica (rendezvous hashing)
+LEARNAI_LB_AFFINITY = os.environ.get("LEARNAI_LB_AFFINITY", "true").lower() in ("1", "true", "yes")
+
+# Active health checks: interval in seconds (0 disables) and path probed
+LEARNAI_LB_HEALTH_INTERVAL = float(os.environ.get("LEARNAI_LB_HEALTH_INTERVAL", "10"))
+LEARNAI_LB_HEALTH_PATH = os.environ.get("LEARNAI_LB_HEALTH_PATH", "/api/health")
+
+# Outlier ejection: consecutive failures, base ejection seconds, max ejected fraction
+LEARNAI_LB_EJECT_AFTER = int(os.environ.get("LEARNAI_LB_EJECT_AFTER", "5"))
+LEARNAI_LB_EJECT_TIME = float(os.environ.get("LEARNAI_LB_EJECT_TIME", "30"))
+LEARNAI_LB_MAX_EJECTED = float(os.environ.get("LEARNAI_LB_MAX_EJECTED", "0.5"))
+
+# Placeholder base URL when requests are routed to replicas by the balancer
+_BALANCED_BASE_URL = "http://learnai-api"
+
+
+def parse_api_url(url: str) -> tuple[str, str | None]:
+    """Split an API URL into the HTTP base URL and an optional Unix socket path.
+
+    ``unix:///run/learnai/api.sock`` -> ``("http://localhost", "/run/learnai/api.sock")``;
+    any other URL is returned unchanged with no socket.
+    """
+    if not url.startswith("unix://"):
+        return url, None
+    socket_path = url.removeprefix("unix://")
+    if not socket_path:
+        raise ValueError(f"Missing socket path in API URL {url!r}")
+    return f"http://{LEARNAI_API_UDS_HOST}", socket_path
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ApiClient:
+    """Lazily created, shared ``httpx.AsyncClient`` with a tuned connection pool.
+
+    Args:
+        base_url: Base URL of the LearnAI API, or ``unix://<socket path>``; a
+            comma-separated list balances requests across replicas.
+        headers: Headers sent with every request.
+        timeout: Read/write/pool timeout per request, in seconds.
+        connect_timeout: Connection setup timeout, in seconds.
+        max_connections: Maximum open connections.
+        max_keepalive: Maximum idle connections kept for reuse.
+        keepalive_expiry: Seconds an idle connection is kept.
+        http2: Negotiate HTTP/2 when the server supports it.
+        prewarm: Connections opened by ``start``.
+        prewarm_path: Path requested to open each pre-warmed connection.
+        transport: Custom transport; when given, it owns pooling and HTTP/2
+            and the limits above are ignored.
+        balancer: Routing state for several replicas (built from ``base_url``
+            when it lists more than one).
+        health_interval: Seconds between replica health checks (0 disables).
+        health_path: Path probed by health checks.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: dict[str, str] | None = None,
+        timeout: float = LEARNAI_HTTP_TIMEOUT,
+        connect_timeout: float = LEARNAI_HTTP_CONNECT_TIMEOUT,
+        max_connections: int = LEARNAI_HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = LEARNAI_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = LEARNAI_HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = LEARNAI_HTTP2,
+        prewarm: int = LEARNAI_HTTP_PREWARM,
+        prewarm_path: str = LEARNAI_HTTP_PREWARM_PATH,
+        transport: httpx.AsyncBaseTransport | None = None,
+        balancer: LoadBalancer | None = None,
+        health_interval: float = LEARNAI_LB_HEALTH_INTERVAL,
+        health_path: str = LEARNAI_LB_HEALTH_PATH,
+    ) -> None:
+        replicas = [url.strip() for url in base_url.split(",") if url.strip()]
+        if balancer is None and isinstance(transport, BalancedTransport):
+            balancer = transport.balancer
+        if balancer is None and len(replicas) > 1:
+            balancer = LoadBalancer(
+                replicas,
+                strategy=LEARNAI_LB_STRATEGY,
+                affinity=LEARNAI_LB_AFFINITY,
+                eject_after=LEARNAI_LB_EJECT_AFTER,
+                ejection_time=LEARNAI_LB_EJECT_TIME,
+                max_ejected=LEARNAI_LB_MAX_EJECTED,
+                uds_host=LEARNAI_API_UDS_HOST,
+            )
+        self.balancer = balancer
+        if balancer is not None:
+            self.base_url, self.uds = _BALANCED_BASE_URL, None
+        else:
+            self.base_url, self.uds = parse_api_url(base_url)
+        self.headers = dict(headers or {})
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not http2_available():
+            logger.warning("HTTP/2 requested but the h2 package is missing; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.prewarm = prewarm
+        self.prewarm_path = prewarm_path
+        self.transport = transport
+        self.health_interval = health_interval
+        self.health_path = health_path
+        self._client: httpx.AsyncClient | None = None
+        self._balanced: BalancedTransport | None = None
+        self._health_task: asyncio.Task[None] | None = None
+        self._created = 0
+        self._prewarmed = 0
+
+    async def get(self) -> httpx.AsyncClient:
+        """Return the shared client, creating it on first use or after ``aclose``."""
+        if self._client is None or self._client.is_closed:
+            transport = self.transport
+            # A fresh transport each time: closing the client closes its transport.
+            if transport is None and self.balancer is not None:
+                transport = BalancedTransport(self.balancer, self._replica_transport)
+            elif transport is None and self.uds is not None:
+                transport = httpx.AsyncHTTPTransport(
+                    uds=self.uds, limits=self.limits, http2=self.http2
+                )
+            if isinstance(transport, BalancedTransport):
+                self._balanced = transport
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+                transport=transport,
+            )
+            self._created += 1
+        return self._client
+
+    async def start(self) -> None:
+        """Create the client and pre-open ``prewarm`` connections.
+
+        Warm-up failures are logged and ignored: the pool then fills on demand.
+        With several replicas this also starts the periodic health checks.
+        """
+        client = await self.get()
+        if self._balanced is not None and self.health_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._check_health_forever())
+        if self.prewarm <= 0:
+            return
+        # Concurrent requests force separate HTTP/1.1 connections, which then
+        # stay in the keep-alive pool (HTTP/2 multiplexes them over one).
+        results = await asyncio.gather(
+            *(client.get(self.prewarm_path) for _ in range(self.prewarm)),
+            return_exceptions=True,
+        )
+        failures = [r for r in results if isinstance(r, BaseException)]
+        self._prewarmed = len(results) - len(failures)
+        if failures:
+            logger.warning(
+                "Pre-warmed %d/%d connections to %s: %s",
+                self._prewarmed,
+                self.prewarm,
+                self.uds or self.base_url,
+                failures[0],
+            )
+
+    async def aclose(self) -> None:
+        """Close the client and all pooled connections."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "uds": self.uds,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "clients_created": self._created,
+            "prewarmed": self._prewarmed,
+            "balancer": self.balancer.stats() if self.balancer is not None else None,
+        }
+
+    def _replica_transport(self, replica: Replica) -> httpx.AsyncBaseTransport:
+        return httpx.AsyncHTTPTransport(uds=replica.uds, limits=self.limits, http2=self.http2)
+
+    async def _check_health_forever(self) -> None:
+        while True:
+            await self.get()
+            if self._balanced is not None:
+                try:
+                    await self._balanced.check_health(self.health_path)
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("Replica health check failed: %s", e)
+            await asyncio.sleep(self.health_interval)
@@ -0,0 +1,85 @@
+"""
+Request Coalescing
+==================
+
+Single-flight execution for identical in-flight calls: the first caller for a
+key starts the work, concurrent callers with the same key await the same
+result instead of issuing a duplicate upstream request.
+
+Cancellation is per waiter. A cancelled waiter never cancels the shared call
+while other waiters still need it; when the last waiter goes away the shared
+call is cancelled as well.
+
+Usage:
+    flights = SingleFlight()
+    data = await flights.do(key, lambda: fetch(...))
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalesceStats:
+    """Counters describing how often calls were shared."""
+
+    calls: int = 0
+    executed: int = 0
+    coalesced: int = 0
+    abandoned: int = 0
+
+
+class _Flight(Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[T]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """Share one in-flight awaitable between concurrent callers of the same key."""
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self._stats = CoalesceStats()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once per key at a time and return its result to every caller."""
+        self._stats.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self._stats.executed += 1
+        else:
+            self._stats.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is waiting any more: stop the shared call and let the
+                # next caller start a fresh one.
+                self._forget(key, flight)
+                flight.task.cancel()
+                self._stats.abandoned += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters plus the number of calls currently in flight."""
+        return {**asdict(self._stats), "in_flight": len(self._flights)}
+
+    def _forget(self, key: Hashable, flight: _Flight[T]) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -0,0 +1,117 @@
+"""
+Request Deadlines
+=================
+
+Per-request time budgets carried in a context variable, so every upstream
+call made on behalf of a request knows how long its caller is still
+waiting. Tasks started while handling the request (fan-out, hedges,
+coalesced calls) inherit the deadline.
+
+``scope`` sets a deadline for a block, and nested scopes can only tighten
+it. ``enforce`` cancels the work inside it when the deadline passes and
+raises ``DeadlineExceeded``, so nothing keeps holding upstream or limiter
+slots after the caller has given up. Keeping the two separate lets a server
+bound its upstream calls while still running local fallbacks after a
+deadline has passed.
+
+Usage:
+    with deadline.scope(10.0):
+        async with deadline.enforce():
+            data = await client.get(...)
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Absolute deadline in event-loop time (loop.time()), or None for no deadline.
+_deadline: ContextVar[float | None] = ContextVar("learnai_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request's time budget runs out."""
+
+
+@dataclass
+class DeadlineStats:
+    """Counters describing enforced deadlines."""
+
+    enforced: int = 0
+    exceeded: int = 0
+
+
+_stats = DeadlineStats()
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline (negative once passed), or None."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+@contextmanager
+def scope(seconds: float | None) -> Iterator[None]:
+    """Run the block with a deadline ``seconds`` from now.
+
+    An enclosing deadline that is sooner wins; ``None`` keeps the current one.
+    """
+    deadline = _deadline.get()
+    if seconds is not None:
+        candidate = asyncio.get_running_loop().time() + max(seconds, 0.0)
+        deadline = candidate if deadline is None else min(deadline, candidate)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@asynccontextmanager
+async def enforce() -> AsyncIterator[None]:
+    """Cancel the block at the current deadline, raising ``DeadlineExceeded``."""
+    deadline = _deadline.get()
+    if deadline is None:
+        yield
+        return
+    _stats.enforced += 1
+    timeout = asyncio.timeout_at(deadline)
+    try:
+        async with timeout:
+            yield
+    except TimeoutError as e:
+        if not timeout.expired() or isinstance(e, DeadlineExceeded):
+            raise
+        _stats.exceeded += 1
+        raise DeadlineExceeded("Request deadline exceeded") from e
+
+
+def parse_timeout_ms(value: Any) -> float | None:
+    """Parse a caller-supplied timeout in milliseconds into seconds (None if invalid)."""
+    try:
+        ms = float(value)
+    except (TypeError, ValueError):
+        return None
+    return ms / 1000 if ms > 0 else None
+
+
+def tightest(*budgets: float | None) -> float | None:
+    """The smallest positive budget in seconds, or None if none is set."""
+    return min((b for b in budgets if b is not None and b > 0), default=None)
+
+
+def parse_budgets(spec: str) -> dict[str, float]:
+    """Parse ``"name=seconds,..."`` budget settings."""
+    budgets: dict[str, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, seconds = item.partition("=")
+        budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+def stats() -> dict[str, Any]:
+    return asdict(_stats)
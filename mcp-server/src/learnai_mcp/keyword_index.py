@@ -0,0 +1,145 @@
+"""
+Keyword Index
+=============
+
+In-process inverted index with BM25 scoring over professor titles, subjects
+and bios. Used by the ``keyword_search_professors`` tool as a cheap first
+retrieval path before escalating to the LLM recommender.
+
+Filters are applied during posting-list traversal: each teaching language has
+its own posting set, term postings are intersected with it and checked
+against the rating filter before scoring, so filtered-out professors are
+never scored.
+
+Documents are added, replaced and removed incrementally as the catalog changes.
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from learnai_mcp.text import normalize, tokenize
+
+if TYPE_CHECKING:
+    from learnai_mcp.server import ProfessorInfo
+
+# Field weights: a subject hit says more about a professor than a bio mention.
+FIELD_WEIGHTS = {"subjects": 3.0, "title": 2.0, "bio": 1.0}
+
+
+class KeywordIndex:
+    """Incremental BM25 inverted index keyed by professor id.
+
+    Args:
+        k1: BM25 term-frequency saturation.
+        b: BM25 document-length normalization.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def clear(self) -> None:
+        self._postings: dict[str, dict[str, float]] = {}
+        self._language_postings: dict[str, set[str]] = {}
+        self._doc_terms: dict[str, list[str]] = {}
+        self._doc_languages: dict[str, list[str]] = {}
+        self._doc_len: dict[str, float] = {}
+        self._ratings: dict[str, float] = {}
+        self._total_len = 0.0
+
+    def rebuild(self, professors: Iterable["ProfessorInfo"]) -> None:
+        """Replace the index contents."""
+        self.clear()
+        self.upsert(professors)
+
+    def upsert(self, professors: Iterable["ProfessorInfo"]) -> None:
+        """Index new professors and re-index changed ones."""
+        for professor in professors:
+            if professor.id in self._doc_len:
+                self._remove_one(professor.id)
+            self._add_one(professor)
+
+    def remove(self, professor_ids: Iterable[str]) -> None:
+        for professor_id in professor_ids:
+            if professor_id in self._doc_len:
+                self._remove_one(professor_id)
+
+    def search(
+        self,
+        query: str,
+        language: str = "",
+        min_rating: float = 0.0,
+        limit: int = 10,
+    ) -> list[tuple[str, float]]:
+        """Return up to ``limit`` ``(professor_id, score)`` pairs, best first."""
+        terms = set(tokenize(query))
+        if not terms or limit <= 0 or not self._doc_len:
+            return []
+
+        allowed: set[str] | None = None
+        if language:
+            allowed = self._language_postings.get(normalize(language.strip()), set())
+            if not allowed:
+                return []
+
+        n_docs = len(self._doc_len)
+        avg_len = self._total_len / n_docs or 1.0
+        scores: dict[str, float] = {}
+        # Shortest posting lists first: rare terms decide most candidates early.
+        postings = sorted((self._postings[t] for t in terms if t in self._postings), key=len)
+        for posting in postings:
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, tf in posting.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                if min_rating > 0 and self._ratings[doc_id] < min_rating:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], self._ratings[item[0]])
+        )
+
+    def _add_one(self, professor: "ProfessorInfo") -> None:
+        weighted: defaultdict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            value = getattr(professor, field)
+            text = " ".join(value) if isinstance(value, list) else value or ""
+            for token in tokenize(text):
+                weighted[token] += weight
+
+        doc_id = professor.id
+        for term, tf in weighted.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+        languages = sorted({normalize(lang.strip()) for lang in professor.languages})
+        for lang in languages:
+            self._language_postings.setdefault(lang, set()).add(doc_id)
+
+        length = sum(weighted.values())
+        self._doc_terms[doc_id] = list(weighted)
+        self._doc_languages[doc_id] = languages
+        self._doc_len[doc_id] = length
+        self._ratings[doc_id] = professor.rating
+        self._total_len += length
+
+    def _remove_one(self, doc_id: str) -> None:
+        for term in self._doc_terms.pop(doc_id):
+            posting = self._postings[term]
+            del posting[doc_id]
+            if not posting:
+                del self._postings[term]
+        for lang in self._doc_languages.pop(doc_id):
+            members = self._language_postings[lang]
+            members.discard(doc_id)
+            if not members:
+                del self._language_postings[lang]
+        self._total_len -= self._doc_len.pop(doc_id)
+        del self._ratings[doc_id]
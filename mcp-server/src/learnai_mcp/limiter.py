@@ -0,0 +1,450 @@
+"""
+Adaptive Concurrency Limiter
+============================
+
+AIMD concurrency limit for upstream calls. The limit grows additively
+(about +1 per round trip) while the upstream is healthy and busy, and is
+cut multiplicatively when it shows congestion:
+
+- latency: the smoothed round-trip time of a latency class exceeds
+  ``tolerance`` times the best recently observed round-trip time of that
+  same class (its no-load baseline), or
+- errors: a call fails with an overload signal (5xx, 429, timeouts and
+  connection errors by default).
+
+Latency classes are given by the ``key`` passed to ``acquire`` (by default
+the lane), typically the endpoint. Comparing a multi-second LLM call with
+the baseline of millisecond catalog reads would look like congestion on a
+perfectly healthy upstream.
+
+Decreases happen at most once per round trip so a burst of failures from
+one congested window only counts once. Callers over the limit wait in
+per-lane FIFO queues; freed slots are shared between lanes by weighted fair
+queuing, so a heavily weighted lane (e.g. bookings) is admitted ahead of a
+backlog in a light one (e.g. LLM recommendations) without starving it. The
+time spent waiting is exported with the current limit.
+
+``Bulkhead`` is a fixed per-pool concurrency cap taken before the shared
+limiter, so one slow pool can only ever occupy its own slots.
+
+Both queues are bounded: a call arriving at a full queue (``max_queue``) or
+waiting longer than ``max_wait`` is shed with ``Overloaded``, which carries a
+retry-after hint derived from the current drain rate.
+
+No event-loop objects are created until the first ``acquire``, so a limiter
+can safely be built at import time.
+
+Usage:
+    limiter = AdaptiveLimiter(initial_limit=10, weights={"booking": 4, "recommend": 1})
+    async with bulkhead.acquire(), limiter.acquire(lane="booking", key="POST /api/bookings"):
+        response = await client.get(...)
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+
+class Overloaded(Exception):
+    """Raised when a call is shed instead of being queued any longer."""
+
+    #: Machine-readable error code reported to clients.
+    code = "overloaded"
+
+    def __init__(self, reason: str, retry_after_ms: int) -> None:
+        super().__init__(f"Overloaded ({reason}), retry after {retry_after_ms} ms")
+        self.reason = reason
+        self.retry_after_ms = retry_after_ms
+
+
+def is_upstream_overload(exc: BaseException) -> bool:
+    """Whether an HTTP failure indicates an overloaded or unreachable upstream."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status == httpx.codes.TOO_MANY_REQUESTS
+    return isinstance(exc, httpx.TransportError)
+
+
+@dataclass
+class LimiterStats:
+    """Counters describing limiter activity."""
+
+    acquired: int = 0
+    delayed: int = 0
+    overloads: int = 0
+    decreases: int = 0
+    shed_queue_full: int = 0
+    shed_timeout: int = 0
+
+
+@dataclass
+class _RttEstimate:
+    """Baseline and smoothed round-trip time of one latency class."""
+
+    baseline: float
+    smoothed: float
+    samples: int = 1
+
+
+class Permit:
+    """Handle for one admitted call; lets the caller flag an overload response."""
+
+    __slots__ = ("overloaded",)
+
+    def __init__(self) -> None:
+        self.overloaded = False
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter driven by latency and overload errors.
+
+    Args:
+        initial_limit: Starting concurrency limit.
+        min_limit: Lower bound for the limit.
+        max_limit: Upper bound for the limit.
+        tolerance: Smoothed RTT / baseline RTT ratio (within one latency
+            class) treated as congestion.
+        backoff: Factor applied to the limit on congestion.
+        baseline_window: Samples of a latency class after which its baseline
+            RTT is re-learned, so it follows lasting shifts in upstream latency.
+        weights: Relative share of freed slots per lane while lanes are
+            queued; lanes not listed get weight 1.
+        max_queue: Calls allowed to wait at once (``None`` = unbounded).
+        max_wait: Default seconds a call may wait before being shed.
+        is_overload: Classifies exceptions raised inside ``acquire``.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        tolerance: float = 2.0,
+        backoff: float = 0.9,
+        baseline_window: int = 1000,
+        weights: dict[str, float] | None = None,
+        max_queue: int | None = None,
+        max_wait: float | None = None,
+        is_overload: Callable[[BaseException], bool] = is_upstream_overload,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline_window = baseline_window
+        self._is_overload = is_overload
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self.weights = dict(weights or {})
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {}
+        # Weighted fair queuing: each admission advances its lane's virtual time by 1/weight.
+        self._virtual_time: dict[str, float] = {}
+        self._virtual_clock = 0.0
+        self._rtt: dict[str, _RttEstimate] = {}
+        # Across all classes; only used to estimate how fast the queue drains.
+        self._smoothed_rtt: float | None = None
+        self._last_decrease = float("-inf")
+        self._queue_wait = 0.0
+        self._queue_wait_max = 0.0
+        self._stats = LimiterStats()
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._waiters.values())
+
+    @asynccontextmanager
+    async def acquire(
+        self, lane: str = "default", max_wait: float | None = None, key: str | None = None
+    ) -> AsyncIterator[Permit]:
+        """Wait for a slot, run the block, and learn from its latency and outcome.
+
+        ``key`` names the call's latency class (default: ``lane``); its round
+        trip is only compared with earlier calls of the same class.
+
+        Raises ``Overloaded`` if the queue is full or the slot does not come
+        within ``max_wait`` seconds (default: the limiter's ``max_wait``).
+        """
+        queued_at = self._clock()
+        if self._in_flight < self.limit and not self.queued:
+            self._in_flight += 1
+        else:
+            await self._wait(lane, self.max_wait if max_wait is None else max_wait)
+        started = self._clock()
+        self._record_wait(started - queued_at)
+
+        permit = Permit()
+        sample = True
+        try:
+            yield permit
+        except asyncio.CancelledError:
+            sample = False
+            raise
+        except Exception as e:
+            if self._is_overload(e):
+                permit.overloaded = True
+            raise
+        finally:
+            self._in_flight -= 1
+            if sample:
+                self._on_sample(key or lane, self._clock() - started, permit.overloaded)
+            self._wake()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the current limit, occupancy, queue wait and RTT estimates."""
+
+        def ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        return {
+            **asdict(self._stats),
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queued": self.queued,
+            "queued_by_lane": {lane: len(q) for lane, q in self._waiters.items() if q},
+            "queue_wait_ms": ms(self._queue_wait),
+            "queue_wait_max_ms": ms(self._queue_wait_max),
+            "smoothed_rtt_ms": ms(self._smoothed_rtt),
+            "rtt_ms_by_key": {
+                key: {"baseline": ms(rtt.baseline), "smoothed": ms(rtt.smoothed)}
+                for key, rtt in self._rtt.items()
+            },
+        }
+
+    def retry_after_ms(self) -> int:
+        """Rough time for the current queue to drain, in milliseconds."""
+        rtt = self._smoothed_rtt or 0.05
+        return max(1, int(1000 * rtt * (self.queued + 1) / self.limit))
+
+    async def _wait(self, lane: str, max_wait: float | None) -> None:
+        if self.max_queue is not None and self.queued >= self.max_queue:
+            self._stats.shed_queue_full += 1
+            raise Overloaded("queue full", self.retry_after_ms())
+        self._stats.delayed += 1
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        queue = self._waiters.setdefault(lane, deque())
+        if not queue:
+            # A lane that was idle does not bank credit: it rejoins at the current virtual time.
+            self._virtual_time[lane] = max(self._virtual_time.get(lane, 0.0), self._virtual_clock)
+        queue.append(waiter)
+        try:
+            await _await_slot(waiter, queue, max_wait, self._release, self.retry_after_ms)
+        except Overloaded:
+            self._stats.shed_timeout += 1
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._in_flight < self.limit:
+            lanes = [lane for lane, q in self._waiters.items() if q]
+            if not lanes:
+                return
+            lane = min(lanes, key=self._virtual_time.__getitem__)
+            waiter = self._waiters[lane].popleft()
+            if not waiter.done():
+                self._virtual_clock = self._virtual_time[lane]
+                self._virtual_time[lane] += 1 / self.weights.get(lane, 1.0)
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def _record_wait(self, wait: float) -> None:
+        self._stats.acquired += 1
+        self._queue_wait += 0.1 * (wait - self._queue_wait)
+        self._queue_wait_max = max(self._queue_wait_max, wait)
+
+    def _on_sample(self, key: str, rtt: float, overloaded: bool) -> None:
+        estimate = self._rtt.get(key)
+        if estimate is None:
+            estimate = self._rtt[key] = _RttEstimate(baseline=rtt, smoothed=rtt)
+        else:
+            estimate.samples += 1
+            if rtt < estimate.baseline or estimate.samples % self.baseline_window == 0:
+                estimate.baseline = rtt
+            estimate.smoothed += 0.2 * (rtt - estimate.smoothed)
+        if self._smoothed_rtt is None:
+            self._smoothed_rtt = rtt
+        else:
+            self._smoothed_rtt += 0.2 * (rtt - self._smoothed_rtt)
+
+        if overloaded:
+            self._stats.overloads += 1
+        congested = overloaded or estimate.smoothed > self.tolerance * estimate.baseline
+        now = self._clock()
+        if congested:
+            if now - self._last_decrease >= estimate.smoothed:
+                self._limit = max(float(self.min_limit), self._limit * self.backoff)
+                self._last_decrease = now
+                self._stats.decreases += 1
+        elif self._in_flight + 1 >= self._limit / 2:
+            # Only grow while the current limit is actually being used.
+            self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+
+
+@dataclass
+class BulkheadStats:
+    """Counters describing bulkhead activity."""
+
+    acquired: int = 0
+    delayed: int = 0
+    shed_queue_full: int = 0
+    shed_timeout: int = 0
+
+
+class Bulkhead:
+    """Fixed concurrency cap for one pool of calls, with a bounded FIFO wait queue.
+
+    Args:
+        name: Pool name, used in metrics.
+        max_concurrent: Calls from this pool allowed in flight at once.
+        max_queue: Calls allowed to wait at once (``None`` = unbounded).
+        max_wait: Default seconds a call may wait before being shed.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: int,
+        max_queue: int | None = None,
+        max_wait: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+        self._hold_time: float | None = None
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._stats = BulkheadStats()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def acquire(self, max_wait: float | None = None) -> AsyncIterator[None]:
+        """Hold one of the pool's slots for the duration of the block.
+
+        Raises ``Overloaded`` if the queue is full or the slot does not come
+        within ``max_wait`` seconds (default: the bulkhead's ``max_wait``).
+        """
+        if self._in_flight < self.max_concurrent and not self._waiters:
+            self._in_flight += 1
+        else:
+            await self._wait(self.max_wait if max_wait is None else max_wait)
+        self._stats.acquired += 1
+        started = self._clock()
+        try:
+            yield
+        finally:
+            held = self._clock() - started
+            self._hold_time = (
+                held
+                if self._hold_time is None
+                else (self._hold_time + 0.2 * (held - self._hold_time))
+            )
+            self._release()
+
+    def retry_after_ms(self) -> int:
+        """Rough time for the current queue to drain, in milliseconds."""
+        hold = self._hold_time or 0.05
+        return max(1, int(1000 * hold * (len(self._waiters) + 1) / max(self.max_concurrent, 1)))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+        }
+
+    async def _wait(self, max_wait: float | None) -> None:
+        if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+            self._stats.shed_queue_full += 1
+            raise Overloaded(f"{self.name} queue full", self.retry_after_ms())
+        self._stats.delayed += 1
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await _await_slot(waiter, self._waiters, max_wait, self._release, self.retry_after_ms)
+        except Overloaded:
+            self._stats.shed_timeout += 1
+            raise
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.max_concurrent:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+async def _await_slot(
+    waiter: "asyncio.Future[None]",
+    queue: "deque[asyncio.Future[None]]",
+    max_wait: float | None,
+    release: Callable[[], None],
+    retry_after_ms: Callable[[], int],
+) -> None:
+    """Wait until ``waiter`` is granted a slot, shedding it after ``max_wait`` seconds."""
+
+    def expire() -> None:
+        if not waiter.done():
+            waiter.set_exception(Overloaded("queue wait exceeded", retry_after_ms()))
+
+    timer = None
+    if max_wait is not None:
+        timer = asyncio.get_running_loop().call_later(max(max_wait, 0.0), expire)
+    try:
+        await waiter
+    except BaseException:
+        if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+            # Granted a slot just as we were cancelled: hand it on.
+            release()
+        elif waiter in queue:
+            queue.remove(waiter)
+        raise
+    finally:
+        if timer is not None:
+            timer.cancel()
+
+
+def parse_pools(spec: str) -> dict[str, tuple[int, float]]:
+    """Parse ``"name=size:weight,..."`` pool settings (``:weight`` optional, default 1)."""
+    pools: dict[str, tuple[int, float]] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        size, _, weight = value.partition(":")
+        pools[name.strip()] = (int(size), float(weight or 1))
+    return pools
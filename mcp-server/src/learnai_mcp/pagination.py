@@ -0,0 +1,85 @@
+"""
+Keyset Pagination
+=================
+
+Opaque, stable cursors for professor listings ordered by rating (descending)
+then id (ascending).
+
+A cursor encodes the sort key of the last item returned (rating, id), not
+an offset. The next page starts strictly after that key, so rows inserted
+or removed between calls never shift a page: nothing is skipped or repeated
+except the rows that actually changed. Each cursor is also bound to a scope
+(a fingerprint of the query's filters). A cursor replayed against different
+filters is rejected instead of silently returning the wrong rows.
+
+A page from a source that is asked to continue after a key is checked with
+``in_keyset_order``. A source that ignores the keyset and repeats earlier
+rows is caught instead of being paged through forever.
+
+Usage:
+    scope = cursor_scope({"subject": "math"})
+    after = decode_cursor(cursor, scope) if cursor else None
+    rows = await fetch(after, limit)
+    if not in_keyset_order([key_of(r) for r in rows], after):
+        raise KeysetIgnored(...)
+    next_cursor = encode_cursor(key_of(rows[-1]), scope)
+"""
+
+import base64
+import binascii
+import hashlib
+from collections.abc import Sequence
+from typing import Any
+
+import orjson
+
+# Sort key of a row: (rating, id), ordered by rating descending then id ascending
+Key = tuple[float, str]
+
+
+class InvalidCursor(ValueError):
+    """Raised for a malformed cursor or one issued for a different query."""
+
+
+class KeysetIgnored(RuntimeError):
+    """Raised when a source returns rows that do not continue after the requested key."""
+
+
+def cursor_scope(filters: dict[str, Any]) -> str:
+    """Fingerprint a query's filters so its cursors cannot be reused elsewhere."""
+    digest = hashlib.blake2b(orjson.dumps(filters, option=orjson.OPT_SORT_KEYS), digest_size=6)
+    return digest.hexdigest()
+
+
+def encode_cursor(key: Key, scope: str) -> str:
+    """Encode the key of the last returned row as an opaque cursor."""
+    payload = orjson.dumps([key[0], key[1], scope])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, scope: str) -> Key:
+    """Decode a cursor issued by :func:`encode_cursor` for the same scope."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rating, professor_id, issued_for = orjson.loads(base64.urlsafe_b64decode(padded))
+        key = (float(rating), str(professor_id))
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if issued_for != scope:
+        raise InvalidCursor("Cursor belongs to a different query")
+    return key
+
+
+def is_after(key: Key, after: Key) -> bool:
+    """Whether ``key`` sorts strictly after ``after`` (rating desc, id asc)."""
+    return key[0] < after[0] or (key[0] == after[0] and key[1] > after[1])
+
+
+def in_keyset_order(keys: Sequence[Key], after: Key | None = None) -> bool:
+    """Whether ``keys`` strictly increase in keyset order, all after ``after``."""
+    previous = after
+    for key in keys:
+        if previous is not None and not is_after(key, previous):
+            return False
+        previous = key
+    return True
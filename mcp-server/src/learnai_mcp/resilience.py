@@ -0,0 +1,399 @@
+"""
+Upstream Resilience
+===================
+
+Failure handling for calls to the LearnAI API, layered on top of the
+limiter and bulkheads:
+
+- Circuit breakers, one per endpoint (method + path template). After
+  ``failure_threshold`` consecutive overload failures (5xx, 429, timeouts,
+  connection errors) the circuit opens and calls fail immediately with
+  ``CircuitOpen`` for ``reset_timeout`` seconds. It then turns half-open and
+  lets ``half_open_max`` trial calls through: a success closes it again, a
+  failure re-opens it. Client errors (4xx) mean the upstream answered and
+  count as successes.
+- Retries with decorrelated-jitter backoff
+  (``sleep = min(cap, uniform(base, 3 * previous_sleep))``) for idempotent
+  calls, so retries from many callers spread out instead of synchronizing.
+  Each attempt goes through the breaker, so retries stop as soon as the
+  circuit opens, and no retry is started that would end past the request
+  deadline (see ``learnai_mcp.deadline``).
+- Hedged requests (optional): once an endpoint has enough latency samples,
+  a second identical request is sent if the first has not answered within
+  the endpoint's p95 latency. The first success wins and the other request
+  is cancelled.
+
+``CircuitOpen`` is an ``Overloaded`` error, so it is never retried and is
+reported to clients with a retry-after hint like any other shed call.
+
+Usage:
+    resilience = Resilience(retry=RetryPolicy(attempts=3), hedge=True)
+    data = await resilience.call(endpoint_key("GET", path), fetch, idempotent=True)
+"""
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+from learnai_mcp import deadline
+from learnai_mcp.limiter import Overloaded, is_upstream_overload
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Overloaded):
+    """Raised when a call is rejected because its endpoint's circuit is open."""
+
+    code = "circuit_open"
+
+    def __init__(self, endpoint: str, retry_after_ms: int) -> None:
+        super().__init__(f"circuit open for {endpoint}", retry_after_ms)
+        self.endpoint = endpoint
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Group requests by route: path segments containing digits become ``{id}``."""
+    segments = path.split("?", 1)[0].split("/")
+    template = "/".join(
+        "{id}" if any(c.isdigit() for c in segment) else segment for segment in segments
+    )
+    return f"{method.upper()} {template}"
+
+
+@dataclass
+class BreakerStats:
+    """Counters describing one circuit breaker."""
+
+    successes: int = 0
+    failures: int = 0
+    opened: int = 0
+    rejected: int = 0
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one endpoint.
+
+    Args:
+        endpoint: Endpoint name, used in errors and metrics.
+        failure_threshold: Consecutive failures that open the circuit.
+        reset_timeout: Seconds the circuit stays open before trial calls.
+        half_open_max: Trial calls allowed at once while half-open.
+        is_failure: Classifies exceptions as upstream failures.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max: int = 1,
+        is_failure: Callable[[BaseException], bool] = is_upstream_overload,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self._is_failure = is_failure
+        self._clock = clock
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._stats = BreakerStats()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` if the circuit admits it and record the outcome."""
+        self._admit()
+        trial = self._state == HALF_OPEN
+        try:
+            result = await fn()
+        except Exception as e:
+            if self._is_failure(e):
+                self._on_failure()
+            elif isinstance(e, Overloaded):
+                # Shed locally before reaching the upstream: no verdict either way.
+                self._abandon(trial)
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            self._abandon(trial)
+            raise
+        self._on_success()
+        return result
+
+    def retry_after_ms(self) -> int:
+        """Time until the circuit lets trial calls through, in milliseconds."""
+        remaining = self.reset_timeout - (self._clock() - self._opened_at)
+        if remaining <= 0:
+            # Half-open with its trial calls taken: try again once they are likely done.
+            remaining = min(self.reset_timeout, 1.0)
+        return max(1, math.ceil(1000 * remaining))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+        }
+
+    def _admit(self) -> None:
+        if self.state == CLOSED:
+            return
+        if self.state == HALF_OPEN and self._trials < self.half_open_max:
+            self._state = HALF_OPEN
+            self._trials += 1
+            return
+        self._stats.rejected += 1
+        raise CircuitOpen(self.endpoint, self.retry_after_ms())
+
+    def _on_success(self) -> None:
+        self._stats.successes += 1
+        self._consecutive_failures = 0
+        self._state = CLOSED
+        self._trials = 0
+
+    def _on_failure(self) -> None:
+        self._stats.failures += 1
+        self._consecutive_failures += 1
+        if self._state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self._stats.opened += 1
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._trials = 0
+
+    def _abandon(self, trial: bool) -> None:
+        if trial and self._state == HALF_OPEN:
+            self._trials -= 1
+
+
+class RetryPolicy:
+    """Retry budget with decorrelated-jitter backoff.
+
+    Args:
+        attempts: Total attempts per call, including the first (1 = no retries).
+        base: Minimum backoff in seconds.
+        cap: Maximum backoff in seconds.
+        retry_on: Classifies exceptions as worth retrying.
+        rng: ``random.uniform``-compatible source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base: float = 0.05,
+        cap: float = 1.0,
+        retry_on: Callable[[BaseException], bool] = is_upstream_overload,
+        rng: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.retry_on = retry_on
+        self._rng = rng
+
+    def backoffs(self) -> list[float]:
+        """Sleep durations before each retry."""
+        delays = []
+        sleep = self.base
+        for _ in range(self.attempts - 1):
+            sleep = min(self.cap, self._rng(self.base, sleep * 3))
+            delays.append(sleep)
+        return delays
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies for one endpoint."""
+
+    def __init__(self, window: int = 256, min_samples: int = 20) -> None:
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+        self._sorted: list[float] | None = None
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._sorted = None
+
+    def quantile(self, q: float) -> float | None:
+        """The ``q`` quantile of the window, or None until ``min_samples`` are seen."""
+        if len(self._samples) < self.min_samples:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+        return self._sorted[min(len(self._sorted) - 1, int(q * len(self._sorted)))]
+
+
+@dataclass
+class ResilienceStats:
+    """Counters for retries and hedged requests across all endpoints."""
+
+    retries: int = 0
+    retries_exhausted: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+
+class Resilience:
+    """Per-endpoint circuit breakers, retries and hedging for upstream calls.
+
+    Args:
+        failure_threshold: Consecutive failures that open an endpoint's circuit.
+        reset_timeout: Seconds a circuit stays open before trial calls.
+        retry: Retry policy for idempotent calls (``None`` = no retries).
+        hedge: Whether to hedge idempotent calls.
+        hedge_quantile: Latency quantile after which a hedge is sent.
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry: RetryPolicy | None = None,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry = retry or RetryPolicy(attempts=1)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self._clock = clock
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._latency: dict[str, LatencyTracker] = {}
+        self._stats = ResilienceStats()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                endpoint,
+                failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout,
+                clock=self._clock,
+            )
+        return breaker
+
+    def latency(self, endpoint: str) -> LatencyTracker:
+        tracker = self._latency.get(endpoint)
+        if tracker is None:
+            tracker = self._latency[endpoint] = LatencyTracker()
+        return tracker
+
+    async def call(
+        self,
+        endpoint: str,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        idempotent: bool,
+        can_hedge: Callable[[], bool] = lambda: True,
+    ) -> T:
+        """Run ``fn`` through the endpoint's breaker, retrying/hedging if idempotent.
+
+        ``can_hedge`` is checked when a hedge is due; return False to skip it
+        (e.g. while upstream calls are already queuing).
+        """
+        breaker = self.breaker(endpoint)
+
+        async def timed() -> T:
+            started = self._clock()
+            result = await fn()
+            self.latency(endpoint).record(self._clock() - started)
+            return result
+
+        if not idempotent:
+            return await breaker.call(timed)
+
+        async def attempt() -> T:
+            if self.hedge:
+                return await self._hedged(endpoint, timed, can_hedge)
+            return await timed()
+
+        backoffs = deque(self.retry.backoffs())
+        while True:
+            try:
+                return await breaker.call(attempt)
+            except Exception as e:
+                if isinstance(e, Overloaded) or not self.retry.retry_on(e):
+                    raise
+                left = deadline.remaining()
+                if not backoffs or (left is not None and left <= backoffs[0]):
+                    # Out of attempts, or the caller's deadline ends before the next one.
+                    if self.retry.attempts > 1:
+                        self._stats.retries_exhausted += 1
+                    raise
+            self._stats.retries += 1
+            await asyncio.sleep(backoffs.popleft())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "circuits": {name: breaker.stats() for name, breaker in self._breakers.items()},
+            "p95_ms": {
+                name: round(p95 * 1000, 2)
+                for name, tracker in self._latency.items()
+                if (p95 := tracker.quantile(0.95)) is not None
+            },
+        }
+
+    def clear(self) -> None:
+        """Forget all circuits, latency samples and counters."""
+        self._breakers.clear()
+        self._latency.clear()
+        self._stats = ResilienceStats()
+
+    async def _hedged(
+        self,
+        endpoint: str,
+        fn: Callable[[], Awaitable[T]],
+        can_hedge: Callable[[], bool],
+    ) -> T:
+        delay = self.latency(endpoint).quantile(self.hedge_quantile)
+        primary = asyncio.ensure_future(fn())
+        if delay is None:
+            return await primary
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or not can_hedge():
+                return await primary
+            self._stats.hedges += 1
+            hedge = asyncio.ensure_future(fn())
+            tasks.add(hedge)
+            error: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._stats.hedge_wins += 1
+                        return task.result()
+                    if error is None or task is primary:
+                        error = task.exception()
+            assert error is not None
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,116 @@
+"""
+Production Runner
+=================
+
+Serves the A2A agent and the MCP server's HTTP transport with uvicorn,
+optionally across several worker processes.
+
+With ``--workers N`` (``0`` = one per CPU core), uvicorn's supervisor binds
+the listening socket once and pre-forks N workers that all accept from it.
+Each worker runs its own event loop, so the server uses every core instead
+of one. The supervisor restarts workers that exit, which makes
+``--max-requests`` safe. Each worker is recycled after about that many
+requests, with jitter so workers do not restart together, which bounds
+memory growth. On SIGTERM, workers stop accepting connections and give
+in-flight requests up to ``--graceful-timeout`` seconds to finish.
+
+uvloop and httptools are used when installed (``pip install
+learnai-mcp[speedups]``); ``--loop`` and ``--http`` force a choice.
+
+Workers share nothing. Caches, admission limits, circuit breakers and A2A
+background tasks are per worker, and each worker opens its own upstream
+connection pool.
+
+Usage:
+    parser = argparse.ArgumentParser()
+    runner.add_arguments(parser)
+    args = parser.parse_args()
+    runner.serve("learnai_mcp.a2a.agent:app", args)
+"""
+
+import argparse
+import logging
+import os
+from typing import Any
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the command-line options: worker processes (0 = one per CPU
+# core), requests before a worker is recycled (0 = never), and seconds
+# in-flight requests get to finish on shutdown
+LEARNAI_WORKERS = int(os.environ.get("LEARNAI_WORKERS", "1"))
+LEARNAI_MAX_REQUESTS = int(os.environ.get("LEARNAI_MAX_REQUESTS", "0"))
+LEARNAI_GRACEFUL_TIMEOUT = int(os.environ.get("LEARNAI_GRACEFUL_TIMEOUT", "30"))
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the process and server tuning options to an entry point's parser."""
+    group = parser.add_argument_group("serving")
+    group.add_argument(
+        "--workers",
+        type=int,
+        default=LEARNAI_WORKERS,
+        help="Worker processes, 0 for one per CPU core (default: %(default)s)",
+    )
+    group.add_argument(
+        "--max-requests",
+        type=int,
+        default=LEARNAI_MAX_REQUESTS,
+        help="Recycle a worker after about this many requests, 0 to never (default: %(default)s)",
+    )
+    group.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=LEARNAI_GRACEFUL_TIMEOUT,
+        help="Seconds in-flight requests get to finish on shutdown (default: %(default)s)",
+    )
+    group.add_argument(
+        "--loop",
+        choices=["auto", "asyncio", "uvloop"],
+        default="auto",
+        help="Event loop; auto uses uvloop when installed (default: %(default)s)",
+    )
+    group.add_argument(
+        "--http",
+        choices=["auto", "h11", "httptools"],
+        default="auto",
+        help="HTTP parser; auto uses httptools when installed (default: %(default)s)",
+    )
+
+
+def worker_count(requested: int) -> int:
+    """Resolve ``--workers``, where 0 means one per CPU core this process may use."""
+    if requested > 0:
+        return requested
+    if hasattr(os, "sched_getaffinity"):
+        # Honours CPU pinning (cpusets), unlike os.cpu_count()
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def uvicorn_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Translate parsed options into ``uvicorn.run`` keyword arguments."""
+    workers = worker_count(args.workers)
+    options: dict[str, Any] = {
+        "host": args.host,
+        "port": args.port,
+        "workers": workers,
+        "loop": args.loop,
+        "http": args.http,
+        "timeout_graceful_shutdown": args.graceful_timeout,
+    }
+    if args.max_requests > 0:
+        if workers > 1:
+            options["limit_max_requests"] = args.max_requests
+            options["limit_max_requests_jitter"] = args.max_requests // 10
+        else:
+            # A lone process is not restarted: it would simply stop serving
+            logger.warning("--max-requests is ignored without --workers > 1")
+    return options
+
+
+def serve(app: str, args: argparse.Namespace, **options: Any) -> None:
+    """Run ``app`` (an import string, so workers can import it) with uvicorn."""
+    uvicorn.run(app, **uvicorn_options(args), **options)
@@ -0,0 +1,435 @@
+"""
+Semantic Professor Index
+========================
+
+Local, CPU-only candidate generator for semantic professor matching:
+
+- ``HashingEmbedder``: the default embedder. Words and character trigrams are
+  hashed (signed feature hashing) into a fixed-size L2-normalized vector, so
+  "calc" still lands near "calculus" and no model download is needed. Any
+  object implementing the ``Embedder`` protocol can be plugged in instead
+  (see ``load_embedder``).
+- ``IVFIndex``: inverted-file approximate nearest-neighbour index in pure
+  NumPy. Vectors are clustered with spherical k-means; a query only scans the
+  ``n_probe`` closest clusters. Rows added after the last build are kept in a
+  small exhaustive overflow area and replaced rows are tombstoned until the
+  next rebuild.
+- ``SemanticIndex``: ties embedder and IVF index to professor records and
+  answers batches of queries with one matrix multiply.
+
+Indexes are saved as ``.npy`` files and loaded back with ``mmap_mode="r"``,
+so a restart maps the index instead of re-embedding the catalog.
+"""
+
+import asyncio
+import functools
+import importlib
+import json
+import shutil
+import tempfile
+import zlib
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Generic, Protocol, TypeVar
+
+import numpy as np
+
+from learnai_mcp.text import tokenize
+
+if TYPE_CHECKING:
+    from learnai_mcp.server import ProfessorInfo
+
+INDEX_FORMAT_VERSION = 1
+
+
+# ---------------------------------------------------------------------------
+# Embedders
+# ---------------------------------------------------------------------------
+
+
+class Embedder(Protocol):
+    """Turns texts into L2-normalized float32 vectors of a fixed dimension."""
+
+    @property
+    def dim(self) -> int: ...
+
+    @property
+    def signature(self) -> str:
+        """Identifies the embedding space; persisted indexes must match it."""
+        ...
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+class HashingEmbedder:
+    """Signed feature hashing of words and character trigrams.
+
+    Args:
+        dim: Output dimension.
+        ngram: Character n-gram size taken from each padded word.
+    """
+
+    def __init__(self, dim: int = 512, ngram: int = 3) -> None:
+        self._dim = dim
+        self.ngram = ngram
+        self._features = functools.lru_cache(maxsize=200_000)(self._token_features)
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    @property
+    def signature(self) -> str:
+        return f"hashing-crc32-{self._dim}-{self.ngram}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self._dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = [self._features(token) for token in tokenize(text)]
+            if not features:
+                continue
+            indices = np.concatenate([f[0] for f in features])
+            weights = np.concatenate([f[1] for f in features])
+            out[row] = np.bincount(indices, weights=weights, minlength=self._dim)
+        return _l2_normalize(out)
+
+    def _token_features(self, token: str) -> tuple[np.ndarray, np.ndarray]:
+        padded = f"<{token}>"
+        grams = [f"w:{token}"] + [
+            padded[i : i + self.ngram] for i in range(max(1, len(padded) - self.ngram + 1))
+        ]
+        hashes = [zlib.crc32(g.encode()) for g in grams]
+        indices = np.fromiter((h % self._dim for h in hashes), dtype=np.intp, count=len(hashes))
+        signs = np.fromiter(
+            (1.0 if h & 0x80000000 else -1.0 for h in hashes), dtype=np.float64, count=len(hashes)
+        )
+        # The whole-word feature counts as much as all of its n-grams together.
+        signs[0] *= len(grams) - 1
+        return indices, signs
+
+
+def load_embedder(spec: str) -> Embedder:
+    """Build an embedder from ``"hashing"`` or a ``"package.module:factory"`` path."""
+    if not spec or spec == "hashing":
+        return HashingEmbedder()
+    module_name, _, attr = spec.partition(":")
+    factory = getattr(importlib.import_module(module_name), attr or "embedder")
+    embedder: Embedder = factory()
+    return embedder
+
+
+def _l2_normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    normalized: np.ndarray = (x / norms).astype(np.float32, copy=False)
+    return normalized
+
+
+# ---------------------------------------------------------------------------
+# IVF index
+# ---------------------------------------------------------------------------
+
+
+def _spherical_kmeans(
+    x: np.ndarray, k: int, iterations: int = 10, sample: int = 20_000, seed: int = 0
+) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity; returns normalized centroids."""
+    rng = np.random.default_rng(seed)
+    if len(x) > sample:
+        x = x[rng.choice(len(x), sample, replace=False)]
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        centroids[filled] = np.add.reduceat(x[order], starts, axis=0) / counts[filled, None]
+        centroids = _l2_normalize(centroids)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file ANN index over unit vectors (inner product = cosine)."""
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self._centroids = np.zeros((1, dim), dtype=np.float32)
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=object)
+        self._offsets = np.zeros(2, dtype=np.int64)
+        self._overflow: dict[str, np.ndarray] = {}
+        self._tombstones: set[str] = set()
+        self._base_ids: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._base_ids) - len(self._tombstones) + len(self._overflow)
+
+    @property
+    def pending(self) -> int:
+        """Rows changed since the last build (overflow plus tombstones)."""
+        return len(self._overflow) + len(self._tombstones)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self._centroids)
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray, n_lists: int | None = None) -> None:
+        """(Re)build the index from scratch."""
+        n = len(ids)
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(n)))
+        n_lists = max(1, min(n_lists, n))
+        if n == 0:
+            centroids = np.zeros((1, self.dim), dtype=np.float32)
+            assign = np.zeros(0, dtype=np.intp)
+        elif n_lists == 1:
+            centroids = _l2_normalize(vectors.mean(axis=0, keepdims=True))
+            assign = np.zeros(n, dtype=np.intp)
+        else:
+            centroids = _spherical_kmeans(vectors, n_lists)
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=len(centroids))
+        self._centroids = centroids
+        self._vectors = np.ascontiguousarray(vectors[order], dtype=np.float32)
+        self._ids = np.asarray(ids, dtype=object)[order]
+        self._offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._overflow = {}
+        self._tombstones = set()
+        self._base_ids = set(ids)
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        for doc_id, vector in zip(ids, vectors, strict=True):
+            if doc_id in self._base_ids:
+                self._tombstones.add(doc_id)
+            self._overflow[doc_id] = vector
+
+    def remove(self, ids: Iterable[str]) -> None:
+        for doc_id in ids:
+            if doc_id in self._base_ids:
+                self._tombstones.add(doc_id)
+            self._overflow.pop(doc_id, None)
+
+    def search(
+        self, queries: np.ndarray, k: int, n_probe: int = 8
+    ) -> list[list[tuple[str, float]]]:
+        """Return the top ``k`` ``(id, cosine)`` pairs for each query row."""
+        if k <= 0 or len(queries) == 0:
+            return [[] for _ in range(len(queries))]
+        n_probe = max(1, min(n_probe, self.n_lists))
+        centroid_scores = queries @ self._centroids.T
+        probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+        overflow_ids = np.asarray(list(self._overflow), dtype=object)
+        overflow_vectors = np.stack(list(self._overflow.values())) if self._overflow else None
+        tombstones = np.asarray(list(self._tombstones), dtype=object)
+
+        results = []
+        for query, probe in zip(queries, probes, strict=True):
+            rows = np.concatenate(
+                [np.arange(self._offsets[p], self._offsets[p + 1]) for p in probe]
+            )
+            ids = self._ids[rows]
+            scores = self._vectors[rows] @ query
+            if len(tombstones):
+                scores = np.where(np.isin(ids, tombstones), -np.inf, scores)
+            if overflow_vectors is not None:
+                ids = np.concatenate([ids, overflow_ids])
+                scores = np.concatenate([scores, overflow_vectors @ query])
+            top = min(k, len(scores))
+            best = np.argpartition(-scores, top - 1)[:top] if top else np.zeros(0, np.intp)
+            best = best[np.argsort(-scores[best], kind="stable")]
+            results.append(
+                [(str(ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i])]
+            )
+        return results
+
+    def save(self, path: Path) -> None:
+        """Write the built part of the index as ``.npy`` files under ``path``."""
+        np.save(path / "centroids.npy", self._centroids)
+        np.save(path / "vectors.npy", self._vectors)
+        np.save(path / "offsets.npy", self._offsets)
+        np.save(path / "ids.npy", self._ids.astype(str))
+
+    @classmethod
+    def load(cls, path: Path, dim: int) -> "IVFIndex":
+        """Map a saved index back into memory without copying the vectors."""
+        index = cls(dim)
+        index._centroids = np.load(path / "centroids.npy", mmap_mode="r")
+        index._vectors = np.load(path / "vectors.npy", mmap_mode="r")
+        index._offsets = np.load(path / "offsets.npy")
+        index._ids = np.load(path / "ids.npy").astype(object)
+        index._base_ids = set(index._ids.tolist())
+        return index
+
+
+# ---------------------------------------------------------------------------
+# Professor index
+# ---------------------------------------------------------------------------
+
+
+def professor_text(professor: "ProfessorInfo") -> str:
+    """Text embedded for a professor: title, subjects and bio."""
+    return " ".join(
+        part for part in (professor.title, " ".join(professor.subjects), professor.bio) if part
+    )
+
+
+class SemanticIndex:
+    """Embedding + IVF index over professors, keyed by professor id.
+
+    Args:
+        embedder: Embedding backend; defaults to ``HashingEmbedder``.
+        n_probe: Number of clusters scanned per query.
+        rebuild_ratio: Fraction of changed rows after which ``needs_rebuild`` is set.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        n_probe: int = 8,
+        rebuild_ratio: float = 0.1,
+    ) -> None:
+        self.embedder = embedder or HashingEmbedder()
+        self.n_probe = n_probe
+        self.rebuild_ratio = rebuild_ratio
+        self._index = IVFIndex(self.embedder.dim)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def clear(self) -> None:
+        self._index = IVFIndex(self.embedder.dim)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self._index.pending > 256 + self.rebuild_ratio * len(self._index)
+
+    def rebuild(self, professors: Iterable["ProfessorInfo"]) -> None:
+        """Embed all professors and build a fresh index (swapped in atomically)."""
+        records = list(professors)
+        vectors = self.embedder.embed([professor_text(p) for p in records])
+        index = IVFIndex(self.embedder.dim)
+        index.build([p.id for p in records], vectors)
+        self._index = index
+
+    def upsert(self, professors: Iterable["ProfessorInfo"]) -> None:
+        records = list(professors)
+        if records:
+            vectors = self.embedder.embed([professor_text(p) for p in records])
+            self._index.upsert([p.id for p in records], vectors)
+
+    def remove(self, professor_ids: Iterable[str]) -> None:
+        self._index.remove(professor_ids)
+
+    def search(self, queries: Sequence[str], limit: int = 10) -> list[list[tuple[str, float]]]:
+        """Answer a batch of text queries with one embedding + matrix multiply."""
+        if not len(self._index):
+            return [[] for _ in queries]
+        vectors = self.embedder.embed(queries)
+        return self._index.search(vectors, limit, self.n_probe)
+
+    def save(self, path: str | Path) -> None:
+        """Persist the index to directory ``path``, replacing any previous one."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+        try:
+            self._index.save(tmp)
+            meta = {
+                "format": INDEX_FORMAT_VERSION,
+                "embedder": self.embedder.signature,
+                "dim": self.embedder.dim,
+            }
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            old = path.with_name(f".{path.name}.old")
+            if path.exists():
+                shutil.rmtree(old, ignore_errors=True)
+                path.rename(old)
+            tmp.rename(path)
+            shutil.rmtree(old, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def load(self, path: str | Path) -> bool:
+        """Memory-map a saved index; returns False if missing or built with another embedder."""
+        path = Path(path)
+        try:
+            meta = json.loads((path / "meta.json").read_text())
+        except (OSError, ValueError):
+            return False
+        if (
+            meta.get("format") != INDEX_FORMAT_VERSION
+            or meta.get("embedder") != self.embedder.signature
+        ):
+            return False
+        self._index = IVFIndex.load(path, self.embedder.dim)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Query micro-batching
+# ---------------------------------------------------------------------------
+
+Q = TypeVar("Q")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[Q, R]):
+    """Collect concurrent single queries into batches for a vectorized handler.
+
+    Args:
+        handler: Processes a list of queries and returns one result per query.
+        max_batch: Largest batch handed to ``handler``.
+        max_delay: Seconds to wait for more queries before running a batch.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[Q]], Awaitable[list[R]]],
+        max_batch: int = 32,
+        max_delay: float = 0.002,
+    ) -> None:
+        self._handler = handler
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: list[tuple[Q, asyncio.Future[R]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Future[None]] = set()
+        self.batches = 0
+
+    async def submit(self, query: Q) -> R:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((query, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch):
+            self.batches += 1
+            task = asyncio.ensure_future(self._run(pending[start : start + self.max_batch]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Q, "asyncio.Future[R]"]]) -> None:
+        try:
+            results = await self._handler([query for query, _ in batch])
+        except Exception as e:  # noqa: BLE001 - handed to every waiter in the batch
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if not future.done():
+                future.set_result(result)
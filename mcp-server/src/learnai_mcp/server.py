@@ -8,11 +8,18 @@ MCP Context Forge for centralized governance.
 
 Tools exposed:
 - search_professors: Search for professors by subject, language, rating
+- keyword_search_professors: Local BM25 keyword search over bios, titles, subjects
+- semantic_search_professors: Local embedding (ANN) search for free-text learning goals
 - recommend_professors: AI-powered professor recommendations
 - create_booking: Book a tutoring session
 - get_booking_status: Check booking status
+- get_booking_statuses: Check many bookings in one call
+- search_professors_batch: Run several professor searches in one call
 - list_subjects: Get available teaching subjects
 
+Resources exposed:
+- learnai://metrics: Runtime counters (cache hit/miss/eviction, ...)
+
 Usage:
     # stdio transport (for local/containerized use)
     learnai-mcp
@@ -20,6 +27,9 @@ Usage:
     # HTTP transport (for network access)
     learnai-mcp --transport http --port 9100
 
+    # HTTP transport on every core, recycling workers to bound memory
+    learnai-mcp --transport http --port 9100 --workers 0 --max-requests 50000
+
 Reference:
     https://github.com/ruslanmv/mcp-context-forge
 """
@@ -28,11 +38,49 @@ import argparse
 import asyncio
 import logging
 import os
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, Literal, TypeVar
 
 import httpx
+import orjson
 from fastmcp import FastMCP
-from pydantic import BaseModel, Field
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+from pydantic import BaseModel, Field, TypeAdapter
+from starlette.applications import Starlette
+
+from learnai_mcp import deadline, runner
+from learnai_mcp.balancer import tried_replicas
+from learnai_mcp.cache import ResponseCache
+from learnai_mcp.catalog import ProfessorCatalog
+from learnai_mcp.client import ApiClient
+from learnai_mcp.coalesce import SingleFlight
+from learnai_mcp.codec import JsonCodec, loads
+from learnai_mcp.keyword_index import KeywordIndex
+from learnai_mcp.limiter import (
+    AdaptiveLimiter,
+    Bulkhead,
+    Overloaded,
+    is_upstream_overload,
+    parse_pools,
+)
+from learnai_mcp.pagination import (
+    InvalidCursor,
+    Key,
+    KeysetIgnored,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+    in_keyset_order,
+)
+from learnai_mcp.resilience import CircuitOpen, Resilience, RetryPolicy, endpoint_key
+from learnai_mcp.semantic import MicroBatcher, SemanticIndex, load_embedder
+from learnai_mcp.similarity_cache import NearDuplicateCache
+from learnai_mcp.snapshot import SnapshotError, read_snapshot, write_snapshot
+from learnai_mcp.sync import CatalogSync
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +91,75 @@ logger = logging.getLogger(__name__)
 LEARNAI_API_URL = os.environ.get("LEARNAI_API_URL", "http://localhost:3000")
 LEARNAI_API_KEY = os.environ.get("LEARNAI_API_KEY", "")
 
+# Adaptive (AIMD) limit on concurrent upstream requests
+LEARNAI_CONCURRENCY_INITIAL = int(os.environ.get("LEARNAI_CONCURRENCY_INITIAL", "10"))
+LEARNAI_CONCURRENCY_MIN = int(os.environ.get("LEARNAI_CONCURRENCY_MIN", "2"))
+LEARNAI_CONCURRENCY_MAX = int(os.environ.get("LEARNAI_CONCURRENCY_MAX", "100"))
+LEARNAI_CONCURRENCY_TOLERANCE = float(os.environ.get("LEARNAI_CONCURRENCY_TOLERANCE", "2.0"))
+
+# Per-pool bulkheads ("pool=max_concurrent:weight"); weights share the adaptive limit when queued
+LEARNAI_POOLS = os.environ.get("LEARNAI_POOLS", "")
+_DEFAULT_POOLS = "booking=20:4,catalog=20:2,recommend=4:1"
+
+# Load shedding: bounded upstream wait queues (depth per queue, total seconds per call)
+LEARNAI_QUEUE_MAX_DEPTH = int(os.environ.get("LEARNAI_QUEUE_MAX_DEPTH", "100"))
+LEARNAI_QUEUE_MAX_WAIT = float(os.environ.get("LEARNAI_QUEUE_MAX_WAIT", "5"))
+
+# Circuit breakers (per endpoint), GET retries and hedged GETs
+LEARNAI_CIRCUIT_FAILURES = int(os.environ.get("LEARNAI_CIRCUIT_FAILURES", "5"))
+LEARNAI_CIRCUIT_RESET = float(os.environ.get("LEARNAI_CIRCUIT_RESET", "30"))
+LEARNAI_RETRY_ATTEMPTS = int(os.environ.get("LEARNAI_RETRY_ATTEMPTS", "3"))
+LEARNAI_RETRY_BASE = float(os.environ.get("LEARNAI_RETRY_BASE", "0.05"))
+LEARNAI_RETRY_CAP = float(os.environ.get("LEARNAI_RETRY_CAP", "1.0"))
+LEARNAI_HEDGE_GETS = os.environ.get("LEARNAI_HEDGE_GETS", "").lower() in ("1", "true", "yes")
+
+# Time budget per tool call in seconds (0 = none), with per-tool overrides ("tool=seconds,...")
+LEARNAI_TOOL_TIMEOUT = float(os.environ.get("LEARNAI_TOOL_TIMEOUT", "25"))
+LEARNAI_TOOL_BUDGETS = os.environ.get("LEARNAI_TOOL_BUDGETS", "")
+_DEFAULT_TOOL_BUDGETS = "search_professors=10,list_subjects=10,get_booking_status=10"
+
+# Response cache for read-only catalog tools (search_professors, list_subjects)
+LEARNAI_CACHE_TTL = float(os.environ.get("LEARNAI_CACHE_TTL", "60"))
+LEARNAI_CACHE_STALE_TTL = float(os.environ.get("LEARNAI_CACHE_STALE_TTL", "300"))
+LEARNAI_CACHE_MAX_ENTRIES = int(os.environ.get("LEARNAI_CACHE_MAX_ENTRIES", "512"))
+LEARNAI_CACHE_MAX_BYTES = int(os.environ.get("LEARNAI_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Local columnar catalog answering search_professors without an upstream round trip
+LEARNAI_LOCAL_CATALOG = os.environ.get("LEARNAI_LOCAL_CATALOG", "").lower() in ("1", "true", "yes")
+LEARNAI_CATALOG_REFRESH = float(os.environ.get("LEARNAI_CATALOG_REFRESH", "300"))
+LEARNAI_CATALOG_MAX_ROWS = int(os.environ.get("LEARNAI_CATALOG_MAX_ROWS", "100000"))
+
+# Last-known-good catalog snapshot for warm starts and upstream outages ("" disables)
+LEARNAI_SNAPSHOT_PATH = os.environ.get("LEARNAI_SNAPSHOT_PATH", "")
+LEARNAI_SNAPSHOT_INTERVAL = float(os.environ.get("LEARNAI_SNAPSHOT_INTERVAL", "60"))
+
+# Background incremental catalog sync (runs when the local catalog or snapshots are enabled)
+LEARNAI_CATALOG_SYNC_INTERVAL = float(os.environ.get("LEARNAI_CATALOG_SYNC_INTERVAL", "10"))
+
+# Batch tools: upstream fan-out per batch call, and an optional bulk booking endpoint
+LEARNAI_BATCH_CONCURRENCY = int(os.environ.get("LEARNAI_BATCH_CONCURRENCY", "8"))
+LEARNAI_BATCH_MAX_ITEMS = int(os.environ.get("LEARNAI_BATCH_MAX_ITEMS", "100"))
+LEARNAI_BOOKINGS_BULK_PATH = os.environ.get("LEARNAI_BOOKINGS_BULK_PATH", "")
+
+# Local semantic index for semantic_search_professors ("hashing" or "package.module:factory")
+LEARNAI_EMBEDDER = os.environ.get("LEARNAI_EMBEDDER", "hashing")
+LEARNAI_SEMANTIC_INDEX_PATH = os.environ.get("LEARNAI_SEMANTIC_INDEX_PATH", "")
+LEARNAI_SEMANTIC_NPROBE = int(os.environ.get("LEARNAI_SEMANTIC_NPROBE", "8"))
+
+# Near-duplicate cache for recommend_professors (reuses results for rephrased queries)
+LEARNAI_RECOMMEND_CACHE_TTL = float(os.environ.get("LEARNAI_RECOMMEND_CACHE_TTL", "600"))
+LEARNAI_RECOMMEND_CACHE_THRESHOLD = float(
+    os.environ.get("LEARNAI_RECOMMEND_CACHE_THRESHOLD", "0.6")
+)
+LEARNAI_RECOMMEND_CACHE_MAX_ENTRIES = int(
+    os.environ.get("LEARNAI_RECOMMEND_CACHE_MAX_ENTRIES", "1024")
+)
+
+# Professor view returned when a tool call does not pick one, and the bio
+# summary length (characters) used by the "card" view
+LEARNAI_DEFAULT_VIEW = os.environ.get("LEARNAI_DEFAULT_VIEW", "full")
+LEARNAI_SUMMARY_CHARS = int(os.environ.get("LEARNAI_SUMMARY_CHARS", "160"))
+
 # ---------------------------------------------------------------------------
 # Pydantic models for tool responses
 # ---------------------------------------------------------------------------
@@ -62,18 +179,46 @@ class ProfessorInfo(BaseModel):
     image: str | None = None
 
 
+class ProfessorCard(BaseModel):
+    """Professor summary ("card" view): no image, bio shortened to ``summary``."""
+
+    id: str
+    name: str | None = None
+    title: str | None = None
+    subjects: list[str] = Field(default_factory=list)
+    languages: list[str] = Field(default_factory=list)
+    rating: float = 0.0
+    hourly_rate: str = "0"
+    summary: str = ""
+
+
+class ProfessorCompact(BaseModel):
+    """Minimal professor entry ("compact" view): enough to compare and book."""
+
+    id: str
+    name: str | None = None
+    rating: float = 0.0
+    hourly_rate: str = "0"
+
+
+View = Literal["compact", "card", "full"]
+ProfessorView = ProfessorInfo | ProfessorCard | ProfessorCompact
+_DEFAULT_VIEW: View = TypeAdapter(View).validate_python(LEARNAI_DEFAULT_VIEW)
+
+
 class SearchResult(BaseModel):
     """Result of a professor search."""
 
-    professors: list[ProfessorInfo] = Field(default_factory=list)
+    professors: Sequence[ProfessorView] = Field(default_factory=list)
     total: int = 0
     query: str = ""
+    next_cursor: str | None = None
 
 
 class RecommendationResult(BaseModel):
     """Result of an AI-powered recommendation."""
 
-    professors: list[ProfessorInfo] = Field(default_factory=list)
+    professors: Sequence[ProfessorView] = Field(default_factory=list)
     explanation: str = ""
     query: str = ""
 
@@ -97,48 +242,682 @@ class BookingStatus(BaseModel):
     teacher_name: str = ""
 
 
+class SearchSpec(BaseModel):
+    """One search inside a search_professors_batch call."""
+
+    subject: str = ""
+    language: str = ""
+    min_rating: float = 0.0
+    max_hourly_rate: float = 500.0
+    limit: int = 10
+
+
+class BatchError(BaseModel):
+    """Failure of a single item in a batch call."""
+
+    index: int
+    error: str
+
+
+class SearchBatchResult(BaseModel):
+    """Results of a batch of searches, in request order."""
+
+    results: list[SearchResult] = Field(default_factory=list)
+    errors: list[BatchError] = Field(default_factory=list)
+
+
+class BookingStatusBatch(BaseModel):
+    """Statuses of a batch of bookings, in request order."""
+
+    statuses: list[BookingStatus] = Field(default_factory=list)
+    errors: list[BatchError] = Field(default_factory=list)
+
+
 class SubjectList(BaseModel):
     """Available subjects for tutoring."""
 
     subjects: list[str] = Field(default_factory=list)
 
 
+# Upstream professor lists are validated in one call instead of per item.
+_professors: JsonCodec[list[ProfessorInfo]] = JsonCodec(list[ProfessorInfo])
+
+
 # ---------------------------------------------------------------------------
 # HTTP client for LearnAI API
 # ---------------------------------------------------------------------------
 
-_client: httpx.AsyncClient | None = None
-_semaphore = asyncio.Semaphore(10)
+_api = ApiClient(
+    LEARNAI_API_URL,
+    headers={
+        "Content-Type": "application/json",
+        **({"Authorization": f"Bearer {LEARNAI_API_KEY}"} if LEARNAI_API_KEY else {}),
+    },
+)
+_pools = {**parse_pools(_DEFAULT_POOLS), **parse_pools(LEARNAI_POOLS)}
+_bulkheads = {
+    name: Bulkhead(name, size, max_queue=LEARNAI_QUEUE_MAX_DEPTH)
+    for name, (size, _) in _pools.items()
+}
+_limiter = AdaptiveLimiter(
+    initial_limit=LEARNAI_CONCURRENCY_INITIAL,
+    min_limit=LEARNAI_CONCURRENCY_MIN,
+    max_limit=LEARNAI_CONCURRENCY_MAX,
+    tolerance=LEARNAI_CONCURRENCY_TOLERANCE,
+    weights={name: weight for name, (_, weight) in _pools.items()},
+    max_queue=LEARNAI_QUEUE_MAX_DEPTH,
+)
+_inflight: SingleFlight[dict[str, Any]] = SingleFlight()
+_resilience = Resilience(
+    failure_threshold=LEARNAI_CIRCUIT_FAILURES,
+    reset_timeout=LEARNAI_CIRCUIT_RESET,
+    retry=RetryPolicy(
+        attempts=LEARNAI_RETRY_ATTEMPTS, base=LEARNAI_RETRY_BASE, cap=LEARNAI_RETRY_CAP
+    ),
+    hedge=LEARNAI_HEDGE_GETS,
+)
 
 
 async def _get_client() -> httpx.AsyncClient:
-    """Get or create the shared HTTP client."""
-    global _client
-    if _client is None or _client.is_closed:
-        headers: dict[str, str] = {"Content-Type": "application/json"}
-        if LEARNAI_API_KEY:
-            headers["Authorization"] = f"Bearer {LEARNAI_API_KEY}"
-        _client = httpx.AsyncClient(
-            base_url=LEARNAI_API_URL,
-            headers=headers,
-            timeout=30.0,
+    """Get the shared, pooled HTTP client (see learnai_mcp.client)."""
+    return await _api.get()
+
+
+async def _send_response(
+    method: str, path: str, *, pool: str = "catalog", **kwargs: Any
+) -> httpx.Response:
+    """Send a single authenticated request to the LearnAI API and return its response.
+
+    The call first takes a slot in its pool's bulkhead, then in the shared
+    adaptive limiter, where queued pools are admitted by weight. Both waits
+    together are bounded by LEARNAI_QUEUE_MAX_WAIT; past it, or when a queue
+    is full, the call fails fast with ``Overloaded``. Error statuses raise;
+    ``304 Not Modified`` is returned for conditional requests.
+    """
+    queue_deadline = time.monotonic() + LEARNAI_QUEUE_MAX_WAIT
+    async with (
+        _bulkheads[pool].acquire(max_wait=LEARNAI_QUEUE_MAX_WAIT),
+        _limiter.acquire(
+            lane=pool,
+            max_wait=queue_deadline - time.monotonic(),
+            key=endpoint_key(method, path),
+        ),
+    ):
+        client = await _get_client()
+        response = await client.request(method, path, **kwargs)
+        if response.status_code != httpx.codes.NOT_MODIFIED:
+            response.raise_for_status()
+        return response
+
+
+async def _send_request(
+    method: str, path: str, *, pool: str = "catalog", **kwargs: Any
+) -> dict[str, Any]:
+    """Send a single authenticated request and decode its JSON body."""
+    response = await _send_response(method, path, pool=pool, **kwargs)
+    return loads(response.content)
+
+
+T = TypeVar("T")
+
+
+async def _resilient(
+    method: str, path: str, pool: str, send: Callable[[], Awaitable[T]], hedge: bool = True
+) -> T:
+    """Run ``send`` through the endpoint's circuit breaker.
+
+    GETs are idempotent, so they are also retried with jittered backoff and,
+    with LEARNAI_HEDGE_GETS and ``hedge``, hedged after the endpoint's p95
+    latency (only while nothing is queuing for upstream slots, so hedges
+    never add to a backlog). With several API replicas, retries and hedges
+    go to replicas this call has not tried yet.
+    """
+    with tried_replicas():
+        return await _resilience.call(
+            endpoint_key(method, path),
+            send,
+            idempotent=method.upper() == "GET",
+            can_hedge=lambda: hedge and not (_limiter.queued or _bulkheads[pool].queued),
+        )
+
+
+async def _call_upstream(
+    method: str, path: str, pool: str, kwargs: dict[str, Any]
+) -> dict[str, Any]:
+    """Send a request through its endpoint's circuit breaker (see ``_resilient``)."""
+    return await _resilient(
+        method, path, pool, lambda: _send_request(method, path, pool=pool, **kwargs)
+    )
+
+
+def _request_key(method: str, path: str, kwargs: dict[str, Any]) -> tuple[Any, ...] | None:
+    """Canonicalize a request into a coalescing key, or None if it cannot be keyed."""
+    try:
+        return (
+            method.upper(),
+            path,
+            orjson.dumps(kwargs.get("params"), option=orjson.OPT_SORT_KEYS),
+            orjson.dumps(kwargs.get("json"), option=orjson.OPT_SORT_KEYS),
         )
-    return _client
+    except TypeError:
+        return None
+
+
+async def _api_request(
+    method: str,
+    path: str,
+    *,
+    coalesce: bool | None = None,
+    pool: str = "catalog",
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Make an authenticated request to the LearnAI API.
+
+    Identical concurrent requests share a single upstream call. GETs are
+    coalesced by default; other methods only when ``coalesce=True`` (use it
+    for idempotent POSTs such as recommendations, never for writes).
+
+    ``pool`` selects the bulkhead (see LEARNAI_POOLS) the call is charged to.
+    Calls to an endpoint whose circuit is open fail fast with ``CircuitOpen``.
+
+    The call is cancelled, wherever it is (queued or in flight), when the
+    current request deadline passes, raising ``DeadlineExceeded``. A shared
+    coalesced call keeps running for as long as any caller still waits for it.
+    """
+    if coalesce is None:
+        coalesce = method.upper() == "GET"
+    key = None
+    if coalesce and kwargs.keys() <= {"params", "json"}:
+        key = _request_key(method, path, kwargs)
+    async with deadline.enforce():
+        if key is None:
+            return await _call_upstream(method, path, pool, kwargs)
+        return await _inflight.do(key, lambda: _call_upstream(method, path, pool, kwargs))
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+_response_cache: ResponseCache[Any] = ResponseCache(
+    ttl=LEARNAI_CACHE_TTL,
+    stale_ttl=LEARNAI_CACHE_STALE_TTL,
+    max_entries=LEARNAI_CACHE_MAX_ENTRIES,
+    max_bytes=LEARNAI_CACHE_MAX_BYTES,
+)
+
+
+def _cache_key(tool: str, params: dict[str, Any]) -> tuple[Any, ...]:
+    """Build a cache key from a tool name and its normalized upstream params."""
+    return (tool, *sorted(params.items()))
+
+
+def _serve_stale(exc: Exception) -> bool:
+    """Whether a failed reload should fall back to a cached result of any age."""
+    return isinstance(exc, CircuitOpen | deadline.DeadlineExceeded) or is_upstream_overload(exc)
+
+
+_recommendation_cache: NearDuplicateCache[RecommendationResult] = NearDuplicateCache(
+    threshold=LEARNAI_RECOMMEND_CACHE_THRESHOLD,
+    ttl=LEARNAI_RECOMMEND_CACHE_TTL,
+    max_entries=LEARNAI_RECOMMEND_CACHE_MAX_ENTRIES,
+)
+
+
+# ---------------------------------------------------------------------------
+# Result views
+# ---------------------------------------------------------------------------
+
+Projected = TypeVar("Projected", SearchResult, RecommendationResult)
 
 
-async def _api_request(method: str, path: str, **kwargs: Any) -> dict[str, Any]:
-    """Make an authenticated request to the LearnAI API."""
-    client = await _get_client()
-    response = await client.request(method, path, **kwargs)
-    response.raise_for_status()
-    return response.json()
+def _summarize(bio: str | None, limit: int = LEARNAI_SUMMARY_CHARS) -> str:
+    """Shorten a bio to at most ``limit`` characters, cutting at a word boundary."""
+    if not bio:
+        return ""
+    bio = " ".join(bio.split())
+    if len(bio) <= limit:
+        return bio
+    cut = bio[: max(limit - 1, 0)]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:.") + "\u2026"
+
+
+def _project(result: Projected, view: View) -> Projected:
+    """Reduce a result's professors to ``view`` before it is serialized.
+
+    Results are cached in full, so one cache entry serves every view; only the
+    fields of the requested view are built for the response.
+    """
+    if view == "full":
+        return result
+    full = [p for p in result.professors if isinstance(p, ProfessorInfo)]
+    professors: list[ProfessorView]
+    if view == "compact":
+        professors = [
+            ProfessorCompact(id=p.id, name=p.name, rating=p.rating, hourly_rate=p.hourly_rate)
+            for p in full
+        ]
+    else:
+        professors = [
+            ProfessorCard(
+                id=p.id,
+                name=p.name,
+                title=p.title,
+                subjects=p.subjects,
+                languages=p.languages,
+                rating=p.rating,
+                hourly_rate=p.hourly_rate,
+                summary=_summarize(p.bio),
+            )
+            for p in full
+        ]
+    return result.model_copy(update={"professors": professors})
+
+
+# ---------------------------------------------------------------------------
+# Pagination
+# ---------------------------------------------------------------------------
+
+
+def _professor_key(professor: ProfessorInfo) -> Key:
+    return (professor.rating, professor.id)
+
+
+async def _fetch_professors(
+    filters: dict[str, Any], after: Key | None, limit: int
+) -> list[ProfessorInfo]:
+    """Fetch one page of professors matching ``filters`` from the upstream.
+
+    The page after ``after`` is requested with ``after_rating``/``after_id``
+    keyset parameters. Raises ``KeysetIgnored`` when the rows returned do not
+    continue after it, e.g. because the upstream ignores those parameters.
+    """
+    params = {**filters, "limit": limit}
+    if after is not None:
+        params["after_rating"], params["after_id"] = after
+    data = await _api_request("GET", "/api/explore", params=params)
+    professors = _professors.validate(data.get("teachers", []))
+    if after is not None and not in_keyset_order([_professor_key(p) for p in professors], after):
+        raise KeysetIgnored("Upstream page does not continue after the cursor")
+    return professors
+
+
+def _next_cursor(professors: list[ProfessorInfo], limit: int, scope: str) -> str | None:
+    """Cursor for the page after a full page.
+
+    None once a page comes back short, or when its rows are not in keyset
+    order, since no cursor would then continue it correctly.
+    """
+    if not professors or len(professors) < limit:
+        return None
+    if not in_keyset_order([_professor_key(p) for p in professors]):
+        return None
+    return encode_cursor(_professor_key(professors[-1]), scope)
+
+
+# ---------------------------------------------------------------------------
+# Batch fan-out
+# ---------------------------------------------------------------------------
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+
+async def _fan_out(keys: list[K], fn: Callable[[K], Awaitable[R]]) -> dict[K, R | BaseException]:
+    """Run ``fn`` once per distinct key with at most LEARNAI_BATCH_CONCURRENCY in flight.
+
+    Returns a mapping from key to its result or the exception it raised.
+    """
+    unique = list(dict.fromkeys(keys))
+    limiter = asyncio.Semaphore(LEARNAI_BATCH_CONCURRENCY)
+
+    async def run(key: K) -> R:
+        async with limiter:
+            return await fn(key)
+
+    results = await asyncio.gather(*(run(key) for key in unique), return_exceptions=True)
+    return dict(zip(unique, results, strict=True))
+
+
+# ---------------------------------------------------------------------------
+# Local catalog
+# ---------------------------------------------------------------------------
+
+_catalog = ProfessorCatalog()
+_keyword_index = KeywordIndex()
+_semantic_index = SemanticIndex(load_embedder(LEARNAI_EMBEDDER), n_probe=LEARNAI_SEMANTIC_NPROBE)
+# Embedding the whole catalog is comparatively expensive, so full reloads only
+# mark the semantic index stale; it is rebuilt on the next semantic query.
+_semantic_stale = True
+_catalog_generation = 0
+_catalog_loaded_at: float | None = None
+_catalog_flight: SingleFlight[None] = SingleFlight()
+_catalog_refresh: asyncio.Task[None] | None = None
+_known_subjects: list[str] = []
+
+
+_ROW_ALIASES = {"hourlyRate": "hourly_rate"}
+
+
+def _row_fields(row: dict[str, Any]) -> dict[str, Any]:
+    """Map an upstream catalog row onto ProfessorInfo field names."""
+    fields = {_ROW_ALIASES.get(k, k): v for k, v in row.items() if k != "isActive"}
+    if "hourly_rate" in fields:
+        fields["hourly_rate"] = str(fields["hourly_rate"])
+    return fields
+
+
+def _professor_from_row(row: dict[str, Any], existing: ProfessorInfo | None) -> ProfessorInfo:
+    """Build a ProfessorInfo from a (possibly partial) upstream catalog row."""
+    fields = _row_fields(row)
+    if existing is not None:
+        fields = {**existing.model_dump(), **fields}
+    return ProfessorInfo(**fields)
+
+
+async def _apply_catalog_rows(rows: list[dict[str, Any]], full: bool) -> None:
+    """Apply a full catalog or a delta of changed rows to the local catalog and indexes."""
+    global _semantic_stale, _catalog_generation
+    _catalog_generation += 1
+    if full:
+        _catalog.load(
+            _professors.validate([_row_fields(row) for row in rows if row.get("isActive", True)])
+        )
+        _keyword_index.rebuild(_catalog.professors)
+        _semantic_stale = True
+    else:
+        removed = [row["id"] for row in rows if not row.get("isActive", True)]
+        changed = [
+            _professor_from_row(row, _catalog.get(row["id"]))
+            for row in rows
+            if row.get("isActive", True)
+        ]
+        _catalog.remove(removed)
+        _catalog.upsert(changed)
+        _keyword_index.remove(removed)
+        _keyword_index.upsert(changed)
+        if not _semantic_stale:
+            _semantic_index.remove(removed)
+            _semantic_index.upsert(changed)
+            _semantic_stale = _semantic_index.needs_rebuild
+    if rows or full:
+        await _persist_snapshot(force=full)
+
+
+def _mark_catalog_fresh() -> None:
+    global _catalog_loaded_at
+    _catalog_loaded_at = time.monotonic()
+
+
+async def _get_catalog_page(
+    path: str, *, params: dict[str, Any], headers: dict[str, str]
+) -> httpx.Response:
+    """GET for catalog sync rounds, through the catalog bulkhead, limiter and breaker.
+
+    The raw response is returned, so 304s and validators reach the sync. An
+    open circuit fails the round fast with ``CircuitOpen``. Full downloads
+    are never hedged, since a hedge would fetch the whole catalog twice.
+    """
+    return await _resilient(
+        "GET",
+        path,
+        "catalog",
+        lambda: _send_response("GET", path, pool="catalog", params=params, headers=headers),
+        hedge=False,
+    )
+
+
+_catalog_sync = CatalogSync(
+    _get_catalog_page,
+    _apply_catalog_rows,
+    path="/api/explore",
+    params={"limit": LEARNAI_CATALOG_MAX_ROWS},
+    interval=LEARNAI_CATALOG_SYNC_INTERVAL,
+    on_success=_mark_catalog_fresh,
+)
+
+
+async def _load_catalog() -> None:
+    """Bring the local catalog up to date (full download or delta)."""
+    await _catalog_sync.sync_once()
+
+
+async def _refresh_catalog() -> None:
+    try:
+        await _catalog_flight.do("catalog", _load_catalog)
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Catalog refresh failed: %s", e)
+
+
+def _catalog_is_stale() -> bool:
+    return (
+        _catalog_loaded_at is None
+        or time.monotonic() - _catalog_loaded_at > LEARNAI_CATALOG_REFRESH
+    )
+
+
+def _schedule_catalog_refresh() -> None:
+    global _catalog_refresh
+    if _catalog_refresh is None or _catalog_refresh.done():
+        _catalog_refresh = asyncio.get_running_loop().create_task(_refresh_catalog())
+
+
+async def _ensure_catalog() -> ProfessorCatalog:
+    """Return the local catalog, loading it first if nothing has been loaded yet.
+
+    The first call loads the catalog unless a snapshot was restored; afterwards
+    a stale catalog keeps serving while it is reloaded in the background.
+    The first load is bounded by the current request deadline and raises
+    ``DeadlineExceeded`` past it, so the tool can fall back; the periodic
+    sync keeps loading the catalog.
+    """
+    if _catalog_loaded_at is None:
+        async with deadline.enforce():
+            await _catalog_flight.do("catalog", _load_catalog)
+    elif _catalog_is_stale():
+        _schedule_catalog_refresh()
+    return _catalog
+
+
+async def _get_catalog() -> ProfessorCatalog | None:
+    """Return the local catalog for search_professors, or None when it is disabled."""
+    if not LEARNAI_LOCAL_CATALOG:
+        return None
+    return await _ensure_catalog()
+
+
+async def _rebuild_semantic_index() -> None:
+    """Re-embed the catalog off the event loop and persist the new index."""
+    global _semantic_stale
+    generation = _catalog_generation
+    professors = _catalog.professors
+
+    def build() -> None:
+        _semantic_index.rebuild(professors)
+        if LEARNAI_SEMANTIC_INDEX_PATH:
+            try:
+                _semantic_index.save(LEARNAI_SEMANTIC_INDEX_PATH)
+            except OSError as e:
+                logger.warning(
+                    "Could not write semantic index %s: %s", LEARNAI_SEMANTIC_INDEX_PATH, e
+                )
+
+    await asyncio.to_thread(build)
+    # Rows applied while embedding are not in the new index; rebuild again next time.
+    _semantic_stale = generation != _catalog_generation
+
+
+async def _ensure_semantic_index() -> ProfessorCatalog:
+    """Return the local catalog with the semantic index built over it."""
+    catalog = await _ensure_catalog()
+    if _semantic_stale:
+        await _catalog_flight.do("semantic", _rebuild_semantic_index)
+    return catalog
+
+
+async def _semantic_batch(batch: list[tuple[str, int]]) -> list[list[tuple[str, float]]]:
+    """Answer concurrent semantic queries with a single embedding + index pass."""
+    limit = max(k for _, k in batch)
+    hits = _semantic_index.search([query for query, _ in batch], limit=limit)
+    return [h[:k] for h, (_, k) in zip(hits, batch, strict=True)]
+
+
+_semantic_batcher: MicroBatcher[tuple[str, int], list[tuple[str, float]]] = MicroBatcher(
+    _semantic_batch
+)
+
+
+# ---------------------------------------------------------------------------
+# Catalog snapshot
+# ---------------------------------------------------------------------------
+
+
+_snapshot_written_at: float | None = None
+
+
+async def _persist_snapshot(force: bool = True) -> None:
+    """Write the current catalog to LEARNAI_SNAPSHOT_PATH, if configured.
+
+    Unless forced, writes are throttled to one per LEARNAI_SNAPSHOT_INTERVAL.
+    """
+    global _snapshot_written_at
+    if not LEARNAI_SNAPSHOT_PATH:
+        return
+    now = time.monotonic()
+    if (
+        not force
+        and _snapshot_written_at is not None
+        and now - _snapshot_written_at < LEARNAI_SNAPSHOT_INTERVAL
+    ):
+        return
+    _snapshot_written_at = now
+    professors = _catalog.professors
+    subjects = _known_subjects or _catalog.subjects()
+
+    def write() -> None:
+        write_snapshot(
+            LEARNAI_SNAPSHOT_PATH, [p.model_dump(mode="json") for p in professors], subjects
+        )
+
+    try:
+        await asyncio.to_thread(write)
+    except OSError as e:
+        logger.warning("Could not write catalog snapshot %s: %s", LEARNAI_SNAPSHOT_PATH, e)
+
+
+def _restore_snapshot() -> bool:
+    """Load the catalog snapshot from disk so reads can be served before the first sync.
+
+    A semantic index saved at LEARNAI_SEMANTIC_INDEX_PATH is memory-mapped
+    alongside it instead of re-embedding the restored catalog.
+    """
+    global _catalog_loaded_at, _known_subjects, _semantic_stale
+    if not LEARNAI_SNAPSHOT_PATH:
+        return False
+    try:
+        snapshot = read_snapshot(LEARNAI_SNAPSHOT_PATH)
+    except (OSError, SnapshotError) as e:
+        logger.warning("Ignoring catalog snapshot %s: %s", LEARNAI_SNAPSHOT_PATH, e)
+        return False
+    if snapshot is None:
+        return False
+
+    # One batch validation is cheaper than per-item model_construct.
+    _catalog.load(_professors.validate(snapshot.professors))
+    _keyword_index.rebuild(_catalog.professors)
+    if LEARNAI_SEMANTIC_INDEX_PATH:
+        _semantic_stale = not _semantic_index.load(LEARNAI_SEMANTIC_INDEX_PATH)
+    _known_subjects = snapshot.subjects
+    # Age the catalog by the snapshot's age so it is refreshed when stale.
+    _catalog_loaded_at = time.monotonic() - snapshot.age_seconds
+    logger.info(
+        "Restored catalog snapshot: %d professors, %.0fs old",
+        len(_catalog),
+        snapshot.age_seconds,
+    )
+    return True
 
 
 # ---------------------------------------------------------------------------
 # MCP Server
 # ---------------------------------------------------------------------------
 
-mcp = FastMCP(name="learnai-mcp-server", version="1.0.0")
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    """Open the upstream connection pool and run background catalog sync."""
+    await _api.start()
+    if LEARNAI_LOCAL_CATALOG or LEARNAI_SNAPSHOT_PATH:
+        _catalog_sync.start()
+    try:
+        yield {}
+    finally:
+        await _catalog_sync.stop()
+        await _api.aclose()
+
+
+_tool_budgets = {
+    **deadline.parse_budgets(_DEFAULT_TOOL_BUDGETS),
+    **deadline.parse_budgets(LEARNAI_TOOL_BUDGETS),
+}
+
+
+class _DeadlineMiddleware(Middleware):
+    """Bound each tool call's upstream work by its budget and the caller's deadline.
+
+    The budget comes from LEARNAI_TOOL_BUDGETS / LEARNAI_TOOL_TIMEOUT and is
+    tightened by a caller-supplied ``_meta.timeoutMs``. Tools still get to
+    return their degraded result (local catalog, cached or empty) once
+    upstream calls are cut off.
+    """
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[Any],
+        call_next: CallNext[Any, ToolResult],
+    ) -> ToolResult:
+        ctx = context.fastmcp_context
+        request = ctx.request_context if ctx is not None else None
+        meta = request.meta if request is not None else None
+        extra = (meta.model_extra or {}) if meta is not None else {}
+        budget = deadline.tightest(
+            _tool_budgets.get(context.message.name, LEARNAI_TOOL_TIMEOUT),
+            deadline.parse_timeout_ms(extra.get("timeoutMs")),
+        )
+        with deadline.scope(budget):
+            return await call_next(context)
+
+
+class _LoadSheddingMiddleware(Middleware):
+    """Turn shed upstream calls (full queues, open circuits) into a retryable tool error."""
+
+    async def on_call_tool(
+        self,
+        context: MiddlewareContext[Any],
+        call_next: CallNext[Any, ToolResult],
+    ) -> ToolResult:
+        try:
+            return await call_next(context)
+        except Exception as e:
+            cause = e if isinstance(e, Overloaded) else e.__cause__
+            if not isinstance(cause, Overloaded):
+                raise
+            payload = {
+                "error": cause.code,
+                "message": str(cause),
+                "retry_after_ms": cause.retry_after_ms,
+            }
+            raise ToolError(orjson.dumps(payload).decode()) from cause
+
+
+mcp = FastMCP(
+    name="learnai-mcp-server",
+    version="1.0.0",
+    lifespan=_lifespan,
+    middleware=[_DeadlineMiddleware(), _LoadSheddingMiddleware()],
+)
 
 
 @mcp.tool(
@@ -153,38 +932,197 @@ async def search_professors(
     min_rating: float = 0.0,
     max_hourly_rate: float = 500.0,
     limit: int = 10,
+    view: View = _DEFAULT_VIEW,
+    cursor: str = "",
 ) -> SearchResult:
     """Search the LearnAI database for professors matching specific criteria.
 
+    Results are ordered by rating (highest first). When more results exist,
+    ``next_cursor`` is set; pass it back as ``cursor`` with the same filters
+    to get the next page.
+
     Args:
         subject: Subject area to search for (e.g., "mathematics", "python", "physics").
         language: Preferred teaching language (e.g., "English", "Spanish").
         min_rating: Minimum professor rating (0.0 to 5.0).
         max_hourly_rate: Maximum hourly rate in USD.
+        limit: Maximum number of results per page (1 to 50).
+        view: Fields per professor: "compact" (id, name, rating, rate), "card"
+              (adds title, subjects, languages and a short bio summary) or
+              "full" (everything, including the full bio and image).
+        cursor: ``next_cursor`` from the previous page; empty for the first page.
+    """
+    try:
+        result = await _search_professors(
+            subject, language, min_rating, max_hourly_rate, limit, cursor
+        )
+        return _project(result, view)
+    except InvalidCursor as e:
+        raise ToolError(f"Invalid cursor: {e}") from e
+    except Overloaded:
+        raise
+    except Exception as e:
+        logger.error("search_professors failed: %s", e)
+        return SearchResult(query=subject.strip() or language.strip() or "all")
+
+
+async def _search_professors(
+    subject: str,
+    language: str,
+    min_rating: float,
+    max_hourly_rate: float,
+    limit: int,
+    cursor: str = "",
+) -> SearchResult:
+    """Run one professor search page; raises when neither upstream nor catalog can answer."""
+    limit = min(limit, 50)
+    filters: dict[str, Any] = {}
+    subject = subject.strip()
+    language = language.strip()
+    if subject:
+        filters["subject"] = subject
+    if language:
+        filters["language"] = language
+    if min_rating > 0:
+        filters["min_rating"] = min_rating
+    if max_hourly_rate < 500:
+        filters["max_hourly_rate"] = max_hourly_rate
+    query = subject or language or "all"
+    scope = cursor_scope(filters)
+    after = decode_cursor(cursor, scope) if cursor else None
+
+    def page(professors: list[ProfessorInfo]) -> SearchResult:
+        return SearchResult(
+            professors=professors,
+            total=len(professors),
+            query=query,
+            next_cursor=_next_cursor(professors, limit, scope),
+        )
+
+    def local_search() -> SearchResult:
+        professors = _catalog.query(
+            subject=subject,
+            language=language,
+            min_rating=min_rating,
+            max_hourly_rate=filters.get("max_hourly_rate"),
+            limit=limit,
+            after=after,
+        )
+        return page(professors)
+
+    try:
+        catalog = await _get_catalog()
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Local catalog unavailable, querying upstream: %s", e)
+        catalog = None
+
+    if catalog is not None:
+        return local_search()
+    if LEARNAI_SNAPSHOT_PATH and _catalog_is_stale():
+        _schedule_catalog_refresh()
+
+    async def load() -> SearchResult:
+        return page(await _fetch_professors(filters, after, limit))
+
+    key = _cache_key("search_professors", {**filters, "limit": limit, "after": after})
+    try:
+        result: SearchResult = await _response_cache.get_or_load(
+            key, load, stale_if_error=_serve_stale
+        )
+        return result
+    except Exception as e:
+        if not len(_catalog):
+            raise
+        # Upstream outage: serve from the last-known-good catalog.
+        logger.warning("Upstream search failed, serving local catalog: %s", e)
+        return local_search()
+
+
+@mcp.tool(
+    description=(
+        "Fast keyword search over professor titles, subjects and bios, ranked by relevance "
+        "(BM25). Use it for free-text needs such as 'linear algebra for machine learning'; "
+        "escalate to recommend_professors only when no good match comes back."
+    )
+)
+async def keyword_search_professors(
+    query: str,
+    language: str = "",
+    min_rating: float = 0.0,
+    limit: int = 10,
+    view: View = _DEFAULT_VIEW,
+) -> SearchResult:
+    """Search professors by free-text keywords using the local inverted index.
+
+    Args:
+        query: Free-text description of what the student needs.
+        language: Required teaching language (e.g., "Spanish"); empty for any.
+        min_rating: Minimum professor rating (0.0 to 5.0).
         limit: Maximum number of results to return (1 to 50).
+        view: Fields per professor: "compact" (id, name, rating, rate), "card"
+              (adds title, subjects, languages and a short bio summary) or
+              "full" (everything, including the full bio and image).
     """
-    async with _semaphore:
-        try:
-            params: dict[str, Any] = {"limit": min(limit, 50)}
-            if subject:
-                params["subject"] = subject
-            if language:
-                params["language"] = language
-            if min_rating > 0:
-                params["min_rating"] = min_rating
-            if max_hourly_rate < 500:
-                params["max_hourly_rate"] = max_hourly_rate
-
-            data = await _api_request("GET", "/api/explore", params=params)
-            professors = [ProfessorInfo(**p) for p in data.get("teachers", [])]
-            return SearchResult(
-                professors=professors,
-                total=len(professors),
-                query=subject or language or "all",
-            )
-        except Exception as e:
-            logger.error("search_professors failed: %s", e)
-            return SearchResult(query=subject or language or "all")
+    try:
+        catalog = await _ensure_catalog()
+    except Exception as e:  # noqa: BLE001
+        logger.error("keyword_search_professors failed: %s", e)
+        return SearchResult(query=query)
+
+    hits = _keyword_index.search(
+        query, language=language, min_rating=min_rating, limit=min(limit, 50)
+    )
+    professors = [p for p in (catalog.get(doc_id) for doc_id, _ in hits) if p is not None]
+    return _project(SearchResult(professors=professors, total=len(professors), query=query), view)
+
+
+@mcp.tool(
+    description=(
+        "Semantic search over professor titles, subjects and bios using local embeddings. "
+        "Tolerates paraphrases and partial words (e.g. 'help with calc homework'); much "
+        "faster than recommend_professors, which should be kept for explained matches."
+    )
+)
+async def semantic_search_professors(
+    query: str,
+    language: str = "",
+    min_rating: float = 0.0,
+    limit: int = 10,
+    view: View = _DEFAULT_VIEW,
+) -> SearchResult:
+    """Find professors whose profile is semantically closest to a learning goal.
+
+    Args:
+        query: Free-text description of what the student needs.
+        language: Required teaching language (e.g., "Spanish"); empty for any.
+        min_rating: Minimum professor rating (0.0 to 5.0).
+        limit: Maximum number of results to return (1 to 50).
+        view: Fields per professor: "compact" (id, name, rating, rate), "card"
+              (adds title, subjects, languages and a short bio summary) or
+              "full" (everything, including the full bio and image).
+    """
+    try:
+        catalog = await _ensure_semantic_index()
+    except Exception as e:  # noqa: BLE001
+        logger.error("semantic_search_professors failed: %s", e)
+        return SearchResult(query=query)
+
+    limit = min(limit, 50)
+    language = language.strip().lower()
+    # Over-fetch when filtering so filtered-out neighbours do not starve the result.
+    fetch = limit * 4 if language or min_rating > 0 else limit
+    hits = await _semantic_batcher.submit((query, fetch))
+    professors = []
+    for doc_id, _ in hits:
+        professor = catalog.get(doc_id)
+        if professor is None or professor.rating < min_rating:
+            continue
+        if language and language not in (lang.lower() for lang in professor.languages):
+            continue
+        professors.append(professor)
+        if len(professors) == limit:
+            break
+    return _project(SearchResult(professors=professors, total=len(professors), query=query), view)
 
 
 @mcp.tool(
@@ -197,6 +1135,7 @@ async def search_professors(
 async def recommend_professors(
     query: str,
     limit: int = 5,
+    view: View = _DEFAULT_VIEW,
 ) -> RecommendationResult:
     """Get AI-powered professor recommendations for a learning goal.
 
@@ -204,26 +1143,39 @@ async def recommend_professors(
         query: Description of the student's learning needs
                (e.g., "I need help with calculus for my university exam").
         limit: Maximum number of recommendations (1 to 10).
+        view: Fields per professor: "compact" (id, name, rating, rate), "card"
+              (adds title, subjects, languages and a short bio summary) or
+              "full" (everything, including the full bio and image).
     """
-    async with _semaphore:
-        try:
-            data = await _api_request(
-                "POST",
-                "/api/ai/recommend-professors",
-                json={"query": query, "limit": min(limit, 10)},
-            )
-            professors = [ProfessorInfo(**t) for t in data.get("teachers", [])]
-            return RecommendationResult(
-                professors=professors,
-                explanation=data.get("explanation", ""),
-                query=query,
-            )
-        except Exception as e:
-            logger.error("recommend_professors failed: %s", e)
-            return RecommendationResult(
-                explanation=f"Recommendation service unavailable: {e}",
-                query=query,
-            )
+    limit = min(limit, 10)
+    cached = _recommendation_cache.lookup(query, scope=limit)
+    if cached is not None:
+        return _project(cached[0].model_copy(update={"query": query}), view)
+
+    try:
+        data = await _api_request(
+            "POST",
+            "/api/ai/recommend-professors",
+            json={"query": query, "limit": limit},
+            coalesce=True,
+            pool="recommend",
+        )
+        professors = _professors.validate(data.get("teachers", []))
+        result = RecommendationResult(
+            professors=professors,
+            explanation=data.get("explanation", ""),
+            query=query,
+        )
+        _recommendation_cache.put(query, result, scope=limit)
+        return _project(result, view)
+    except Overloaded:
+        raise
+    except Exception as e:
+        logger.error("recommend_professors failed: %s", e)
+        return RecommendationResult(
+            explanation=f"Recommendation service unavailable: {e}",
+            query=query,
+        )
 
 
 @mcp.tool(
@@ -250,39 +1202,39 @@ async def create_booking(
         price_total: Total price in USD.
         topic: Specific topic within the subject (optional).
     """
-    async with _semaphore:
-        try:
-            data = await _api_request(
-                "POST",
-                "/api/bookings",
-                json={
-                    "teacherId": teacher_id,
-                    "subject": subject,
-                    "topic": topic,
-                    "scheduledFor": scheduled_for,
-                    "durationMinutes": duration_minutes,
-                    "priceTotal": price_total,
-                },
-            )
-            return BookingResult(
-                booking_id=data.get("bookingId", ""),
-                status="pending",
-                message="Booking created successfully",
-            )
-        except httpx.HTTPStatusError as e:
-            error_body = e.response.json() if e.response.content else {}
-            return BookingResult(
-                status="error",
-                message=error_body.get("error", str(e)),
-            )
-        except Exception as e:
-            logger.error("create_booking failed: %s", e)
-            return BookingResult(status="error", message=str(e))
+    try:
+        data = await _api_request(
+            "POST",
+            "/api/bookings",
+            json={
+                "teacherId": teacher_id,
+                "subject": subject,
+                "topic": topic,
+                "scheduledFor": scheduled_for,
+                "durationMinutes": duration_minutes,
+                "priceTotal": price_total,
+            },
+            pool="booking",
+        )
+        return BookingResult(
+            booking_id=data.get("bookingId", ""),
+            status="pending",
+            message="Booking created successfully",
+        )
+    except Overloaded:
+        raise
+    except httpx.HTTPStatusError as e:
+        error_body = e.response.json() if e.response.content else {}
+        return BookingResult(
+            status="error",
+            message=error_body.get("error", str(e)),
+        )
+    except Exception as e:
+        logger.error("create_booking failed: %s", e)
+        return BookingResult(status="error", message=str(e))
 
 
-@mcp.tool(
-    description="Check the current status of a tutoring session booking by its ID."
-)
+@mcp.tool(description="Check the current status of a tutoring session booking by its ID.")
 async def get_booking_status(
     booking_id: str,
 ) -> BookingStatus:
@@ -291,20 +1243,135 @@ async def get_booking_status(
     Args:
         booking_id: The booking ID returned from create_booking.
     """
-    async with _semaphore:
+    try:
+        data = await _api_request("GET", f"/api/bookings/{booking_id}", pool="booking")
+        return _booking_status(booking_id, data)
+    except Overloaded:
+        raise
+    except Exception as e:
+        logger.error("get_booking_status failed: %s", e)
+        return BookingStatus(booking_id=booking_id, status="error")
+
+
+def _booking_status(booking_id: str, data: dict[str, Any]) -> BookingStatus:
+    return BookingStatus(
+        booking_id=booking_id,
+        status=data.get("status", "unknown"),
+        subject=data.get("subject", ""),
+        scheduled_for=data.get("scheduledFor", ""),
+        duration_minutes=data.get("durationMinutes", 0),
+        teacher_name=data.get("teacher", {}).get("name", ""),
+    )
+
+
+async def _bulk_booking_statuses(booking_ids: list[str]) -> dict[str, BookingStatus | Exception]:
+    """Fetch many bookings with one call to LEARNAI_BOOKINGS_BULK_PATH."""
+    data = await _api_request(
+        "POST", LEARNAI_BOOKINGS_BULK_PATH, json={"ids": booking_ids}, pool="booking"
+    )
+    found = {b.get("id", ""): b for b in data.get("bookings", [])}
+    return {
+        booking_id: (
+            _booking_status(booking_id, found[booking_id])
+            if booking_id in found
+            else LookupError(f"Booking {booking_id} not found")
+        )
+        for booking_id in booking_ids
+    }
+
+
+@mcp.tool(
+    description=(
+        "Check the status of many bookings in one call. Prefer this over repeated "
+        "get_booking_status calls; results come back in request order with per-item errors."
+    )
+)
+async def get_booking_statuses(
+    booking_ids: list[str],
+) -> BookingStatusBatch:
+    """Get the current status of several bookings at once.
+
+    Args:
+        booking_ids: Booking IDs returned from create_booking (duplicates are fetched once).
+    """
+    if len(booking_ids) > LEARNAI_BATCH_MAX_ITEMS:
+        return BookingStatusBatch(
+            errors=[
+                BatchError(index=-1, error=f"At most {LEARNAI_BATCH_MAX_ITEMS} bookings per call")
+            ]
+        )
+
+    async def fetch(booking_id: str) -> BookingStatus:
+        data = await _api_request("GET", f"/api/bookings/{booking_id}", pool="booking")
+        return _booking_status(booking_id, data)
+
+    results: dict[str, BookingStatus | BaseException] = {}
+    if LEARNAI_BOOKINGS_BULK_PATH and booking_ids:
         try:
-            data = await _api_request("GET", f"/api/bookings/{booking_id}")
-            return BookingStatus(
-                booking_id=booking_id,
-                status=data.get("status", "unknown"),
-                subject=data.get("subject", ""),
-                scheduled_for=data.get("scheduledFor", ""),
-                duration_minutes=data.get("durationMinutes", 0),
-                teacher_name=data.get("teacher", {}).get("name", ""),
-            )
-        except Exception as e:
-            logger.error("get_booking_status failed: %s", e)
-            return BookingStatus(booking_id=booking_id, status="error")
+            results.update(await _bulk_booking_statuses(list(dict.fromkeys(booking_ids))))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Bulk booking lookup failed, fetching individually: %s", e)
+    if not results:
+        results = await _fan_out(booking_ids, fetch)
+
+    batch = BookingStatusBatch()
+    for index, booking_id in enumerate(booking_ids):
+        result = results[booking_id]
+        if isinstance(result, BaseException):
+            batch.statuses.append(BookingStatus(booking_id=booking_id, status="error"))
+            batch.errors.append(BatchError(index=index, error=str(result)))
+        else:
+            batch.statuses.append(result)
+    return batch
+
+
+@mcp.tool(
+    description=(
+        "Run several professor searches (same filters as search_professors) in one call. "
+        "Results come back in request order with per-item errors."
+    )
+)
+async def search_professors_batch(
+    searches: list[SearchSpec],
+    view: View = _DEFAULT_VIEW,
+) -> SearchBatchResult:
+    """Run several professor searches at once.
+
+    Args:
+        searches: Search filters, each with the same fields as search_professors
+                  (identical searches are run once).
+        view: Fields per professor: "compact" (id, name, rating, rate), "card"
+              (adds title, subjects, languages and a short bio summary) or
+              "full" (everything, including the full bio and image).
+    """
+    if len(searches) > LEARNAI_BATCH_MAX_ITEMS:
+        return SearchBatchResult(
+            errors=[
+                BatchError(index=-1, error=f"At most {LEARNAI_BATCH_MAX_ITEMS} searches per call")
+            ]
+        )
+
+    def key(spec: SearchSpec) -> tuple[Any, ...]:
+        return (
+            spec.subject.strip(),
+            spec.language.strip(),
+            spec.min_rating,
+            spec.max_hourly_rate,
+            spec.limit,
+        )
+
+    keys = [key(spec) for spec in searches]
+    results = await _fan_out(keys, lambda k: _search_professors(*k))
+
+    batch = SearchBatchResult()
+    for index, k in enumerate(keys):
+        result = results[k]
+        if isinstance(result, BaseException):
+            batch.results.append(SearchResult(query=k[0] or k[1] or "all"))
+            batch.errors.append(BatchError(index=index, error=str(result)))
+        else:
+            batch.results.append(_project(result, view))
+    return batch
 
 
 @mcp.tool(
@@ -315,29 +1382,75 @@ async def get_booking_status(
 )
 async def list_subjects() -> SubjectList:
     """Get the list of all available tutoring subjects."""
-    async with _semaphore:
-        try:
-            data = await _api_request("GET", "/api/explore", params={"subjects_only": "true"})
-            subjects = data.get("subjects", [])
-            return SubjectList(subjects=subjects)
-        except Exception:
-            # Return common subjects as fallback
-            return SubjectList(
-                subjects=[
-                    "Mathematics",
-                    "Physics",
-                    "Chemistry",
-                    "Biology",
-                    "Computer Science",
-                    "Python",
-                    "JavaScript",
-                    "English",
-                    "Spanish",
-                    "French",
-                    "Data Science",
-                    "Machine Learning",
-                ]
-            )
+    params = {"subjects_only": "true"}
+
+    async def load() -> SubjectList:
+        global _known_subjects
+        data = await _api_request("GET", "/api/explore", params=params)
+        _known_subjects = data.get("subjects", [])
+        return SubjectList(subjects=_known_subjects)
+
+    try:
+        result: SubjectList = await _response_cache.get_or_load(
+            _cache_key("list_subjects", params), load, stale_if_error=_serve_stale
+        )
+        return result
+    except Exception:
+        if _known_subjects:
+            return SubjectList(subjects=_known_subjects)
+        # Return common subjects as fallback
+        return SubjectList(
+            subjects=[
+                "Mathematics",
+                "Physics",
+                "Chemistry",
+                "Biology",
+                "Computer Science",
+                "Python",
+                "JavaScript",
+                "English",
+                "Spanish",
+                "French",
+                "Data Science",
+                "Machine Learning",
+            ]
+        )
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+@mcp.resource(
+    "learnai://metrics",
+    description="Runtime counters for the LearnAI MCP server (cache, upstream traffic).",
+    mime_type="application/json",
+)
+async def server_metrics() -> dict[str, Any]:
+    """Return runtime counters for observability."""
+    return {
+        "response_cache": _response_cache.stats(),
+        "recommendation_cache": _recommendation_cache.stats(),
+        "upstream_coalescing": _inflight.stats(),
+        "http_client": _api.stats(),
+        "upstream_concurrency": _limiter.stats(),
+        "upstream_resilience": _resilience.stats(),
+        "deadlines": deadline.stats(),
+        "bulkheads": {name: bulkhead.stats() for name, bulkhead in _bulkheads.items()},
+        "local_catalog": {
+            "enabled": LEARNAI_LOCAL_CATALOG,
+            "professors": len(_catalog),
+            "keyword_index_docs": len(_keyword_index),
+            "semantic_index_docs": len(_semantic_index),
+            "semantic_index_stale": _semantic_stale,
+            "semantic_batches": _semantic_batcher.batches,
+            "age_seconds": (
+                time.monotonic() - _catalog_loaded_at if _catalog_loaded_at is not None else None
+            ),
+        },
+        "catalog_sync": _catalog_sync.stats(),
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -356,13 +1469,25 @@ def main() -> None:
     )
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to (HTTP mode)")
     parser.add_argument("--port", type=int, default=9100, help="Port to bind to (HTTP mode)")
+    runner.add_arguments(parser)
     args = parser.parse_args()
 
     if args.transport == "http":
-        mcp.run(transport="http", host=args.host, port=args.port)
+        if runner.worker_count(args.workers) > 1:
+            # MCP sessions live in one worker's memory, but the next request
+            # may reach any worker: answer every request on its own.
+            os.environ.setdefault("FASTMCP_STATELESS_HTTP", "true")
+        runner.serve("learnai_mcp.server:http_app", args, factory=True, lifespan="on")
     else:
+        _restore_snapshot()
         mcp.run()
 
 
+def http_app() -> Starlette:
+    """Build the streamable HTTP app; each uvicorn worker calls this once at startup."""
+    _restore_snapshot()
+    return mcp.http_app()
+
+
 if __name__ == "__main__":
     main()
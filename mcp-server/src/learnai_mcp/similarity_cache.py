@@ -0,0 +1,255 @@
+"""
+Near-Duplicate Cache
+====================
+
+TTL + LRU cache keyed by free-text queries that also answers *similar*
+queries, for expensive tools like ``recommend_professors`` where agents
+rephrase the same request many ways.
+
+Queries are normalized (case, accents, stopwords, light stemming) into a set
+of words, so "Help with my Calc exams!" and "help with calc exam" are the
+same query. Each query gets a MinHash signature and is indexed with
+locality-sensitive hashing (banded signatures). A lookup only compares
+against entries sharing at least one band, and checks each of them exactly:
+an entry is reused only if one query's words contain the other's, the words
+they do not share include no numbers, and their Jaccard similarity reaches
+``threshold``. A rephrasing may add or drop filler words, but a different
+course number, budget or word ("linear" vs "nonlinear") is a different
+query. The default threshold of 0.6 lets a two-word query gain one word
+("calculus tutor" / "find calculus tutor") but not a one-word query
+("calculus" / "calculus exam").
+
+Usage:
+    cache = NearDuplicateCache(threshold=0.6, ttl=600.0)
+    hit = cache.lookup("help with calculus exam", scope=5)
+    if hit is None:
+        cache.put("help with calculus exam", result, scope=5)
+"""
+
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+from learnai_mcp.text import stem, tokenize
+
+V = TypeVar("V")
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_HISTOGRAM_BINS = 10
+
+# Entries are keyed by (scope, query shingles)
+_Key = tuple[Hashable, frozenset[str]]
+
+
+def shingles(text: str) -> frozenset[str]:
+    """Normalized, stemmed words of ``text``."""
+    return frozenset(stem(token) for token in tokenize(text))
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """Jaccard similarity of two queries' shingles, or 0 if they must not share results.
+
+    Queries are only interchangeable when one contains all words of the
+    other and the extra words include no numbers.
+    """
+    if not (a <= b or b <= a):
+        return 0.0
+    extra = a ^ b
+    if any(char.isdigit() for word in extra for char in word):
+        return 0.0
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+class MinHasher:
+    """MinHash signatures from ``num_perm`` universal hash functions."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, items: frozenset[str]) -> np.ndarray:
+        if not items:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.fromiter(
+            (zlib.crc32(item.encode()) % _MERSENNE_PRIME for item in items),
+            dtype=np.uint64,
+            count=len(items),
+        )
+        hashed = (hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME
+        signature: np.ndarray = hashed.min(axis=0)
+        return signature
+
+
+@dataclass
+class SimilarityCacheStats:
+    """Counters describing near-duplicate cache effectiveness."""
+
+    exact_hits: int = 0
+    near_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    bands: list[Hashable]
+    expires_at: float
+
+
+class NearDuplicateCache(Generic[V]):
+    """Cache that reuses values across near-duplicate queries.
+
+    Args:
+        threshold: Minimum Jaccard similarity for a near hit.
+        ttl: Seconds an entry stays valid. ``0`` disables caching.
+        max_entries: Maximum number of entries kept (least recently used evicted).
+        num_perm: MinHash signature length.
+        bands: LSH bands; ``num_perm`` must be divisible by it. More bands
+            find less similar candidates (the default finds pairs at the
+            default threshold almost surely).
+        clock: Monotonic time source (overridable for tests).
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.6,
+        ttl: float = 600.0,
+        max_entries: int = 1024,
+        num_perm: int = 64,
+        bands: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.bands = bands
+        self._rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._clock = clock
+        self._entries: OrderedDict[_Key, _Entry[V]] = OrderedDict()
+        self._buckets: dict[Hashable, set[_Key]] = {}
+        self._histogram = [0] * _HISTOGRAM_BINS
+        self._stats = SimilarityCacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, query: str, scope: Hashable = None) -> tuple[V, float] | None:
+        """Return ``(value, similarity)`` for the closest cached query, if close enough.
+
+        Only entries stored with an equal ``scope`` are considered.
+        """
+        if not self.enabled:
+            return None
+        now = self._clock()
+        items = shingles(query)
+        key: _Key = (scope, items)
+        entry = self._live_entry(key, now)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._stats.exact_hits += 1
+            self._record(1.0)
+            return entry.value, 1.0
+
+        signature = self._hasher.signature(items)
+        best_key, best = None, 0.0
+        candidates: set[_Key] = set()
+        for band in self._band_keys(scope, signature):
+            candidates |= self._buckets.get(band, set())
+        for candidate in candidates:
+            if self._live_entry(candidate, now) is None:
+                continue
+            score = similarity(items, candidate[1])
+            if score > best:
+                best_key, best = candidate, score
+
+        if candidates:
+            self._record(best)
+        if best_key is None or best < self.threshold:
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(best_key)
+        self._stats.near_hits += 1
+        return self._entries[best_key].value, best
+
+    def put(self, query: str, value: V, scope: Hashable = None) -> None:
+        """Cache ``value`` for ``query``, evicting least-recently-used entries as needed."""
+        if not self.enabled:
+            return
+        items = shingles(query)
+        key: _Key = (scope, items)
+        if key in self._entries:
+            self._remove(key)
+        signature = self._hasher.signature(items)
+        bands = self._band_keys(scope, signature)
+        self._entries[key] = _Entry(value, bands, self._clock() + self.ttl)
+        for band in bands:
+            self._buckets.setdefault(band, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self._buckets.clear()
+        self._histogram = [0] * _HISTOGRAM_BINS
+        self._stats = SimilarityCacheStats()
+
+    def stats(self) -> dict[str, Any]:
+        """Return counters, occupancy and the best-match similarity histogram."""
+        hits = self._stats.exact_hits + self._stats.near_hits
+        lookups = hits + self._stats.misses
+        width = 1 / _HISTOGRAM_BINS
+        return {
+            **asdict(self._stats),
+            "entries": len(self._entries),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "threshold": self.threshold,
+            "similarity_histogram": {
+                f"{i * width:.1f}-{(i + 1) * width:.1f}": count
+                for i, count in enumerate(self._histogram)
+            },
+        }
+
+    def _band_keys(self, scope: Hashable, signature: np.ndarray) -> list[Hashable]:
+        rows = self._rows
+        return [
+            (scope, band, signature[band * rows : (band + 1) * rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _live_entry(self, key: _Key, now: float) -> _Entry[V] | None:
+        entry = self._entries.get(key)
+        if entry is not None and now >= entry.expires_at:
+            self._remove(key)
+            self._stats.expirations += 1
+            return None
+        return entry
+
+    def _remove(self, key: _Key) -> None:
+        entry = self._entries.pop(key)
+        for band in entry.bands:
+            bucket = self._buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band]
+
+    def _record(self, similarity: float) -> None:
+        self._histogram[min(int(similarity * _HISTOGRAM_BINS), _HISTOGRAM_BINS - 1)] += 1
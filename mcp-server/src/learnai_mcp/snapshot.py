@@ -0,0 +1,129 @@
+"""
+Catalog Snapshots
+=================
+
+Compact on-disk copy of the last-known-good professor catalog, used to warm
+start the MCP server and to keep serving reads while the LearnAI API is
+unreachable.
+
+File layout (little endian)::
+
+    magic          8 bytes   b"LAICAT\\x00\\x00"
+    format         u16       SNAPSHOT_FORMAT_VERSION
+    reserved       u16
+    crc32          u32       checksum of the payload
+    payload_len    u64
+    created_at     f64       unix timestamp of the snapshot
+    payload        orjson    {"professors": [...], "subjects": [...]}
+
+Snapshots are written to a temporary file in the same directory, fsynced and
+moved into place with ``os.replace``, so readers only ever see a complete
+file. Reading memory-maps the file and decodes the payload straight from the
+mapping.
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+import time
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
+
+SNAPSHOT_MAGIC = b"LAICAT\x00\x00"
+SNAPSHOT_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHIQd")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is corrupt or has an unsupported format."""
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Decoded catalog snapshot."""
+
+    professors: list[dict[str, Any]]
+    subjects: list[str]
+    created_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+
+def write_snapshot(
+    path: str | Path,
+    professors: Sequence[dict[str, Any]],
+    subjects: Sequence[str],
+    created_at: float | None = None,
+) -> None:
+    """Atomically write a catalog snapshot to ``path``."""
+    path = Path(path)
+    payload = orjson.dumps({"professors": list(professors), "subjects": list(subjects)})
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_FORMAT_VERSION,
+        0,
+        zlib.crc32(payload),
+        len(payload),
+        time.time() if created_at is None else created_at,
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot(path: str | Path) -> CatalogSnapshot | None:
+    """Memory-map and decode the snapshot at ``path``.
+
+    Returns None if the file does not exist. Raises SnapshotError if it is
+    truncated, corrupt, or written in an unsupported format version.
+    """
+    try:
+        with open(path, "rb") as f:
+            data, created_at = _decode(f, path)
+    except FileNotFoundError:
+        return None
+
+    return CatalogSnapshot(
+        professors=data.get("professors", []),
+        subjects=data.get("subjects", []),
+        created_at=created_at,
+    )
+
+
+def _decode(f: BinaryIO, path: str | Path) -> tuple[dict[str, Any], float]:
+    """Validate the header of an open snapshot and decode its payload."""
+    size = os.fstat(f.fileno()).st_size
+    if size < _HEADER.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, _, crc, length, created_at = _HEADER.unpack_from(mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path} is not a catalog snapshot")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot format version {version}")
+        if _HEADER.size + length > size:
+            raise SnapshotError(f"Snapshot {path} is truncated")
+        with memoryview(mm)[_HEADER.size : _HEADER.size + length] as payload:
+            if zlib.crc32(payload) != crc:
+                raise SnapshotError(f"Snapshot {path} failed its checksum")
+            data = orjson.loads(payload)
+    return data, created_at
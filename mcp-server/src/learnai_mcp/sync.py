@@ -0,0 +1,199 @@
+"""
+Incremental Catalog Sync
+========================
+
+Background task that keeps a local copy of the professor catalog fresh with
+as little upstream work as possible:
+
+- Conditional requests: the last ``ETag`` / ``Last-Modified`` are sent back as
+  ``If-None-Match`` / ``If-Modified-Since``; a ``304 Not Modified`` costs no
+  payload at all.
+- Delta cursor: when the upstream returns a ``cursor`` field, the next request
+  passes it as ``updatedSince`` and the upstream only returns rows changed
+  since then (deactivated rows carry ``isActive: false``). Responses without
+  a ``cursor`` are treated as full snapshots of the catalog.
+
+The sync itself only speaks HTTP; applying rows to the catalog is delegated
+to the ``apply`` callback. Rounds never overlap: a round started while
+another is running waits for it, so rows are applied and the cursor moves
+forward in request order.
+
+Requests are sent by the ``get`` callable, which must return the raw
+response (``304``, validators). The server routes it through the same
+bulkhead, limiter and circuit breaker as its other upstream calls. Here the
+load is bounded further: at most one request in flight, backing off
+exponentially while the upstream keeps failing.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+
+from learnai_mcp.codec import loads
+
+logger = logging.getLogger(__name__)
+
+ApplyRows = Callable[[list[dict[str, Any]], bool], Awaitable[None]]
+
+# get(path, params=..., headers=...) -> response, e.g. httpx.AsyncClient.get
+GetPage = Callable[..., Awaitable[httpx.Response]]
+
+
+@dataclass
+class SyncStats:
+    """Counters describing sync activity."""
+
+    full_syncs: int = 0
+    delta_syncs: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    rows_applied: int = 0
+
+
+class CatalogSync:
+    """Periodic conditional + delta sync of the professor catalog.
+
+    Args:
+        get: Sends the sync's GET and returns the response without raising
+            for ``304 Not Modified``.
+        apply: Called with ``(rows, full)``; ``full=True`` means ``rows`` is the
+            whole catalog, otherwise only changed rows.
+        path: Upstream catalog endpoint.
+        params: Extra query parameters sent with every request.
+        interval: Seconds between syncs while healthy.
+        max_backoff: Upper bound for the retry delay after consecutive errors.
+        on_success: Called after every successful sync, changed or not.
+    """
+
+    def __init__(
+        self,
+        get: GetPage,
+        apply: ApplyRows,
+        *,
+        path: str = "/api/explore",
+        params: dict[str, Any] | None = None,
+        interval: float = 10.0,
+        max_backoff: float = 300.0,
+        on_success: Callable[[], None] | None = None,
+    ) -> None:
+        self._get = get
+        self._apply = apply
+        self.path = path
+        self.params = dict(params or {})
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._on_success = on_success
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.cursor: str | None = None
+        self.last_success: float | None = None
+        self._consecutive_errors = 0
+        self._task: asyncio.Task[None] | None = None
+        self._round = asyncio.Lock()
+        self._stats = SyncStats()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def lag_seconds(self) -> float | None:
+        """Seconds since the catalog was last confirmed up to date."""
+        if self.last_success is None:
+            return None
+        return time.monotonic() - self.last_success
+
+    async def sync_once(self) -> str:
+        """Run one sync round; returns ``"full"``, ``"delta"`` or ``"not_modified"``.
+
+        Waits for a round that is already running, so each round starts from
+        the cursor and validators the previous one left.
+        """
+        async with self._round:
+            return await self._sync()
+
+    async def _sync(self) -> str:
+        params = dict(self.params)
+        if self.cursor is not None:
+            params["updatedSince"] = self.cursor
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        response = await self._get(self.path, params=params, headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            self._stats.not_modified += 1
+            self._mark_success()
+            return "not_modified"
+        response.raise_for_status()
+
+        data = loads(response.content)
+        rows = data.get("teachers", [])
+        next_cursor = data.get("cursor")
+        full = self.cursor is None or next_cursor is None
+        await self._apply(rows, full)
+
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.cursor = next_cursor
+        self._stats.rows_applied += len(rows)
+        if full:
+            self._stats.full_syncs += 1
+        else:
+            self._stats.delta_syncs += 1
+        self._mark_success()
+        return "full" if full else "delta"
+
+    def reset(self) -> None:
+        """Forget the cursor and validators so the next sync is a full download."""
+        self.etag = None
+        self.last_modified = None
+        self.cursor = None
+
+    def start(self) -> None:
+        """Start the periodic sync loop in the background."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic sync loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **asdict(self._stats),
+            "running": self.running,
+            "cursor": self.cursor,
+            "lag_seconds": self.lag_seconds,
+        }
+
+    def _mark_success(self) -> None:
+        self.last_success = time.monotonic()
+        self._consecutive_errors = 0
+        if self._on_success is not None:
+            self._on_success()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync_once()
+            except Exception as e:  # noqa: BLE001
+                self._stats.errors += 1
+                self._consecutive_errors += 1
+                logger.warning("Catalog sync failed: %s", e)
+            delay = min(self.interval * 2**self._consecutive_errors, self.max_backoff)
+            await asyncio.sleep(delay)
@@ -0,0 +1,58 @@
+"""
+Text Normalization
+==================
+
+Shared tokenization used by the local retrieval indexes: Unicode
+normalization with accents stripped, case folding, alphanumeric tokens
+(keeping ``c++`` / ``c#`` style suffixes), English stopword removal and a
+light suffix-stripping stemmer for query matching.
+"""
+
+import re
+import unicodedata
+
+# fmt: off
+STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "i", "in", "into", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the",
+    "their", "them", "this", "to", "was", "we", "what", "with", "you", "your",
+})
+# fmt: on
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+
+
+def normalize(text: str) -> str:
+    """Case-fold ``text`` and strip accents."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str, stopwords: frozenset[str] = STOPWORDS) -> list[str]:
+    """Split ``text`` into normalized tokens, dropping stopwords."""
+    return [t for t in _TOKEN_RE.findall(normalize(text)) if t not in stopwords]
+
+
+# (suffix, replacement), longest first; a stem keeps at least three letters.
+_SUFFIXES = (
+    ("ations", ""),
+    ("ation", ""),
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ing", ""),
+    ("ed", ""),
+    ("ly", ""),
+    ("s", ""),
+)
+
+
+def stem(token: str) -> str:
+    """Strip common English inflections (``exams`` -> ``exam``, ``studying`` -> ``study``)."""
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                return token
+            return token[: -len(suffix)] + replacement
+    return token
@@ -5,6 +5,9 @@ Shared fixtures for testing MCP servers, A2A agents, tools, and ContextForge int
 """
 
 import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 import pytest
 
 # Set test environment
@@ -17,6 +20,58 @@ os.environ.setdefault("LLM_API_KEY", "test")
 os.environ.setdefault("LLM_MODEL", "llama3:8b")
 
 
+def _reset_server_state():
+    from learnai_mcp import server
+
+    server._response_cache.clear()
+    server._recommendation_cache.clear()
+    server._catalog.load([])
+    server._keyword_index.clear()
+    server._semantic_index.clear()
+    server._semantic_stale = True
+    server._catalog_loaded_at = None
+    server._known_subjects = []
+    server._catalog_sync.reset()
+    server._resilience.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_mcp_server_state():
+    """Keep cached tool results and catalog state from leaking between tests."""
+    _reset_server_state()
+    yield
+    _reset_server_state()
+
+
+@pytest.fixture
+def mock_http_client():
+    """Patch the MCP server's shared httpx client; returns the mock."""
+    client = MagicMock()
+    client.request = AsyncMock()
+    with patch("learnai_mcp.server._get_client", AsyncMock(return_value=client)):
+        yield client
+
+
+def make_response(status_code=200, json=None, headers=None):
+    """Build an httpx.Response suitable for mocked client calls."""
+    return httpx.Response(
+        status_code,
+        json=json,
+        headers=headers,
+        request=httpx.Request("GET", "http://localhost:3000"),
+    )
+
+
+class FakeClock:
+    """Manually advanced time source for components that take a ``clock``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
 @pytest.fixture
 def learnai_api_url():
     return os.environ["LEARNAI_API_URL"]
@@ -5,10 +5,13 @@ Validates that the LearnAI A2A agent server handles JSON-RPC requests
 correctly and returns proper responses for all methods.
 """
 
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from conftest import make_response
 
-from learnai_mcp.a2a.agent import app, JSONRPCRequest, JSONRPCResponse
+from learnai_mcp.a2a.agent import JSONRPCResponse, app
 
 
 class TestA2AAgentEndpoints:
@@ -37,10 +40,12 @@ class TestA2AAgentEndpoints:
         assert data["name"] == "learnai-tutor-matching"
         assert data["version"] == "1.0.0"
         assert "methods" in data
-        assert len(data["methods"]) == 3
+        assert len(data["methods"]) == 6
 
         method_names = [m["name"] for m in data["methods"]]
         assert "match_tutor" in method_names
+        assert "match_tutor.stream" in method_names
+        assert "tasks/get" in method_names
         assert "create_booking" in method_names
         assert "check_availability" in method_names
 
@@ -63,19 +68,14 @@ class TestA2AMatchTutor:
 
     def test_match_tutor_success(self, client, mock_professors):
         """match_tutor should return professor recommendations."""
-        with patch("learnai_mcp.a2a.agent.httpx.AsyncClient") as MockClient:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {
-                "teachers": mock_professors,
-                "explanation": "Here are the best matches",
-            }
-            mock_response.raise_for_status = MagicMock()
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            mock_response = make_response(
+                json={"teachers": mock_professors, "explanation": "Here are the best matches"}
+            )
 
             mock_instance = AsyncMock()
             mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_instance
+            get_client.return_value = mock_instance
 
             response = client.post(
                 "/a2a",
@@ -137,16 +137,12 @@ class TestA2ACreateBooking:
 
     def test_create_booking_success(self, client):
         """create_booking should return booking confirmation."""
-        with patch("learnai_mcp.a2a.agent.httpx.AsyncClient") as MockClient:
-            mock_response = MagicMock()
-            mock_response.json.return_value = {"bookingId": "booking-456"}
-            mock_response.raise_for_status = MagicMock()
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            mock_response = make_response(json={"bookingId": "booking-456"})
 
             mock_instance = AsyncMock()
             mock_instance.post = AsyncMock(return_value=mock_response)
-            mock_instance.__aenter__ = AsyncMock(return_value=mock_instance)
-            mock_instance.__aexit__ = AsyncMock(return_value=False)
-            MockClient.return_value = mock_instance
+            get_client.return_value = mock_instance
 
             response = client.post(
                 "/a2a",
@@ -226,6 +222,13 @@ class TestA2AUnknownMethod:
         assert data["error"]["code"] == -32601
         assert "Method not found" in data["error"]["message"]
 
+    def test_falsy_ids_are_echoed(self, client):
+        """Ids 0 and "" are valid and must come back unchanged, alone or in a batch."""
+        for request_id in (0, ""):
+            call = {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": request_id}
+            assert client.post("/a2a", json=call).json()["id"] == request_id
+            assert client.post("/a2a", json=[call]).json()[0]["id"] == request_id
+
 
 class TestA2AInvokeRouter:
     """Test the generic invoke method routing."""
@@ -268,3 +271,211 @@ class TestA2AInvokeRouter:
         assert response.status_code == 200
         data = response.json()
         assert "Unknown action" in data["result"]["error"]
+
+
+class TestA2AAdmissionControl:
+    """Test load shedding in front of the A2A methods."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        return TestClient(app)
+
+    def test_overloaded_request_fails_fast(self, client):
+        """A full admission queue should return a JSON-RPC overloaded error."""
+        from learnai_mcp.a2a.agent import Bulkhead
+
+        full = Bulkhead("a2a", 0, max_queue=0)
+        with patch("learnai_mcp.a2a.agent._admission", full):
+            response = client.post(
+                "/a2a",
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "check_availability",
+                    "params": {"teacherId": "prof-1", "date": "2026-03-01"},
+                    "id": "test-6",
+                },
+            )
+            metrics = client.get("/metrics").json()
+
+        assert response.status_code == 200
+        assert "Retry-After" in response.headers
+        data = response.json()
+        assert data["id"] == "test-6"
+        assert data["error"]["code"] == -32003
+        assert data["error"]["data"]["retry_after_ms"] > 0
+        assert metrics["admission"]["shed_queue_full"] == 1
+
+    def test_admitted_requests_release_their_slot(self, client):
+        """Served requests should not leak admission slots."""
+        from learnai_mcp.a2a.agent import _admission
+
+        for i in range(3):
+            client.post(
+                "/a2a",
+                json={"jsonrpc": "2.0", "method": "check_availability", "params": {}, "id": i},
+            )
+        assert _admission.in_flight == 0
+
+
+class TestA2ADeadlines:
+    """Test time budgets and cancellation of A2A requests."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        return TestClient(app)
+
+    def test_caller_timeout_header_cuts_request_short(self, client):
+        """X-Request-Timeout-Ms should bound the request and return a deadline error."""
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            mock_instance = AsyncMock()
+            mock_instance.post = slow_post
+            get_client.return_value = mock_instance
+
+            response = client.post(
+                "/a2a",
+                headers={"X-Request-Timeout-Ms": "50"},
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "match_tutor",
+                    "params": {"query": "calculus"},
+                    "id": "test-7",
+                },
+            )
+
+        data = response.json()
+        assert data["id"] == "test-7"
+        assert data["error"]["code"] == -32004
+        assert client.get("/metrics").json()["admission"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_work(self):
+        """Work should be cancelled as soon as the caller disconnects."""
+        from learnai_mcp.a2a.agent import _until_disconnected
+
+        disconnected = asyncio.Event()
+        cancelled = False
+
+        class FakeRequest:
+            async def receive(self):
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+        async def work():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        pending = asyncio.create_task(_until_disconnected(FakeRequest(), work()))
+        await asyncio.sleep(0)
+        disconnected.set()
+
+        assert await asyncio.wait_for(pending, 1) is None
+        await asyncio.sleep(0)
+        assert cancelled
+
+
+class TestA2ABatch:
+    """Test JSON-RPC batch requests."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        return TestClient(app)
+
+    def test_batch_responses_keep_request_order(self, client):
+        """Each call in a batch should get its own response, in request order."""
+        response = client.post(
+            "/a2a",
+            json=[
+                {"jsonrpc": "2.0", "method": "check_availability", "params": {}, "id": "a"},
+                {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": "b"},
+                {"jsonrpc": "2.0", "method": "match_tutor", "params": {"query": ""}, "id": 3},
+            ],
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data] == ["a", "b", 3]
+        assert data[1]["error"]["code"] == -32601
+        assert "error" in data[2]["result"]
+
+    def test_invalid_item_only_fails_itself(self, client):
+        """A malformed batch item should get -32600 while the others succeed."""
+        response = client.post(
+            "/a2a",
+            json=[
+                {"jsonrpc": "2.0", "params": {}, "id": "no-method"},
+                {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": "ok"},
+                42,
+            ],
+        )
+
+        data = response.json()
+        assert [item["id"] for item in data] == ["no-method", "ok", None]
+        assert data[0]["error"]["code"] == -32600
+        assert data[1]["error"]["code"] == -32601
+        assert data[2]["error"]["code"] == -32600
+
+    def test_notifications_get_no_response(self, client):
+        """Items without an id should run but be left out of the response."""
+        mixed = client.post(
+            "/a2a",
+            json=[
+                {"jsonrpc": "2.0", "method": "unknown_method", "params": {}},
+                {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": "kept"},
+            ],
+        )
+        only_notifications = client.post(
+            "/a2a", json=[{"jsonrpc": "2.0", "method": "unknown_method", "params": {}}]
+        )
+
+        assert [item["id"] for item in mixed.json()] == ["kept"]
+        assert only_notifications.status_code == 204
+        assert only_notifications.content == b""
+
+    def test_empty_and_oversized_batches_rejected(self, client):
+        """Empty batches and batches over the size cap should get one -32600 error."""
+        empty = client.post("/a2a", json=[])
+        item = {"jsonrpc": "2.0", "method": "unknown_method", "params": {}, "id": 1}
+        with patch("learnai_mcp.a2a.agent.LEARNAI_A2A_MAX_BATCH", 2):
+            oversized = client.post("/a2a", json=[item] * 3)
+
+        for response in (empty, oversized):
+            data = response.json()
+            assert data["id"] is None
+            assert data["error"]["code"] == -32600
+
+    def test_batch_concurrency_capped(self, client):
+        """Batch items should run concurrently, but never more than the cap at once."""
+        running = peak = 0
+
+        async def dispatch(request, request_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return JSONRPCResponse(result={}, id=request_id)
+
+        batch = [
+            {"jsonrpc": "2.0", "method": "check_availability", "params": {}, "id": i}
+            for i in range(10)
+        ]
+        with patch("learnai_mcp.a2a.agent._dispatch", side_effect=dispatch), \
+                patch("learnai_mcp.a2a.agent.LEARNAI_A2A_BATCH_CONCURRENCY", 3):
+            response = client.post("/a2a", json=batch)
+
+        assert [item["id"] for item in response.json()] == list(range(10))
+        assert peak == 3
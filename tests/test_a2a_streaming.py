@@ -0,0 +1,256 @@
+"""
+A2A Streaming Tests
+====================
+Validates match_tutor.stream: Server-Sent Events order and format, the
+NDJSON and plain JSON upstream paths, early delivery of candidates,
+coalescing for slow readers, and release of admission slots.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import orjson
+import pytest
+
+from learnai_mcp.a2a.agent import JSONRPCResponse, _EventBuffer, _EventStreamResponse, app
+
+TEACHERS = [{"id": "prof-1", "name": "Dr. Smith", "rating": 4.8}]
+
+
+def _upstream(handler):
+    """Patch the agent's HTTP client with one served by ``handler``."""
+    client = httpx.AsyncClient(
+        base_url="http://learnai-api", transport=httpx.MockTransport(handler)
+    )
+    return patch("learnai_mcp.a2a.agent._get_client", AsyncMock(return_value=client))
+
+
+def _ndjson(*chunks):
+    return httpx.Response(
+        200,
+        headers={"content-type": "application/x-ndjson"},
+        content=b"".join(orjson.dumps(c) + b"\n" for c in chunks),
+    )
+
+
+def _events(body):
+    """Parse an SSE body into (event, JSON-RPC response) pairs."""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], orjson.loads(fields["data"])))
+    return events
+
+
+def _stream_request(query="calculus", request_id="s-1"):
+    return {
+        "jsonrpc": "2.0",
+        "method": "match_tutor.stream",
+        "params": {"query": query},
+        "id": request_id,
+    }
+
+
+class TestMatchTutorStream:
+    """End-to-end streaming through the /a2a endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        return TestClient(app)
+
+    def test_streams_candidates_explanation_then_summary(self, client):
+        """Events should arrive in order, each a JSON-RPC response with the request id."""
+        accepts = []
+
+        def handler(request):
+            accepts.append(request.headers["accept"])
+            return _ndjson(
+                {"teachers": TEACHERS}, {"explanation": "Dr. Smith "}, {"explanation": "fits."}
+            )
+
+        with _upstream(handler):
+            response = client.post("/a2a", json=_stream_request())
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "application/x-ndjson" in accepts[0]
+        events = _events(response.text)
+        assert next(kind for kind, _ in events) == "candidates"
+        assert [kind for kind, _ in events][-1] == "done"
+        assert all(rpc["id"] == "s-1" for _, rpc in events)
+        assert events[0][1]["result"]["teachers"] == TEACHERS
+        deltas = [rpc["result"]["delta"] for kind, rpc in events if kind == "explanation"]
+        assert "".join(deltas) == "Dr. Smith fits."
+        assert events[-1][1]["result"] == {
+            "type": "done",
+            "action": "match_tutor",
+            "teachers": TEACHERS,
+            "explanation": "Dr. Smith fits.",
+            "query": "calculus",
+        }
+
+    def test_plain_json_upstream(self, client):
+        """An upstream without NDJSON support should still produce the same events."""
+
+        def handler(request):
+            return httpx.Response(200, json={"teachers": TEACHERS, "explanation": "Great fit."})
+
+        with _upstream(handler):
+            events = _events(client.post("/a2a", json=_stream_request()).text)
+
+        assert [kind for kind, _ in events] == ["candidates", "explanation", "done"]
+        assert events[-1][1]["result"]["explanation"] == "Great fit."
+
+    def test_upstream_failure_is_an_error_event(self, client):
+        """An upstream error after the stream opened should end it with an error event."""
+        with _upstream(lambda request: httpx.Response(502)):
+            events = _events(client.post("/a2a", json=_stream_request()).text)
+            in_flight = client.get("/metrics").json()["admission"]["in_flight"]
+
+        assert [kind for kind, _ in events] == ["error"]
+        assert events[0][1]["error"]["code"] == -32000
+        assert in_flight == 0
+
+    def test_overloaded_stream_gets_json_error(self, client):
+        """A shed streaming request should get a plain JSON-RPC error, not a stream."""
+        from learnai_mcp.a2a.agent import Bulkhead
+
+        with patch("learnai_mcp.a2a.agent._admission", Bulkhead("a2a", 0, max_queue=0)):
+            response = client.post("/a2a", json=_stream_request())
+
+        assert response.headers["content-type"] == "application/json"
+        assert "Retry-After" in response.headers
+        assert response.json()["error"]["code"] == -32003
+
+    @pytest.mark.asyncio
+    async def test_slot_released_when_stream_cannot_start(self):
+        """A method failing before its stream exists should not keep its admission slot."""
+        from learnai_mcp.a2a import agent
+
+        def broken(params):
+            raise RuntimeError("no stream")
+
+        request = agent.JSONRPCRequest(**_stream_request())
+        admission = agent.Bulkhead("a2a", 1, max_queue=0)
+        with (
+            patch.object(agent, "_admission", admission),
+            patch.dict(agent._STREAMING_METHODS, {"match_tutor.stream": broken}),
+            pytest.raises(RuntimeError),
+        ):
+            await agent._open_stream(request, "s-1", None)
+
+        assert admission.stats()["in_flight"] == 0
+
+    def test_streaming_method_not_batchable(self, client):
+        response = client.post("/a2a", json=[_stream_request()])
+
+        assert response.json()[0]["error"]["code"] == -32600
+
+
+class TestStreamDelivery:
+    """Timing and backpressure of the SSE response itself."""
+
+    @staticmethod
+    async def _serve(response, send):
+        async def receive():
+            await asyncio.Event().wait()
+
+        scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+        await response(scope, receive, send)
+
+    @pytest.mark.asyncio
+    async def test_candidates_sent_before_explanation_exists(self):
+        """Candidates should reach the reader while the explanation is still pending."""
+        explanation_ready = asyncio.Event()
+        frames = []
+
+        async def events():
+            yield "candidates", {"teachers": TEACHERS}
+            await explanation_ready.wait()
+            yield "explanation", {"delta": "Late."}
+
+        async def send(message):
+            frames.append(message.get("body", b""))
+            if b"candidates" in frames[-1]:
+                assert not explanation_ready.is_set()
+                explanation_ready.set()
+
+        release = AsyncMock()
+        await self._serve(_EventStreamResponse("s-2", events(), 5.0, release), send)
+
+        assert b"candidates" in frames[1]
+        assert b"Late." in frames[2]
+        release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stalled_reader_dropped_after_grace(self):
+        """A reader that stops reading should not hold the slot past deadline + grace."""
+        closed = asyncio.Event()
+
+        async def events():
+            try:
+                yield "candidates", {"teachers": TEACHERS}
+                await asyncio.sleep(10)
+            finally:
+                closed.set()
+
+        async def stalled_send(message):
+            if message.get("body"):
+                await asyncio.sleep(10)
+
+        release = AsyncMock()
+        with patch("learnai_mcp.a2a.agent.LEARNAI_A2A_STREAM_GRACE", 0.05):
+            await asyncio.wait_for(
+                self._serve(_EventStreamResponse("s-3", events(), 0.05, release), stalled_send),
+                1,
+            )
+        await asyncio.wait_for(closed.wait(), 1)
+
+        release.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_deadline_ends_stream_with_error_event(self):
+        frames = []
+
+        async def events():
+            yield "candidates", {"teachers": TEACHERS}
+            await asyncio.sleep(10)
+
+        async def send(message):
+            frames.append(message.get("body", b""))
+
+        await self._serve(_EventStreamResponse("s-4", events(), 0.05, AsyncMock()), send)
+
+        assert b"event: error" in frames[-2]
+        assert b"-32004" in frames[-2]
+
+
+class TestEventBuffer:
+    """Unit tests for the producer/reader buffer."""
+
+    @pytest.mark.asyncio
+    async def test_pending_deltas_coalesced(self):
+        """Deltas queued while the reader is busy should arrive as one event."""
+        buffer = _EventBuffer()
+        buffer.put("candidates", {"teachers": TEACHERS})
+        for word in ("One ", "two ", "three."):
+            buffer.put("explanation", {"delta": word})
+        buffer.put("done", {})
+        buffer.close()
+
+        events = [event async for event in buffer]
+        assert events == [
+            ("candidates", {"teachers": TEACHERS}),
+            ("explanation", {"delta": "One two three."}),
+            ("done", {}),
+        ]
+
+    def test_frames_are_json_rpc(self):
+        from learnai_mcp.a2a.agent import _sse
+
+        frame = _sse("explanation", JSONRPCResponse(result={"delta": "a\nb"}, id=7))
+        assert frame.startswith(b"event: explanation\ndata: ")
+        assert frame.count(b"\n") == 3
+        assert _events(frame.decode())[0][1]["result"]["delta"] == "a\nb"
@@ -0,0 +1,272 @@
+"""
+A2A Background Task Tests
+==========================
+Validates the bounded TTL task store and the async task mode of the A2A
+endpoint: submission, polling with tasks/get, cancellation with
+tasks/cancel, and task deadlines.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from conftest import FakeClock, make_response
+
+from learnai_mcp import deadline
+from learnai_mcp.a2a.agent import app
+from learnai_mcp.a2a.tasks import TaskFailed, TaskStore
+from learnai_mcp.limiter import Overloaded
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestTaskStore:
+    """Unit tests for TaskStore."""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_before_work_finishes(self):
+        store = TaskStore()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return {"ok": True}
+
+        task = store.submit("match_tutor", work)
+        await _settle()
+        assert store.get(task.id).state == "working"
+
+        release.set()
+        await _settle()
+        assert store.get(task.id).snapshot() == {
+            "task_id": task.id,
+            "method": "match_tutor",
+            "state": "completed",
+            "result": {"ok": True},
+        }
+
+    @pytest.mark.asyncio
+    async def test_tasks_beyond_running_cap_wait(self):
+        store = TaskStore(max_running=1)
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return {}
+
+        first, second = store.submit("a", work), store.submit("b", work)
+        await _settle()
+        assert (first.state, second.state) == ("working", "submitted")
+        assert store.stats()["waiting"] == 1
+
+        release.set()
+        await _settle()
+        assert (first.state, second.state) == ("completed", "completed")
+
+    @pytest.mark.asyncio
+    async def test_finished_tasks_expire_after_ttl(self):
+        clock = FakeClock()
+        store = TaskStore(ttl=60.0, clock=clock)
+        task = store.submit("a", AsyncMock(return_value={}))
+        await _settle()
+
+        clock.now = 59.0
+        assert store.get(task.id) is task
+        clock.now = 60.0
+        assert store.get(task.id) is None
+        assert store.stats()["expired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_store_evicts_finished_then_rejects(self):
+        """A full store should make room by evicting finished tasks, never running ones."""
+        store = TaskStore(max_tasks=2)
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return {}
+
+        done = store.submit("a", AsyncMock(return_value={}))
+        await _settle()
+        running = store.submit("b", work)
+        store.submit("c", work)
+
+        assert store.get(done.id) is None
+        assert store.get(running.id) is running
+        with pytest.raises(Overloaded):
+            store.submit("d", work)
+        assert store.stats()["rejected"] == 1
+        store.clear()
+
+    @pytest.mark.asyncio
+    async def test_oversized_result_fails_task(self):
+        store = TaskStore(max_result_bytes=100)
+        task = store.submit("a", AsyncMock(return_value={"blob": "x" * 200}))
+        await _settle()
+
+        assert task.state == "failed"
+        assert task.result is None
+        assert "limit" in task.error["message"]
+
+    @pytest.mark.asyncio
+    async def test_failures_keep_their_error(self):
+        store = TaskStore()
+        rpc_error = {"code": -32004, "message": "Deadline exceeded"}
+        failed = store.submit("a", AsyncMock(side_effect=TaskFailed(rpc_error)))
+        crashed = store.submit("b", AsyncMock(side_effect=RuntimeError("boom")))
+        await _settle()
+
+        assert failed.error == rpc_error
+        assert crashed.error == {"code": -32000, "message": "boom"}
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_work(self):
+        store = TaskStore()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        task = store.submit("a", work)
+        await _settle()
+        store.cancel(task)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert task.state == "canceled"
+        assert store.stats()["canceled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_work_detached_from_submitting_deadline(self):
+        """A task should outlive the deadline of the request that submitted it."""
+        store = TaskStore()
+        seen = []
+
+        async def work():
+            seen.append(deadline.remaining())
+            return {}
+
+        with deadline.scope(0.01):
+            task = store.submit("a", work)
+        await _settle()
+
+        assert task.state == "completed"
+        assert seen == [None]
+
+
+class TestA2ATaskMode:
+    """Async task mode through the /a2a endpoint."""
+
+    @pytest.fixture
+    def client(self):
+        from fastapi.testclient import TestClient
+
+        # Keep one event loop alive across requests so background tasks keep running
+        with TestClient(app) as client:
+            yield client
+
+    @staticmethod
+    def _call(client, method, params, request_id="t-1"):
+        return client.post(
+            "/a2a", json={"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+        ).json()
+
+    def _poll(self, client, task_id, timeout=2.0):
+        stop = time.monotonic() + timeout
+        while time.monotonic() < stop:
+            result = self._call(client, "tasks/get", {"task_id": task_id})["result"]
+            if result["state"] not in ("submitted", "working"):
+                return result
+            time.sleep(0.01)
+        raise AssertionError("task did not finish")
+
+    def test_async_call_returns_task_then_result(self, client, mock_professors):
+        """An async call should return a task at once and its result on a later poll."""
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return make_response(json={"teachers": mock_professors, "explanation": "ok"})
+
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            get_client.return_value = AsyncMock(post=slow_post)
+            submitted = self._call(
+                client, "match_tutor", {"query": "calculus", "async": True}
+            )["result"]
+            assert submitted["state"] in ("submitted", "working")
+            finished = self._poll(client, submitted["task_id"])
+
+        assert finished["state"] == "completed"
+        assert finished["method"] == "match_tutor"
+        assert finished["result"]["teachers"] == mock_professors
+        assert finished["result"]["explanation"] == "ok"
+
+    def test_cancel_task(self, client):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            get_client.return_value = AsyncMock(post=hang)
+            task_id = self._call(
+                client, "match_tutor", {"query": "calculus", "async": True}
+            )["result"]["task_id"]
+
+            canceled = self._call(client, "tasks/cancel", {"task_id": task_id})
+            again = self._call(client, "tasks/cancel", {"task_id": task_id})
+            polled = self._call(client, "tasks/get", {"task_id": task_id})
+
+        assert canceled["result"]["state"] == "canceled"
+        assert again["error"]["code"] == -32002
+        assert polled["result"]["state"] == "canceled"
+
+    def test_unknown_task(self, client):
+        for method in ("tasks/get", "tasks/cancel"):
+            data = self._call(client, method, {"task_id": "no-such-task"})
+            assert data["error"]["code"] == -32001
+
+    def test_task_deadline(self, client):
+        """A task should fail with -32004 once LEARNAI_A2A_TASK_TIMEOUT passes."""
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client, \
+                patch("learnai_mcp.a2a.agent.LEARNAI_A2A_TASK_TIMEOUT", 0.05):
+            get_client.return_value = AsyncMock(post=hang)
+            task_id = self._call(
+                client, "match_tutor", {"query": "calculus", "async": True}
+            )["result"]["task_id"]
+            finished = self._poll(client, task_id)
+
+        assert finished["state"] == "failed"
+        assert finished["error"]["code"] == -32004
+
+    def test_task_outlives_request_timeout(self, client):
+        """The caller's X-Request-Timeout-Ms bounds the submission, not the task."""
+
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.1)
+            return make_response(json={"teachers": [], "explanation": "late"})
+
+        with patch("learnai_mcp.a2a.agent._get_client", new_callable=AsyncMock) as get_client:
+            get_client.return_value = AsyncMock(post=slow_post)
+            submitted = client.post(
+                "/a2a",
+                headers={"X-Request-Timeout-Ms": "20"},
+                json={
+                    "jsonrpc": "2.0",
+                    "method": "match_tutor",
+                    "params": {"query": "calculus", "async": True},
+                    "id": "t-2",
+                },
+            ).json()["result"]
+            finished = self._poll(client, submitted["task_id"])
+
+        assert finished["state"] == "completed"
+        assert finished["result"]["explanation"] == "late"
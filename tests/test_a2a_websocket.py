@@ -0,0 +1,143 @@
+"""
+A2A WebSocket Transport Tests
+==============================
+Validates JSON-RPC over /a2a/ws: handshake authentication, requests
+multiplexed by id, per-connection flow control, notifications, batches,
+streaming events and keepalive settings.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from learnai_mcp.a2a.agent import JSONRPCResponse, app
+
+
+def _request(method, request_id, **params):
+    return {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+
+
+def _sleepy_dispatch(delays, tracker=None):
+    """Fake _dispatch that sleeps params["delay"] seconds and echoes the id."""
+
+    async def dispatch(request, request_id):
+        if tracker is not None:
+            tracker["running"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["running"])
+        try:
+            await asyncio.sleep(request.params.get("delay", 0))
+        finally:
+            if tracker is not None:
+                tracker["running"] -= 1
+        delays.append(request_id)
+        return JSONRPCResponse(result={"echo": request_id}, id=request_id)
+
+    return dispatch
+
+
+class TestA2AWebSocket:
+    """JSON-RPC over one WebSocket connection."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_requires_token_at_handshake(self, client):
+        with patch("learnai_mcp.a2a.agent.LEARNAI_A2A_TOKEN", "secret"):
+            with pytest.raises(WebSocketDisconnect) as rejected, client.websocket_connect("/a2a/ws"):
+                pass
+            with client.websocket_connect(
+                "/a2a/ws", headers={"Authorization": "Bearer secret"}
+            ) as ws:
+                ws.send_json(_request("unknown_method", 1))
+                assert ws.receive_json()["error"]["code"] == -32601
+
+        assert rejected.value.code == 1008
+
+    def test_responses_multiplexed_by_id(self, client):
+        """A fast request should be answered before an earlier slow one."""
+        finished = []
+        with (
+            patch("learnai_mcp.a2a.agent._dispatch", _sleepy_dispatch(finished)),
+            client.websocket_connect("/a2a/ws") as ws,
+        ):
+            ws.send_json(_request("check_availability", "slow", delay=0.2))
+            ws.send_json(_request("check_availability", "fast"))
+            answers = [ws.receive_json(), ws.receive_json()]
+
+        assert [a["id"] for a in answers] == ["fast", "slow"]
+        assert all(a["result"]["echo"] == a["id"] for a in answers)
+
+    def test_in_flight_window_caps_concurrency(self, client):
+        """Requests beyond the per-connection window should wait, not be dropped."""
+        tracker = {"running": 0, "peak": 0}
+        with (
+            patch("learnai_mcp.a2a.agent._dispatch", _sleepy_dispatch([], tracker)),
+            patch("learnai_mcp.a2a.agent.LEARNAI_A2A_WS_MAX_IN_FLIGHT", 2),
+            client.websocket_connect("/a2a/ws") as ws,
+        ):
+            for i in range(6):
+                ws.send_json(_request("check_availability", i, delay=0.02))
+            ids = sorted(ws.receive_json()["id"] for _ in range(6))
+
+        assert ids == list(range(6))
+        assert tracker["peak"] == 2
+
+    def test_notifications_parse_errors_and_batches(self, client):
+        with client.websocket_connect("/a2a/ws") as ws:
+            ws.send_json({"jsonrpc": "2.0", "method": "unknown_method", "params": {}})
+            ws.send_text("{not json")
+            parse_error = ws.receive_json()
+            ws.send_json([_request("unknown_method", "a"), {"id": "b"}])
+            batch = ws.receive_json()
+
+        assert parse_error["error"]["code"] == -32700
+        assert [item["id"] for item in batch] == ["a", "b"]
+        assert batch[1]["error"]["code"] == -32600
+
+    def test_streaming_method_sends_each_event(self, client):
+        async def events(params):
+            yield "candidates", {"teachers": []}
+            yield "explanation", {"delta": "Hi"}
+            yield "done", {"explanation": "Hi"}
+
+        with (
+            patch.dict("learnai_mcp.a2a.agent._STREAMING_METHODS", {"match_tutor.stream": events}),
+            client.websocket_connect("/a2a/ws") as ws,
+        ):
+            ws.send_json(_request("match_tutor.stream", "s", query="calculus"))
+            messages = [ws.receive_json() for _ in range(3)]
+
+        assert [m["result"]["type"] for m in messages] == ["candidates", "explanation", "done"]
+        assert all(m["id"] == "s" for m in messages)
+
+    def test_connection_counted_in_metrics(self, client):
+        from learnai_mcp.a2a.agent import _ws_stats
+
+        opened = _ws_stats.connections
+        with client.websocket_connect("/a2a/ws") as ws:
+            ws.send_json(_request("unknown_method", 1))
+            ws.receive_json()
+            assert client.get("/metrics").json()["websocket"]["open"] >= 1
+
+        assert _ws_stats.connections == opened + 1
+
+
+class TestA2AWebSocketKeepalive:
+    def test_ping_settings_passed_to_server(self):
+        from learnai_mcp.a2a import agent
+
+        with patch("learnai_mcp.runner.uvicorn.run") as run, \
+                patch("sys.argv", ["agent", "--port", "9300"]), \
+                patch.object(agent, "LEARNAI_A2A_WS_PING_INTERVAL", 15.0), \
+                patch.object(agent, "LEARNAI_A2A_WS_PING_TIMEOUT", 0.0):
+            agent.main()
+
+        kwargs = run.call_args.kwargs
+        assert run.call_args.args == ("learnai_mcp.a2a.agent:app",)
+        assert kwargs["port"] == 9300
+        assert kwargs["ws_ping_interval"] == 15.0
+        assert kwargs["ws_ping_timeout"] is None
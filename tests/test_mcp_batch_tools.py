@@ -0,0 +1,129 @@
+"""
+MCP Batch Tool Tests
+=====================
+Validates get_booking_statuses and search_professors_batch: deduplication,
+bounded fan-out, per-item errors and the optional bulk booking endpoint.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from learnai_mcp.server import SearchSpec
+
+
+def _booking(booking_id):
+    return {
+        "id": booking_id,
+        "status": "confirmed",
+        "subject": "Mathematics",
+        "scheduledFor": "2026-03-01T14:00:00Z",
+        "durationMinutes": 60,
+        "teacher": {"name": "Dr. Bob Chen"},
+    }
+
+
+class TestGetBookingStatuses:
+    """The get_booking_statuses MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_dedupes_and_reports_per_item_errors(self):
+        """Duplicate IDs should be fetched once; failures should not sink the batch."""
+        from learnai_mcp.server import get_booking_statuses
+
+        async def fake_api(method, path, **kwargs):
+            booking_id = path.rsplit("/", 1)[-1]
+            if booking_id == "missing":
+                raise RuntimeError("404 Not Found")
+            return _booking(booking_id)
+
+        with patch("learnai_mcp.server._api_request", side_effect=fake_api) as mock_api:
+            result = await get_booking_statuses.fn(booking_ids=["b1", "missing", "b2", "b1"])
+
+        assert mock_api.call_count == 3
+        assert [s.booking_id for s in result.statuses] == ["b1", "missing", "b2", "b1"]
+        assert [s.status for s in result.statuses] == [
+            "confirmed", "error", "confirmed", "confirmed",
+        ]
+        assert [(e.index, e.error) for e in result.errors] == [(1, "404 Not Found")]
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_bounded(self):
+        """No more than LEARNAI_BATCH_CONCURRENCY lookups should run at once."""
+        from learnai_mcp.server import get_booking_statuses
+
+        in_flight = peak = 0
+
+        async def fake_api(method, path, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _booking(path.rsplit("/", 1)[-1])
+
+        with patch("learnai_mcp.server.LEARNAI_BATCH_CONCURRENCY", 3), \
+                patch("learnai_mcp.server._api_request", side_effect=fake_api):
+            result = await get_booking_statuses.fn(booking_ids=[f"b{i}" for i in range(10)])
+
+        assert len(result.statuses) == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_uses_bulk_endpoint_when_configured(self):
+        """A configured bulk endpoint should answer the whole batch in one request."""
+        from learnai_mcp.server import get_booking_statuses
+
+        with patch("learnai_mcp.server.LEARNAI_BOOKINGS_BULK_PATH", "/api/bookings/bulk"), \
+                patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = {"bookings": [_booking("b1")]}
+            result = await get_booking_statuses.fn(booking_ids=["b1", "b2", "b1"])
+
+        mock_api.assert_awaited_once_with(
+            "POST", "/api/bookings/bulk", json={"ids": ["b1", "b2"]}, pool="booking"
+        )
+        assert [s.status for s in result.statuses] == ["confirmed", "error", "confirmed"]
+        assert [e.index for e in result.errors] == [1]
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_batches(self):
+        """Batches above LEARNAI_BATCH_MAX_ITEMS should be refused up front."""
+        from learnai_mcp.server import get_booking_statuses
+
+        with patch("learnai_mcp.server.LEARNAI_BATCH_MAX_ITEMS", 2), \
+                patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            result = await get_booking_statuses.fn(booking_ids=["b1", "b2", "b3"])
+
+        mock_api.assert_not_awaited()
+        assert result.statuses == []
+        assert result.errors[0].index == -1
+
+
+class TestSearchProfessorsBatch:
+    """The search_professors_batch MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_distinct_searches_once(self, mock_professors):
+        """Identical specs should share one upstream call; order is preserved."""
+        from learnai_mcp.server import search_professors_batch
+
+        async def fake_api(method, path, params=None, **kwargs):
+            if params.get("subject") == "Astrology":
+                raise RuntimeError("Service unavailable")
+            return {"teachers": [p for p in mock_professors if params["subject"] in p["subjects"]]}
+
+        specs = [
+            SearchSpec(subject="Python"),
+            SearchSpec(subject="Astrology"),
+            SearchSpec(subject=" Python "),
+            SearchSpec(subject="Calculus"),
+        ]
+        with patch("learnai_mcp.server._api_request", side_effect=fake_api) as mock_api:
+            result = await search_professors_batch.fn(searches=specs)
+
+        assert mock_api.call_count == 3
+        assert [[p.id for p in r.professors] for r in result.results] == [
+            ["prof-1"], [], ["prof-1"], ["prof-2"],
+        ]
+        assert [(e.index, e.error) for e in result.errors] == [(1, "Service unavailable")]
@@ -0,0 +1,172 @@
+"""
+MCP Local Catalog Tests
+========================
+Validates the columnar professor catalog: vectorized filters, top-k
+selection, upstream-compatible (rating, id) ordering and keyset paging, plus
+its use by search_professors.
+"""
+
+import random
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from conftest import make_response
+
+from learnai_mcp.catalog import ProfessorCatalog
+from learnai_mcp.server import ProfessorInfo
+
+
+def _reference_query(professors, subject="", language="", min_rating=0.0,
+                     max_hourly_rate=None, limit=10):
+    """Pure-Python reference implementation of the upstream semantics."""
+    matches = [
+        p for p in professors
+        if (not subject or subject.lower() in [s.lower() for s in p.subjects])
+        and (not language or language.lower() in [lang.lower() for lang in p.languages])
+        and p.rating >= min_rating
+        and (max_hourly_rate is None or float(p.hourly_rate) <= max_hourly_rate)
+    ]
+    return sorted(matches, key=lambda p: (-p.rating, p.id))[:limit]
+
+
+@pytest.fixture
+def catalog(mock_professors):
+    return ProfessorCatalog(ProfessorInfo(**p) for p in mock_professors)
+
+
+class TestProfessorCatalog:
+    """Unit tests for ProfessorCatalog."""
+
+    def test_filters_by_subject_case_insensitive(self, catalog):
+        """Subject filter should match case-insensitively."""
+        result = catalog.query(subject="python")
+        assert [p.id for p in result] == ["prof-1"]
+
+    def test_filters_by_language_and_rate(self, catalog):
+        """Language and hourly rate filters should combine."""
+        assert [p.id for p in catalog.query(language="English")] == ["prof-1", "prof-2"]
+        assert [p.id for p in catalog.query(language="English", max_hourly_rate=70)] == [
+            "prof-2"
+        ]
+
+    def test_unknown_subject_returns_empty(self, catalog):
+        """Subjects absent from the catalog should match nothing."""
+        assert catalog.query(subject="Astrology") == []
+
+    def test_min_rating_inclusive(self, catalog):
+        """min_rating should be inclusive."""
+        assert [p.id for p in catalog.query(min_rating=4.9)] == ["prof-1"]
+
+    def test_ties_ordered_by_id(self):
+        """Equal ratings should be ordered by id, also at the top-k boundary."""
+        profs = [ProfessorInfo(id=f"p{i}", rating=4.0) for i in reversed(range(10))]
+        profs.append(ProfessorInfo(id="best", rating=5.0))
+        catalog = ProfessorCatalog(profs)
+
+        assert [p.id for p in catalog.query(limit=3)] == ["best", "p0", "p1"]
+
+    def test_keyset_pages_cover_catalog_once(self):
+        """Walking pages with after= should return every match exactly once, in order."""
+        rng = random.Random(7)
+        profs = [
+            ProfessorInfo(id=f"p{i:03d}", rating=rng.choice([3.0, 4.0, 4.5, 5.0]))
+            for i in range(120)
+        ]
+        catalog = ProfessorCatalog(profs)
+
+        seen, after = [], None
+        while page := catalog.query(limit=7, after=after):
+            seen.extend(p.id for p in page)
+            after = (page[-1].rating, page[-1].id)
+        assert seen == [p.id for p in _reference_query(profs, limit=len(profs))]
+
+    def test_incremental_upsert_and_remove(self, catalog):
+        """Upserts should update in place or append; removals should hide rows."""
+        many_subjects = [f"Topic {i}" for i in range(70)]  # forces a second bitset word
+        catalog.upsert([
+            ProfessorInfo(id="prof-2", subjects=["Mathematics"], rating=5.0),
+            ProfessorInfo(id="prof-3", subjects=many_subjects, rating=4.0),
+        ])
+
+        assert [p.id for p in catalog.query(subject="Mathematics")] == ["prof-2"]
+        assert [p.id for p in catalog.query(subject="Topic 69")] == ["prof-3"]
+        assert catalog.query(subject="Calculus") == []
+
+        assert catalog.remove(["prof-1", "missing"]) == 1
+        assert [p.id for p in catalog.query()] == ["prof-2", "prof-3"]
+        assert len(catalog) == 2
+
+    def test_matches_reference_on_random_catalog(self):
+        """Vectorized results should equal the reference implementation."""
+        rng = random.Random(7)
+        subjects = ["Math", "Physics", "Python", "Biology", "Chemistry"]
+        languages = ["English", "Spanish", "French"]
+        profs = [
+            ProfessorInfo(
+                id=f"p{i}",
+                subjects=rng.sample(subjects, rng.randint(1, 3)),
+                languages=rng.sample(languages, rng.randint(1, 2)),
+                rating=round(rng.uniform(3, 5), 1),
+                hourly_rate=str(rng.randint(20, 120)),
+            )
+            for i in range(500)
+        ]
+        catalog = ProfessorCatalog(profs)
+
+        for subject, language, min_rating, max_rate, limit in [
+            ("Math", "", 0.0, None, 10),
+            ("python", "spanish", 4.0, None, 50),
+            ("", "French", 0.0, 60.0, 5),
+            ("Biology", "English", 4.5, 100.0, 20),
+        ]:
+            expected = _reference_query(profs, subject, language, min_rating, max_rate, limit)
+            actual = catalog.query(subject, language, min_rating, max_rate, limit)
+            assert [p.id for p in actual] == [p.id for p in expected]
+
+
+class TestSearchWithLocalCatalog:
+    """search_professors backed by the local catalog."""
+
+    @pytest.fixture(autouse=True)
+    def local_catalog(self):
+        from learnai_mcp import server
+
+        with patch.object(server, "LEARNAI_LOCAL_CATALOG", True), \
+                patch.object(server, "_catalog_loaded_at", None):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_search_served_locally_after_first_load(
+        self, mock_http_client, mock_professors
+    ):
+        """Only the initial catalog load should reach the upstream."""
+        from learnai_mcp.server import search_professors
+
+        fn = search_professors.fn
+        mock_http_client.request.return_value = make_response(json={"teachers": mock_professors})
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            first = await fn(subject="Mathematics")
+            second = await fn(language="Spanish", min_rating=4.8)
+
+        assert mock_http_client.request.await_count == 1
+        assert mock_api.await_count == 0
+        assert [p.id for p in first.professors] == ["prof-2"]
+        assert [p.id for p in second.professors] == ["prof-1"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_upstream_when_load_fails(
+        self, mock_http_client, mock_professors
+    ):
+        """A failed catalog load should fall back to the upstream search."""
+        from learnai_mcp.server import search_professors
+
+        fn = search_professors.fn
+        mock_http_client.request.side_effect = httpx.ConnectTimeout("timeout")
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = {"teachers": mock_professors}
+            result = await fn(subject="Python")
+
+        assert result.total == 2
@@ -0,0 +1,167 @@
+"""
+MCP Catalog Sync Tests
+=======================
+Validates conditional requests, delta cursors and applying changed rows
+to the local catalog.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from conftest import make_response
+
+from learnai_mcp.sync import CatalogSync
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.get = AsyncMock()
+    return client
+
+
+@pytest.fixture
+def sync(client):
+    apply = AsyncMock()
+    return CatalogSync(client.get, apply, params={"limit": 100})
+
+
+class TestCatalogSync:
+    """Unit tests for CatalogSync."""
+
+    @pytest.mark.asyncio
+    async def test_first_sync_is_full(self, sync, client, mock_professors):
+        """Without a cursor the response replaces the whole catalog."""
+        client.get.return_value = make_response(
+            json={"teachers": mock_professors, "cursor": "c1"}, headers={"ETag": '"v1"'}
+        )
+
+        assert await sync.sync_once() == "full"
+        sync._apply.assert_awaited_once_with(mock_professors, True)
+        assert sync.cursor == "c1"
+        assert sync.etag == '"v1"'
+        assert "updatedSince" not in client.get.call_args.kwargs["params"]
+
+    @pytest.mark.asyncio
+    async def test_followup_sync_is_conditional_delta(self, sync, client):
+        """Later syncs send validators and the delta cursor."""
+        sync.cursor = "c1"
+        sync.etag = '"v1"'
+        sync.last_modified = "Tue, 01 Sep 2026 00:00:00 GMT"
+        client.get.return_value = make_response(
+            json={"teachers": [{"id": "prof-1", "rating": 4.2}], "cursor": "c2"}
+        )
+
+        assert await sync.sync_once() == "delta"
+        kwargs = client.get.call_args.kwargs
+        assert kwargs["params"] == {"limit": 100, "updatedSince": "c1"}
+        assert kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert kwargs["headers"]["If-Modified-Since"] == "Tue, 01 Sep 2026 00:00:00 GMT"
+        assert sync.cursor == "c2"
+
+    @pytest.mark.asyncio
+    async def test_not_modified_applies_nothing(self, sync, client):
+        """A 304 should count as a successful sync without applying rows."""
+        sync.etag = '"v1"'
+        client.get.return_value = make_response(status_code=304)
+
+        assert await sync.sync_once() == "not_modified"
+        sync._apply.assert_not_awaited()
+        assert sync.lag_seconds is not None
+        assert sync.stats()["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_upstream_without_cursor_falls_back_to_full(self, sync, client):
+        """An upstream that ignores updatedSince should be treated as full."""
+        sync.cursor = "c1"
+        client.get.return_value = make_response(json={"teachers": []})
+
+        assert await sync.sync_once() == "full"
+        assert sync.cursor is None
+
+    @pytest.mark.asyncio
+    async def test_overlapping_rounds_run_in_order(self, sync, client, mock_professors):
+        """A round started during a slow one should wait and continue from its cursor."""
+        release = asyncio.Event()
+        responses = [
+            make_response(json={"teachers": mock_professors, "cursor": "c1"}),
+            make_response(json={"teachers": [], "cursor": "c2"}),
+        ]
+
+        async def get(path, params, headers):
+            response = responses.pop(0)
+            if not responses:
+                return response
+            await release.wait()
+            return response
+
+        client.get.side_effect = get
+        slow = asyncio.ensure_future(sync.sync_once())
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(sync.sync_once())
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(slow, second) == ["full", "delta"]
+        assert client.get.call_args_list[1].kwargs["params"]["updatedSince"] == "c1"
+        assert sync.cursor == "c2"
+
+
+class TestApplyCatalogRows:
+    """Applying upstream rows to the server's catalog."""
+
+    @pytest.mark.asyncio
+    async def test_delta_updates_and_deactivates(self, mock_professors):
+        """Delta rows should patch changed fields and drop inactive professors."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+        await server._apply_catalog_rows(
+            [
+                {"id": "prof-1", "rating": 3.1, "hourlyRate": 40},
+                {"id": "prof-2", "isActive": False},
+                {"id": "prof-3", "name": "Dr. New", "subjects": ["Physics"], "rating": 4.0},
+            ],
+            full=False,
+        )
+
+        prof = server._catalog.get("prof-1")
+        assert prof.rating == 3.1
+        assert prof.hourly_rate == "40"
+        assert prof.name == "Dr. Alice Smith"
+        assert "prof-2" not in server._catalog
+        assert [p.id for p in server._catalog.query(subject="Physics")] == ["prof-3"]
+
+
+class TestServerCatalogSync:
+    """The server's sync rounds share the upstream breaker, bulkhead and limiter."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_catalog_load_fast(self, mock_http_client):
+        """With the /api/explore circuit open, loading the catalog should not reach the upstream."""
+        from learnai_mcp import server
+        from learnai_mcp.resilience import OPEN, CircuitOpen
+
+        breaker = server._resilience.breaker("GET /api/explore")
+        breaker._state, breaker._opened_at = OPEN, breaker._clock()
+
+        with pytest.raises(CircuitOpen):
+            await server._load_catalog()
+        mock_http_client.request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_sync_goes_through_catalog_bulkhead(self, mock_http_client, mock_professors):
+        """Sync rounds should take a catalog bulkhead slot and keep 304s."""
+        from learnai_mcp import server
+
+        mock_http_client.request.return_value = make_response(json={"teachers": mock_professors})
+        with patch.object(
+            server._bulkheads["catalog"], "acquire", wraps=server._bulkheads["catalog"].acquire
+        ) as acquire:
+            assert await server._catalog_sync.sync_once() == "full"
+            mock_http_client.request.return_value = make_response(status_code=304)
+            assert await server._catalog_sync.sync_once() == "not_modified"
+
+        assert acquire.call_count == 2
+        assert len(server._catalog) == 2
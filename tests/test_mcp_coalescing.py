@@ -0,0 +1,145 @@
+"""
+MCP Request Coalescing Tests
+=============================
+Validates single-flight sharing of identical in-flight upstream calls,
+per-waiter cancellation and the _api_request integration.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from learnai_mcp.coalesce import SingleFlight
+
+
+class TestSingleFlight:
+    """Unit tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        """Concurrent callers with the same key should run the function once."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"ok": True}
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"ok": True} for r in results)
+        assert flights.stats()["coalesced"] == 4
+        assert flights.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_all_waiters(self):
+        """A failing shared call should raise in every waiter."""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            flights.do("k", work), flights.do("k", work), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_others(self):
+        """Cancelling one waiter should leave the shared call running for the rest."""
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(flights.do("k", work))
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == 42
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancellation_cancels_call(self):
+        """When every waiter is gone the shared call should be cancelled."""
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flights.do("k", work))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        assert flights.in_flight == 0
+        assert flights.stats()["abandoned"] == 1
+
+
+class TestApiRequestCoalescing:
+    """Integration of coalescing with _api_request."""
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_are_coalesced(self):
+        """Identical GETs with reordered params should share one upstream request."""
+        from learnai_mcp import server
+
+        calls = 0
+
+        async def fake_send(method, path, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"teachers": []}
+
+        with patch("learnai_mcp.server._send_request", side_effect=fake_send):
+            await asyncio.gather(
+                server._api_request("GET", "/api/explore", params={"a": 1, "b": 2}),
+                server._api_request("GET", "/api/explore", params={"b": 2, "a": 1}),
+            )
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_coalesced(self):
+        """POSTs should not be coalesced unless explicitly requested."""
+        from learnai_mcp import server
+
+        calls = 0
+
+        async def fake_send(method, path, **kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"bookingId": "b1"}
+
+        body = {"teacherId": "prof-1"}
+        with patch("learnai_mcp.server._send_request", side_effect=fake_send):
+            await asyncio.gather(
+                server._api_request("POST", "/api/bookings", json=body),
+                server._api_request("POST", "/api/bookings", json=body),
+            )
+            assert calls == 2
+
+            await asyncio.gather(
+                server._api_request("POST", "/api/ai/recommend-professors", json=body, coalesce=True),
+                server._api_request("POST", "/api/ai/recommend-professors", json=body, coalesce=True),
+            )
+            assert calls == 3
@@ -0,0 +1,54 @@
+"""
+MCP JSON Codec Tests
+=====================
+Validates the orjson/TypeAdapter decoding path for upstream professor lists
+and the direct encoding of A2A JSON-RPC responses.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from conftest import make_response
+
+from learnai_mcp.codec import JsonCodec, loads
+
+
+class TestJsonCodec:
+    """Unit tests for JsonCodec."""
+
+    def test_list_validation_matches_per_item_models(self, mock_professors):
+        """Batch validation should build the same models as per-item construction."""
+        from learnai_mcp.server import ProfessorInfo, _professors
+
+        assert _professors.validate(mock_professors) == [
+            ProfessorInfo(**p) for p in mock_professors
+        ]
+
+    def test_encode_round_trip(self):
+        """encode should produce JSON bytes equal to the model's own dump."""
+        from learnai_mcp.a2a.agent import JSONRPCResponse
+
+        codec = JsonCodec(JSONRPCResponse)
+        rpc = JSONRPCResponse(result={"teachers": [{"id": "p1"}]}, id="r1")
+        assert loads(codec.encode(rpc)) == rpc.model_dump()
+
+
+class TestFastDecodingPath:
+    """Tools decode upstream payloads through the codec."""
+
+    @pytest.mark.asyncio
+    async def test_search_uses_batch_validation(self, mock_http_client, mock_professors):
+        """search_professors results should be built by one batch validation."""
+        from learnai_mcp import server
+
+        mock_http_client.request = AsyncMock(
+            return_value=make_response(json={"teachers": mock_professors})
+        )
+        with (
+            patch.object(server, "_professors", wraps=server._professors) as codec,
+            patch.object(server, "_get_catalog", side_effect=RuntimeError("no catalog")),
+        ):
+            result = await server.search_professors.fn(subject="Mathematics")
+
+        codec.validate.assert_called_once()
+        assert [p.id for p in result.professors] == [p["id"] for p in mock_professors]
@@ -0,0 +1,160 @@
+"""
+MCP Deadline Propagation Tests
+===============================
+Validates request deadlines: scoping, cancellation of upstream calls that
+outlive their budget, caller-supplied ``_meta.timeoutMs`` and retry cut-off.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastmcp import Client
+
+from learnai_mcp import deadline
+from learnai_mcp.resilience import Resilience, RetryPolicy
+
+
+async def _never_answers(method, path, **kwargs):
+    await asyncio.sleep(10)
+
+
+class TestDeadlineScope:
+    """Unit tests for deadline.scope / deadline.enforce."""
+
+    @pytest.mark.asyncio
+    async def test_nested_scopes_only_tighten(self):
+        """An inner scope can shorten the deadline but never extend it."""
+        assert deadline.remaining() is None
+        with deadline.scope(1.0):
+            with deadline.scope(5.0):
+                assert deadline.remaining() <= 1.0
+            with deadline.scope(0.5):
+                assert deadline.remaining() <= 0.5
+        assert deadline.remaining() is None
+
+    @pytest.mark.asyncio
+    async def test_enforce_cancels_work(self):
+        """Work still running at the deadline should be cancelled."""
+        cancelled = False
+
+        async def slow():
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        with deadline.scope(0.01), pytest.raises(deadline.DeadlineExceeded):
+            async with deadline.enforce():
+                await slow()
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_unrelated_timeouts_pass_through(self):
+        """A TimeoutError raised by the work itself is not a deadline miss."""
+        with deadline.scope(10), pytest.raises(TimeoutError) as exc:
+            async with deadline.enforce():
+                raise TimeoutError("inner")
+        assert not isinstance(exc.value, deadline.DeadlineExceeded)
+
+    def test_tightest_and_parsing(self):
+        """Budgets combine to the smallest positive value; bad timeouts are ignored."""
+        assert deadline.tightest(25, None, 0.5) == 0.5
+        assert deadline.tightest(0, None) is None
+        assert deadline.parse_timeout_ms("1500") == 1.5
+        assert deadline.parse_timeout_ms("soon") is None
+        assert deadline.parse_budgets("a=1, b=2.5,") == {"a": 1.0, "b": 2.5}
+
+
+class TestUpstreamCancellation:
+    """Deadlines and cancellation applied to upstream calls."""
+
+    @pytest.mark.asyncio
+    async def test_expired_call_frees_its_slots(self, mock_http_client):
+        """A call past its deadline should be cut off and release limiter slots."""
+        from learnai_mcp import server
+
+        mock_http_client.request = _never_answers
+        with deadline.scope(0.02), pytest.raises(deadline.DeadlineExceeded):
+            await server._api_request("GET", "/api/bookings/b1", pool="booking")
+
+        await asyncio.sleep(0.01)  # the shared coalesced call is cancelled, not awaited
+        assert server._limiter.in_flight == 0
+        assert server._bulkheads["booking"].in_flight == 0
+        assert (await server.server_metrics.fn())["deadlines"]["exceeded"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_call_is_cancelled(self, mock_http_client):
+        """Cancelling the caller should cancel its in-flight upstream request."""
+        from learnai_mcp import server
+
+        mock_http_client.request = _never_answers
+        task = asyncio.create_task(server._api_request("GET", "/api/bookings/b1", pool="booking"))
+        await asyncio.sleep(0.01)
+        assert server._bulkheads["booking"].in_flight == 1
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.01)
+        assert server._bulkheads["booking"].in_flight == 0
+        assert server._inflight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_caller_timeout_from_meta(self, mock_http_client):
+        """_meta.timeoutMs should cut the tool's upstream call short."""
+        from learnai_mcp import server
+
+        mock_http_client.request = _never_answers
+        async with Client(server.mcp) as client:
+            result = await asyncio.wait_for(
+                client.call_tool(
+                    "get_booking_status", {"booking_id": "b1"}, meta={"timeoutMs": 50}
+                ),
+                2,
+            )
+
+        assert result.data.status == "error"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "tool, args",
+        [
+            ("keyword_search_professors", {"query": "calculus"}),
+            ("search_professors", {"subject": "Mathematics"}),
+        ],
+    )
+    async def test_first_catalog_load_respects_caller_timeout(self, mock_http_client, tool, args):
+        """A slow first catalog download should not hold a tool past _meta.timeoutMs."""
+        from learnai_mcp import server
+
+        mock_http_client.request = _never_answers
+        loop = asyncio.get_running_loop()
+        async with Client(server.mcp) as client:
+            started = loop.time()
+            result = await asyncio.wait_for(
+                client.call_tool(tool, args, meta={"timeoutMs": 100}), 2
+            )
+            elapsed = loop.time() - started
+
+        assert elapsed < 0.5
+        assert result.data.professors == []
+        assert server._catalog_flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_no_retry_past_deadline(self):
+        """A retry whose backoff would end after the deadline should not start."""
+        resilience = Resilience(retry=RetryPolicy(attempts=3, base=1.0, cap=1.0))
+        calls = 0
+
+        async def down():
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("down")
+
+        with deadline.scope(0.5), pytest.raises(httpx.ConnectError):
+            await resilience.call("GET /x", down, idempotent=True)
+        assert calls == 1
+        assert resilience.stats()["retries_exhausted"] == 1
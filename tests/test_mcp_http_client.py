@@ -0,0 +1,161 @@
+"""
+MCP Shared HTTP Client Tests
+=============================
+Validates the pooled API client: connection reuse, pool limits, HTTP/2
+fallback, start-up pre-warming and lifespan-managed shutdown.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from learnai_mcp.client import ApiClient, parse_api_url
+
+
+def _counting_transport(paths, status_code=200):
+    def handler(request):
+        paths.append(request.url.path)
+        return httpx.Response(status_code, json={"status": "ok"})
+
+    return httpx.MockTransport(handler)
+
+
+class TestApiClient:
+    """Unit tests for ApiClient."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self):
+        """Every caller should share one client; aclose should drop it."""
+        api = ApiClient("http://api.test", max_connections=7, max_keepalive=3)
+        first = await api.get()
+        assert await api.get() is first
+        assert api.limits.max_connections == 7
+        assert api.stats()["open"]
+
+        await api.aclose()
+        assert first.is_closed
+        assert not api.stats()["open"]
+        assert await api.get() is not first
+        assert api.stats()["clients_created"] == 2
+        await api.aclose()
+
+    def test_http2_falls_back_without_h2(self):
+        """Requesting HTTP/2 without the h2 package should fall back to HTTP/1.1."""
+        with patch("learnai_mcp.client.http2_available", return_value=False):
+            assert ApiClient("http://api.test", http2=True).http2 is False
+
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections(self):
+        """start() should issue one warm-up request per pre-warmed connection."""
+        paths = []
+        api = ApiClient(
+            "http://api.test", prewarm=3, prewarm_path="/api/health",
+            transport=_counting_transport(paths),
+        )
+        await api.start()
+        assert paths == ["/api/health"] * 3
+        assert api.stats()["prewarmed"] == 3
+        await api.aclose()
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failures_are_not_fatal(self):
+        """An unreachable upstream at start-up should only be logged."""
+        def refuse(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        api = ApiClient("http://api.test", prewarm=2, transport=httpx.MockTransport(refuse))
+        await api.start()
+        assert api.stats()["prewarmed"] == 0
+        await api.aclose()
+
+
+class TestUnixSocket:
+    """unix:// API URLs for a co-located backend."""
+
+    def test_parse_api_url(self):
+        """unix:// URLs should split into an HTTP base URL and a socket path."""
+        assert parse_api_url("unix:///run/learnai/api.sock") == (
+            "http://localhost", "/run/learnai/api.sock"
+        )
+        assert parse_api_url("http://localhost:3000") == ("http://localhost:3000", None)
+        with pytest.raises(ValueError):
+            parse_api_url("unix://")
+
+    @pytest.mark.asyncio
+    async def test_requests_go_over_the_socket(self, tmp_path):
+        """Paths and auth headers should reach a backend listening on a Unix socket."""
+        seen = []
+
+        async def serve(reader, writer):
+            head = await reader.readuntil(b"\r\n\r\n")
+            seen.append(head.decode())
+            body = b'{"status": "confirmed"}'
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+            await writer.drain()
+            writer.close()
+
+        sock = str(tmp_path / "api.sock")
+        server = await asyncio.start_unix_server(serve, path=sock)
+        api = ApiClient(f"unix://{sock}", headers={"Authorization": "Bearer k"})
+        try:
+            client = await api.get()
+            response = await client.get("/api/bookings/b1")
+            assert response.json() == {"status": "confirmed"}
+            await api.aclose()
+            # A new client after shutdown gets a new socket transport.
+            response = await (await api.get()).get("/api/bookings/b2")
+            assert response.status_code == 200
+        finally:
+            await api.aclose()
+            server.close()
+            await server.wait_closed()
+
+        assert seen[0].startswith("GET /api/bookings/b1 HTTP/1.1")
+        assert "authorization: bearer k" in seen[0].lower()
+        assert api.stats()["uds"] == sock
+
+
+class TestLifespan:
+    """The shared client follows the server and agent lifespans."""
+
+    @pytest.mark.asyncio
+    async def test_mcp_server_closes_pool_on_shutdown(self):
+        """The MCP server should open the pool at startup and close it at shutdown."""
+        from learnai_mcp import server
+
+        async with server._lifespan(server.mcp):
+            assert server._api.stats()["open"]
+            client = await server._get_client()
+        assert client.is_closed
+        assert not server._api.stats()["open"]
+
+    def test_a2a_agent_reuses_one_client(self):
+        """A2A requests should share the agent's pooled client across calls."""
+        from fastapi.testclient import TestClient
+
+        from learnai_mcp.a2a import agent
+
+        paths = []
+        created = agent._api.stats()["clients_created"]
+        with (
+            patch.object(agent._api, "transport", _counting_transport(paths)),
+            TestClient(agent.app) as client,
+        ):
+            for i in range(3):
+                client.post(
+                    "/a2a",
+                    json={
+                        "jsonrpc": "2.0",
+                        "method": "match_tutor",
+                        "params": {"query": "calculus"},
+                        "id": i,
+                    },
+                )
+            assert client.get("/metrics").json()["http_client"]["clients_created"] == created + 1
+        assert paths == ["/api/ai/recommend-professors"] * 3
+        assert not agent._api.stats()["open"]
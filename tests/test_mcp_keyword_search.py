@@ -0,0 +1,81 @@
+"""
+MCP Keyword Search Tests
+=========================
+Validates tokenization, BM25 ranking, filters and incremental updates of
+the keyword index, plus the keyword_search_professors tool.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from learnai_mcp.keyword_index import KeywordIndex
+from learnai_mcp.server import ProfessorInfo
+from learnai_mcp.text import tokenize
+
+
+@pytest.fixture
+def index(mock_professors):
+    index = KeywordIndex()
+    index.rebuild(ProfessorInfo(**p) for p in mock_professors)
+    return index
+
+
+class TestTokenize:
+    def test_normalizes_and_drops_stopwords(self):
+        """Tokens should be case-folded, accent-free and stopword-free."""
+        assert tokenize("Álgebra Lineal for the C++ developer") == [
+            "algebra", "lineal", "c++", "developer",
+        ]
+
+
+class TestKeywordIndex:
+    """Unit tests for KeywordIndex."""
+
+    def test_ranks_subject_matches_first(self, index):
+        """The professor whose subjects match should rank first."""
+        hits = index.search("linear algebra")
+        assert [doc_id for doc_id, _ in hits] == ["prof-2"]
+
+    def test_multi_term_query_scores_all_matches(self, index):
+        """Documents matching any query term should be returned, best first."""
+        hits = index.search("machine learning calculus")
+        assert [doc_id for doc_id, _ in hits] == ["prof-1", "prof-2"]
+        assert hits[0][1] > hits[1][1]
+
+    def test_language_and_rating_filters(self, index):
+        """Filters should exclude professors before scoring."""
+        assert [d for d, _ in index.search("learning calculus", language="spanish")] == [
+            "prof-1"
+        ]
+        assert index.search("calculus", min_rating=4.8) == []
+        assert index.search("calculus", language="Klingon") == []
+
+    def test_incremental_updates(self, index):
+        """Upserts and removals should be reflected immediately."""
+        index.upsert([ProfessorInfo(id="prof-2", subjects=["Organic Chemistry"])])
+        assert index.search("calculus") == []
+        assert [d for d, _ in index.search("chemistry")] == ["prof-2"]
+
+        index.remove(["prof-2"])
+        assert index.search("chemistry") == []
+        assert len(index) == 1
+
+
+class TestKeywordSearchTool:
+    """The keyword_search_professors MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_tool_returns_catalog_professors(self, mock_professors):
+        """The tool should resolve index hits to full professor records."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+        with patch.object(server, "_catalog_loaded_at", 0.0), \
+                patch("learnai_mcp.server._schedule_catalog_refresh"):
+            result = await server.keyword_search_professors.fn(
+                query="deep learning in python", language="English"
+            )
+
+        assert [p.id for p in result.professors] == ["prof-1"]
+        assert result.professors[0].name == "Dr. Alice Smith"
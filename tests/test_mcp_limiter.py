@@ -0,0 +1,316 @@
+"""
+MCP Adaptive Limiter Tests
+===========================
+Validates the AIMD concurrency limiter: admission and FIFO queuing, growth
+under healthy load, backoff on latency and overload errors, cancellation,
+weighted fair lanes, per-pool bulkheads and their use for upstream requests.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from conftest import FakeClock, make_response
+
+from learnai_mcp.limiter import AdaptiveLimiter, Bulkhead, is_upstream_overload, parse_pools
+
+
+async def _call(limiter, clock, rtt, exc=None, key=None):
+    async with limiter.acquire(key=key):
+        clock.now += rtt
+        if exc is not None:
+            raise exc
+
+
+class TestAdaptiveLimiter:
+    """Unit tests for AdaptiveLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit_in_fifo_order(self):
+        """Calls over the limit should wait and be admitted in arrival order."""
+        limiter = AdaptiveLimiter(initial_limit=1, min_limit=1)
+        release = asyncio.Event()
+        order = []
+
+        async def worker(name):
+            async with limiter.acquire():
+                order.append(name)
+                await release.wait()
+
+        tasks = [asyncio.create_task(worker(n)) for n in "abc"]
+        await asyncio.sleep(0)
+        assert (limiter.in_flight, limiter.queued) == (1, 2)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert limiter.stats()["delayed"] == 2
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_grows_while_healthy_and_busy(self):
+        """Steady latency at full utilization should raise the limit."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=5, clock=clock)
+
+        async def busy_round():
+            # Fill every slot, then let one round trip elapse for all of them.
+            done = asyncio.Event()
+
+            async def call():
+                async with limiter.acquire():
+                    await done.wait()
+
+            tasks = [asyncio.create_task(call()) for _ in range(limiter.limit)]
+            await asyncio.sleep(0)
+            clock.now += 0.01
+            done.set()
+            await asyncio.gather(*tasks)
+
+        for _ in range(30):
+            await busy_round()
+        assert limiter.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_does_not_grow_when_idle(self):
+        """A mostly unused limit should not keep growing."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=10, clock=clock)
+        for _ in range(100):
+            await _call(limiter, clock, 0.01)
+        assert limiter.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_backs_off_on_rising_latency(self):
+        """Latency well above the baseline should shrink the limit."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=20, min_limit=2, clock=clock)
+        await _call(limiter, clock, 0.01)
+        for _ in range(30):
+            await _call(limiter, clock, 0.2)
+        assert limiter.limit < 20
+        assert limiter.stats()["decreases"] > 0
+
+    @pytest.mark.asyncio
+    async def test_mixed_endpoint_latencies_are_not_congestion(self):
+        """Slow LLM calls mixed with fast reads should not shrink the limit of a healthy upstream."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=10, clock=clock)
+        for i in range(300):
+            if i % 4 == 0:
+                await _call(limiter, clock, 1.0, key="POST /api/ai/recommend-professors")
+            else:
+                await _call(limiter, clock, 0.005, key="GET /api/explore")
+
+        assert limiter.stats()["decreases"] == 0
+        assert limiter.limit == 10
+
+        # Each class still detects its own slowdown.
+        for _ in range(30):
+            await _call(limiter, clock, 0.05, key="GET /api/explore")
+        assert limiter.limit < 10
+
+    @pytest.mark.asyncio
+    async def test_backs_off_on_overload_errors_only(self):
+        """5xx/timeouts should count as overload; 4xx should not."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=10, clock=clock)
+        not_found = httpx.HTTPStatusError("nf", request=None, response=make_response(404))
+        with pytest.raises(httpx.HTTPStatusError):
+            await _call(limiter, clock, 0.01, not_found)
+        assert limiter.limit == 10
+
+        with pytest.raises(httpx.ReadTimeout):
+            await _call(limiter, clock, 0.01, httpx.ReadTimeout("slow"))
+        assert limiter.limit == 9
+        assert limiter.stats()["overloads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_decreases_at_most_once_per_rtt(self):
+        """A burst of failures within one round trip should back off once."""
+        clock = FakeClock()
+        limiter = AdaptiveLimiter(initial_limit=10, clock=clock)
+        failing = asyncio.Event()
+
+        async def call():
+            async with limiter.acquire():
+                await failing.wait()
+                raise httpx.ConnectError("refused")
+
+        tasks = [asyncio.create_task(call()) for _ in range(5)]
+        await asyncio.sleep(0)
+        clock.now += 0.05
+        failing.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, httpx.ConnectError) for r in results)
+        assert limiter.stats()["decreases"] == 1
+        assert limiter.stats()["overloads"] == 5
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Cancelling a queued call should not leak a slot."""
+        limiter = AdaptiveLimiter(initial_limit=1, min_limit=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.acquire():
+                await release.wait()
+
+        async def waiter():
+            async with limiter.acquire():
+                pass
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+        release.set()
+        await held
+        assert (limiter.in_flight, limiter.queued) == (0, 0)
+        await asyncio.wait_for(waiter(), 1)
+
+
+class TestPriorityAndBulkheads:
+    """Weighted fair lanes in the shared limiter and per-pool bulkheads."""
+
+    @pytest.mark.asyncio
+    async def test_heavier_lane_is_admitted_first(self):
+        """A late booking should overtake a backlog of recommendations."""
+        limiter = AdaptiveLimiter(
+            initial_limit=1, min_limit=1, weights={"booking": 4, "recommend": 1}
+        )
+        release = asyncio.Event()
+        order = []
+
+        async def call(lane, name):
+            async with limiter.acquire(lane=lane):
+                order.append(name)
+                await release.wait()
+
+        holder = asyncio.create_task(call("recommend", "r0"))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call("recommend", f"r{i}")) for i in range(1, 4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(call("booking", f"b{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued_by_lane"] == {"recommend": 3, "booking": 3}
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        # The backlog head goes first (it queued alone), then bookings win 4:1.
+        assert order == ["r0", "r1", "b0", "b1", "b2", "r2", "r3"]
+
+    @pytest.mark.asyncio
+    async def test_light_lane_is_not_starved(self):
+        """A continuously busy heavy lane should still let the light lane through."""
+        limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, weights={"a": 3, "b": 1})
+        release = asyncio.Event()
+        order = []
+
+        async def call(lane):
+            async with limiter.acquire(lane=lane):
+                order.append(lane)
+                await release.wait()
+
+        holder = asyncio.create_task(call("a"))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(call(lane)) for lane in ["a"] * 8 + ["b"] * 2]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        assert order[1:] == ["a", "b", "a", "a", "a", "b", "a", "a", "a", "a"]
+
+    @pytest.mark.asyncio
+    async def test_bulkhead_caps_its_pool(self):
+        """A bulkhead should cap its own pool and report the queue length."""
+        bulkhead = Bulkhead("recommend", 2)
+        release = asyncio.Event()
+
+        async def call():
+            async with bulkhead.acquire():
+                await release.wait()
+
+        tasks = [asyncio.create_task(call()) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert (bulkhead.in_flight, bulkhead.queued) == (2, 3)
+        assert bulkhead.stats()["delayed"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert (bulkhead.in_flight, bulkhead.queued) == (0, 0)
+
+    def test_parse_pools(self):
+        """Pool specs should parse sizes and optional weights."""
+        assert parse_pools("booking=20:4, recommend=3,") == {
+            "booking": (20, 4.0),
+            "recommend": (3, 1.0),
+        }
+
+    @pytest.mark.asyncio
+    async def test_slow_recommendations_do_not_block_bookings(self, mock_http_client):
+        """Saturating the recommend pool should leave booking calls unaffected."""
+        from learnai_mcp import server
+
+        release = asyncio.Event()
+
+        async def request(method, path, **kwargs):
+            if path == "/api/ai/recommend-professors":
+                await release.wait()
+            return make_response(json={"status": "confirmed"})
+
+        mock_http_client.request = request
+        size = server._bulkheads["recommend"].max_concurrent
+        slow = [
+            asyncio.create_task(
+                server._api_request("POST", "/api/ai/recommend-professors",
+                                    json={"query": str(i)}, pool="recommend")
+            )
+            for i in range(size + 2)
+        ]
+        await asyncio.sleep(0)
+        assert server._bulkheads["recommend"].queued == 2
+
+        status = await asyncio.wait_for(
+            server.get_booking_status.fn(booking_id="b1"), 1
+        )
+        assert status.status == "confirmed"
+
+        metrics = await server.server_metrics.fn()
+        assert metrics["bulkheads"]["recommend"]["queued"] == 2
+        release.set()
+        await asyncio.gather(*slow)
+
+
+def test_overload_classification():
+    """Only server errors, throttling and transport failures signal overload."""
+    def status_error(code):
+        return httpx.HTTPStatusError("x", request=None, response=make_response(code))
+
+    assert is_upstream_overload(status_error(503))
+    assert is_upstream_overload(status_error(429))
+    assert not is_upstream_overload(status_error(400))
+    assert is_upstream_overload(httpx.ConnectTimeout("t"))
+    assert not is_upstream_overload(ValueError())
+
+
+@pytest.mark.asyncio
+async def test_upstream_requests_go_through_limiter(mock_http_client):
+    """_send_request should be admitted by the limiter and exported in metrics."""
+    from learnai_mcp import server
+
+    async def request(method, path, **kwargs):
+        assert server._limiter.in_flight == 1
+        return make_response(json={"ok": True})
+
+    mock_http_client.request = request
+    before = server._limiter.stats()["acquired"]
+    assert await server._send_request("GET", "/api/explore") == {"ok": True}
+
+    metrics = await server.server_metrics.fn()
+    assert metrics["upstream_concurrency"]["acquired"] == before + 1
+    assert metrics["upstream_concurrency"]["limit"] >= server.LEARNAI_CONCURRENCY_MIN
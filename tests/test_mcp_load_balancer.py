@@ -0,0 +1,232 @@
+"""
+MCP Client-Side Load Balancing Tests
+=====================================
+Validates balancing across API replicas: least-outstanding and
+power-of-two-choices selection, GET affinity, outlier ejection, active
+health checks and routing through the shared API client.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from conftest import FakeClock
+
+from learnai_mcp.balancer import BalancedTransport, LoadBalancer, tried_replicas
+from learnai_mcp.client import ApiClient
+
+REPLICAS = ["http://api-1.test", "http://api-2.test", "http://api-3.test"]
+
+
+def _replica_transports(seen, status=None):
+    """MockTransport per replica, recording which replica served each request."""
+
+    def make(replica):
+        def handler(request):
+            seen.append((replica.name, request.url.host, request.url.path))
+            code = (status or {}).get(replica.name, 200)
+            return httpx.Response(code, json={"replica": replica.name})
+
+        return httpx.MockTransport(handler)
+
+    return make
+
+
+class TestLoadBalancer:
+    """Unit tests for replica selection and ejection."""
+
+    def test_least_outstanding_picks_idle_replica(self):
+        """The 'least' strategy should pick the replica with fewest requests in flight."""
+        balancer = LoadBalancer(REPLICAS, strategy="least")
+        balancer.replicas[0].outstanding = 3
+        balancer.replicas[1].outstanding = 1
+        balancer.replicas[2].outstanding = 2
+        assert balancer.pick().name == "http://api-2.test"
+
+    def test_p2c_never_picks_the_busiest(self):
+        """Power of two choices should always avoid the single most loaded replica."""
+        balancer = LoadBalancer(REPLICAS, strategy="p2c")
+        balancer.replicas[0].outstanding = 50
+        picks = {balancer.pick().name for _ in range(200)}
+        assert "http://api-1.test" not in picks
+        assert picks == {"http://api-2.test", "http://api-3.test"}
+
+    def test_affinity_is_stable_and_spread(self):
+        """The same key should map to one replica; different keys should spread out."""
+        balancer = LoadBalancer(REPLICAS)
+        assert len({balancer.pick("GET /api/explore?q=math").name for _ in range(20)}) == 1
+        owners = {balancer.pick(f"GET /api/explore?q={i}").name for i in range(100)}
+        assert owners == set(REPLICAS)
+
+    def test_affinity_moves_only_keys_of_removed_replica(self):
+        """Dropping a replica should only move keys it owned (rendezvous hashing)."""
+        full = LoadBalancer(REPLICAS)
+        reduced = LoadBalancer(REPLICAS[:2])
+        for i in range(100):
+            key = f"GET /api/explore?q={i}"
+            owner = full.pick(key).name
+            if owner != REPLICAS[2]:
+                assert reduced.pick(key).name == owner
+
+    def test_outlier_ejection_and_return(self):
+        """Consecutive failures should eject a replica until its ejection time passes."""
+        clock = FakeClock()
+        balancer = LoadBalancer(REPLICAS, eject_after=3, ejection_time=10, clock=clock)
+        bad = balancer.replicas[0]
+        for _ in range(3):
+            balancer.on_failure(bad)
+        assert bad not in balancer.available()
+        assert balancer.stats()["replicas"][bad.name]["ejected"]
+
+        clock.now = 11
+        assert bad in balancer.available()
+
+    def test_ejection_is_capped(self):
+        """No more than max_ejected of the replicas should be ejected at once."""
+        balancer = LoadBalancer(REPLICAS, eject_after=1, max_ejected=0.5)
+        for replica in balancer.replicas:
+            balancer.on_failure(replica)
+        assert len(balancer.available()) == 2
+
+    def test_panic_mode_when_all_unhealthy(self):
+        """With every replica out of rotation, all should be used rather than none."""
+        balancer = LoadBalancer(REPLICAS)
+        for replica in balancer.replicas:
+            replica.healthy = False
+        assert len(balancer.available()) == 3
+
+    def test_rejects_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            LoadBalancer(REPLICAS, strategy="round-robin")
+
+
+class TestBalancedTransport:
+    """Routing requests through BalancedTransport."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_rewritten_to_replica(self):
+        """Requests should reach the chosen replica's host with their path intact."""
+        seen = []
+        balancer = LoadBalancer(["http://api-1.test/base", "http://api-2.test/base"])
+        transport = BalancedTransport(balancer, _replica_transports(seen))
+        async with httpx.AsyncClient(base_url="http://learnai-api", transport=transport) as c:
+            response = await c.get("/api/explore", params={"q": "math"})
+
+        name, host, path = seen[0]
+        assert response.json()["replica"] == name
+        assert host in ("api-1.test", "api-2.test")
+        assert path == "/base/api/explore"
+        assert sum(r.outstanding for r in balancer.replicas) == 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_attempts_avoid_tried_replicas(self):
+        """Inside tried_replicas(), a repeated GET should not go back to the same replica."""
+        seen = []
+        balancer = LoadBalancer(REPLICAS)
+        transport = BalancedTransport(balancer, _replica_transports(seen))
+        async with httpx.AsyncClient(base_url="http://learnai-api", transport=transport) as c:
+            await c.get("/api/explore")
+            await c.get("/api/explore")
+            with tried_replicas() as tried:
+                for _ in range(4):
+                    await c.get("/api/explore")
+
+        names = [name for name, _, _ in seen]
+        assert names[0] == names[1]
+        assert len(set(names[2:5])) == 3
+        assert tried == set(REPLICAS)
+
+    @pytest.mark.asyncio
+    async def test_5xx_responses_eject_replica(self):
+        """A replica answering 5xx should be ejected and traffic move elsewhere."""
+        seen = []
+        first = type("FirstChoice", (), {"choice": staticmethod(lambda seq: seq[0])})()
+        balancer = LoadBalancer(
+            REPLICAS[:2], strategy="least", affinity=False, eject_after=2, rng=first
+        )
+        transport = BalancedTransport(
+            balancer, _replica_transports(seen, status={REPLICAS[0]: 503})
+        )
+        async with httpx.AsyncClient(base_url="http://learnai-api", transport=transport) as c:
+            for _ in range(10):
+                await c.post("/api/bookings", json={})
+
+        assert balancer.stats()["replicas"][REPLICAS[0]]["ejections"] == 1
+        assert [name for name, _, _ in seen[-5:]] == [REPLICAS[1]] * 5
+
+    @pytest.mark.asyncio
+    async def test_health_checks_take_replica_out_of_rotation(self):
+        """Two failed health probes should mark a replica unhealthy; one success restores it."""
+        status = {REPLICAS[0]: 500}
+        balancer = LoadBalancer(REPLICAS[:2])
+        transport = BalancedTransport(balancer, _replica_transports([], status=status))
+
+        await transport.check_health("/api/health")
+        assert balancer.replicas[0].healthy
+        await transport.check_health("/api/health")
+        assert not balancer.replicas[0].healthy
+        assert balancer.available() == [balancer.replicas[1]]
+
+        status.clear()
+        await transport.check_health("/api/health")
+        assert balancer.replicas[0].healthy
+
+
+class TestRetriesAcrossReplicas:
+    """Upstream GET retries from the MCP server with several replicas."""
+
+    @pytest.mark.asyncio
+    async def test_retry_moves_off_failing_affinity_replica(self):
+        """A GET whose affinity replica fails should be retried on another replica."""
+        from learnai_mcp import server
+
+        seen = []
+        balancer = LoadBalancer(REPLICAS[:2])
+        failing = balancer.pick("GET /api/bookings/b-1").name
+        transport = BalancedTransport(
+            balancer, _replica_transports(seen, status={failing: 503})
+        )
+        async with httpx.AsyncClient(base_url="http://learnai-api", transport=transport) as c:
+            with patch.object(server, "_get_client", AsyncMock(return_value=c)):
+                data = await server._call_upstream("GET", "/api/bookings/b-1", "booking", {})
+
+        assert seen[0][0] == failing
+        assert data["replica"] != failing
+        assert len(seen) == 2
+
+
+class TestApiClientReplicas:
+    """ApiClient configured with several replicas."""
+
+    def test_comma_separated_url_builds_balancer(self):
+        api = ApiClient("http://api-1.test, unix:///run/learnai/api.sock")
+        assert api.balancer is not None
+        assert [r.name for r in api.balancer.replicas] == [
+            "http://api-1.test", "unix:///run/learnai/api.sock",
+        ]
+        assert api.stats()["balancer"]["strategy"] == "p2c"
+
+    def test_single_url_has_no_balancer(self):
+        api = ApiClient("http://api.test")
+        assert api.balancer is None
+        assert api.stats()["balancer"] is None
+
+    @pytest.mark.asyncio
+    async def test_start_runs_health_checks(self):
+        """start() should probe replicas periodically until aclose()."""
+        seen = []
+        balancer = LoadBalancer(REPLICAS[:2])
+        api = ApiClient(
+            "http://learnai-api", health_interval=0.01, health_path="/api/health",
+            transport=BalancedTransport(balancer, _replica_transports(seen)),
+        )
+        await api.start()
+        await asyncio.sleep(0.05)
+        await api.aclose()
+
+        probed = {name for name, _, path in seen if path == "/api/health"}
+        assert probed == set(REPLICAS[:2])
+        count = len(seen)
+        await asyncio.sleep(0.03)
+        assert len(seen) == count
@@ -0,0 +1,134 @@
+"""
+MCP Load Shedding Tests
+========================
+Validates bounded wait queues (depth and wait time) in the limiter and
+bulkheads, and the structured "overloaded, retry after" tool error.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import orjson
+import pytest
+from fastmcp import Client
+
+from learnai_mcp.limiter import AdaptiveLimiter, Bulkhead, Overloaded
+
+
+async def _hold(limiter_cm, release):
+    async with limiter_cm:
+        await release.wait()
+
+
+class TestBoundedQueues:
+    """Queue depth and wait limits of AdaptiveLimiter and Bulkhead."""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_immediately(self):
+        """A call arriving at a full queue should fail without waiting."""
+        bulkhead = Bulkhead("recommend", 1, max_queue=1)
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_hold(bulkhead.acquire(), release)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded) as exc:
+            async with bulkhead.acquire():
+                pass
+        assert exc.value.retry_after_ms > 0
+        assert bulkhead.stats()["shed_queue_full"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_wait_beyond_max_wait_is_shed(self):
+        """A queued call should be shed once max_wait elapses, freeing its place."""
+        limiter = AdaptiveLimiter(initial_limit=1, min_limit=1, max_wait=0.01)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(limiter.acquire(), release))
+        await asyncio.sleep(0)
+
+        with pytest.raises(Overloaded, match="queue wait exceeded"):
+            async with limiter.acquire():
+                pass
+        assert limiter.queued == 0
+        assert limiter.stats()["shed_timeout"] == 1
+
+        release.set()
+        await holder
+        async with limiter.acquire(max_wait=0):
+            assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_slot_granted_before_timeout_is_kept(self):
+        """Calls admitted within max_wait should run normally."""
+        bulkhead = Bulkhead("booking", 1, max_wait=1.0)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(bulkhead.acquire(), release))
+        await asyncio.sleep(0)
+        asyncio.get_running_loop().call_later(0.01, release.set)
+
+        async with bulkhead.acquire():
+            assert bulkhead.in_flight == 1
+        await holder
+        assert bulkhead.stats()["shed_timeout"] == 0
+
+
+class TestOverloadedToolResult:
+    """Shed upstream calls surface as structured MCP tool errors."""
+
+    @pytest.mark.asyncio
+    async def test_shed_call_returns_retryable_error(self):
+        """An overloaded upstream queue should yield an overloaded tool error."""
+        from learnai_mcp import server
+
+        with patch(
+            "learnai_mcp.server._api_request", side_effect=Overloaded("booking queue full", 250)
+        ):
+            async with Client(server.mcp) as client:
+                result = await client.call_tool(
+                    "get_booking_status", {"booking_id": "b1"}, raise_on_error=False
+                )
+
+        assert result.is_error
+        payload = orjson.loads(result.content[0].text)
+        assert payload["error"] == "overloaded"
+        assert payload["retry_after_ms"] == 250
+
+    @pytest.mark.asyncio
+    async def test_search_degrades_to_local_catalog(self, mock_professors):
+        """With a local catalog loaded, a shed search should be served locally."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+        with patch("learnai_mcp.server._api_request", side_effect=Overloaded("full", 10)):
+            result = await server.search_professors.fn(subject="Python")
+
+        assert [p.id for p in result.professors] == ["prof-1"]
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_is_bounded_end_to_end(self, mock_http_client):
+        """_send_request should shed once the total queue wait is exceeded."""
+        from learnai_mcp import server
+
+        release = asyncio.Event()
+
+        async def request(method, path, **kwargs):
+            await release.wait()
+
+        mock_http_client.request = request
+        size = server._bulkheads["recommend"].max_concurrent
+        with patch("learnai_mcp.server.LEARNAI_QUEUE_MAX_WAIT", 0.01):
+            holders = [
+                asyncio.create_task(server._send_request("POST", "/x", pool="recommend"))
+                for _ in range(size)
+            ]
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded):
+                await server._send_request("POST", "/x", pool="recommend")
+
+        metrics = await server.server_metrics.fn()
+        assert metrics["bulkheads"]["recommend"]["shed_timeout"] >= 1
+        for task in holders:
+            task.cancel()
+        await asyncio.gather(*holders, return_exceptions=True)
@@ -0,0 +1,142 @@
+"""
+MCP Cursor Pagination Tests
+============================
+Validates opaque keyset cursors, the streaming page pipeline and
+cursor-based paging through search_professors.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+from learnai_mcp.catalog import ProfessorCatalog
+from learnai_mcp.pagination import (
+    InvalidCursor,
+    cursor_scope,
+    decode_cursor,
+    encode_cursor,
+    in_keyset_order,
+)
+
+
+def _rows(count):
+    return [
+        {"id": f"p{i:03d}", "name": f"Prof {i}", "rating": [5.0, 4.5, 4.0][i % 3]}
+        for i in range(count)
+    ]
+
+
+def _upstream(rows):
+    """Fake /api/explore honouring limit and the after_rating/after_id keyset."""
+    ordered = sorted(rows, key=lambda r: (-r["rating"], r["id"]))
+    calls = []
+
+    async def fake_api(method, path, **kwargs):
+        params = kwargs["params"]
+        calls.append(params)
+        matches = ordered
+        if "after_id" in params:
+            rating, last_id = params["after_rating"], params["after_id"]
+            matches = [
+                r for r in ordered
+                if r["rating"] < rating or (r["rating"] == rating and r["id"] > last_id)
+            ]
+        return {"teachers": matches[: params["limit"]]}
+
+    return fake_api, calls, ordered
+
+
+class TestCursors:
+    """Unit tests for cursor encoding."""
+
+    def test_round_trip(self):
+        scope = cursor_scope({"subject": "Math"})
+        cursor = encode_cursor((4.5, "prof-7"), scope)
+        assert decode_cursor(cursor, scope) == (4.5, "prof-7")
+
+    def test_cursor_bound_to_filters(self):
+        """A cursor issued for one query should be rejected by another."""
+        cursor = encode_cursor((4.5, "prof-7"), cursor_scope({"subject": "Math"}))
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, cursor_scope({"subject": "Physics"}))
+
+    def test_malformed_cursor(self):
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not-a-cursor!", cursor_scope({}))
+
+
+class TestKeysetOrder:
+    """Checking that a page continues after a key."""
+
+    def test_page_continuing_after_key(self):
+        assert in_keyset_order([(4.5, "b"), (4.5, "c"), (4.0, "a")], after=(4.5, "a"))
+        assert in_keyset_order([])
+
+    def test_repeated_or_unsorted_rows(self):
+        """Rows at or before the key, or out of order, should be rejected."""
+        assert not in_keyset_order([(5.0, "a"), (4.5, "b")], after=(4.5, "b"))
+        assert not in_keyset_order([(4.0, "a"), (4.5, "b")])
+        assert not in_keyset_order([(4.0, "a"), (4.0, "a")])
+
+
+class TestSearchPagination:
+    """Cursor paging through search_professors."""
+
+    @pytest.mark.asyncio
+    async def test_walks_every_professor_once(self):
+        """Following next_cursor should visit all matches once, in rating order."""
+        from learnai_mcp import server
+
+        fake_api, calls, ordered = _upstream(_rows(23))
+        seen, cursor = [], ""
+        with (
+            patch("learnai_mcp.server._api_request", side_effect=fake_api),
+            patch("learnai_mcp.server._get_catalog", AsyncMock(return_value=None)),
+        ):
+            while True:
+                result = await server.search_professors.fn(limit=10, cursor=cursor)
+                seen.extend(p.id for p in result.professors)
+                if result.next_cursor is None:
+                    break
+                cursor = result.next_cursor
+
+        assert seen == [r["id"] for r in ordered]
+        assert all(c["limit"] == 10 for c in calls)
+
+    @pytest.mark.asyncio
+    async def test_upstream_ignoring_keyset_ends_paging(self):
+        """An upstream that repeats the first page should end paging, not loop over it."""
+        from learnai_mcp import server
+
+        ordered = sorted(_rows(23), key=lambda r: (-r["rating"], r["id"]))
+
+        async def fake_api(method, path, **kwargs):
+            return {"teachers": ordered[: kwargs["params"]["limit"]]}
+
+        with (
+            patch("learnai_mcp.server._api_request", side_effect=fake_api),
+            patch("learnai_mcp.server._get_catalog", AsyncMock(return_value=None)),
+            patch("learnai_mcp.server._catalog", ProfessorCatalog()),
+        ):
+            first = await server.search_professors.fn(limit=10, subject="Math")
+            second = await server.search_professors.fn(
+                limit=10, subject="Math", cursor=first.next_cursor
+            )
+
+        assert first.next_cursor is not None
+        assert second.professors == []
+        assert second.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_is_a_tool_error(self):
+        """Cursors from a different query should fail loudly, not return wrong rows."""
+        from learnai_mcp import server
+
+        cursor = encode_cursor((4.0, "p001"), cursor_scope({"subject": "Physics"}))
+        async with Client(server.mcp) as client:
+            with pytest.raises(ToolError, match="Invalid cursor"):
+                await client.call_tool(
+                    "search_professors", {"subject": "Math", "cursor": cursor}
+                )
@@ -0,0 +1,153 @@
+"""
+MCP Recommendation Cache Tests
+===============================
+Validates query normalization, MinHash/LSH near-duplicate detection, TTL and
+LRU eviction of the near-duplicate cache, and its use by recommend_professors.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from conftest import FakeClock
+
+from learnai_mcp.similarity_cache import NearDuplicateCache, shingles
+from learnai_mcp.text import stem
+
+
+class TestNormalization:
+    def test_stemming(self):
+        """Common inflections should reduce to the same stem."""
+        assert [stem(w) for w in ["exams", "studying", "studies", "classes", "calculus"]] == [
+            "exam", "study", "study", "class", "calculus",
+        ]
+
+    def test_case_stopwords_and_inflections_are_ignored(self):
+        """Rephrasings that only differ in noise words should shingle identically."""
+        assert shingles("Help with my Calc exams!") == shingles("help with calc exam")
+
+
+class TestNearDuplicateCache:
+    """Unit tests for NearDuplicateCache."""
+
+    def test_exact_and_near_hits(self):
+        """Normalized duplicates hit exactly; close rephrasings hit by similarity."""
+        cache = NearDuplicateCache(threshold=0.7)
+        cache.put("python for data science", "A")
+
+        assert cache.lookup("Python for Data Science") == ("A", 1.0)
+        value, similarity = cache.lookup("python data science help")
+        assert value == "A"
+        assert 0.7 <= similarity < 1.0
+        assert cache.lookup("calculus exam prep") is None
+
+        stats = cache.stats()
+        assert (stats["exact_hits"], stats["near_hits"], stats["misses"]) == (1, 1, 1)
+        assert sum(stats["similarity_histogram"].values()) == 2
+
+    @pytest.mark.parametrize(
+        "cached, query",
+        [
+            ("calculus 1 exam help", "calculus 2 exam help"),
+            ("linear algebra for machine learning", "nonlinear algebra for machine learning"),
+            (
+                "python tutor for data science budget 30 per hour",
+                "python tutor for data science budget 80 per hour",
+            ),
+            ("calculus exam help", "calculus 2 exam help"),
+            ("calculus", "calculus exam"),
+        ],
+    )
+    def test_queries_with_different_meaning_miss(self, cached, query):
+        """A different number or substituted word should never reuse a cached result."""
+        cache = NearDuplicateCache()
+        cache.put(cached, "cached")
+
+        assert cache.lookup(query) is None
+
+    @pytest.mark.parametrize(
+        "cached, query",
+        [
+            ("calculus tutor", "find calculus tutor"),
+            ("tutor for organic chemistry", "urgent tutor for organic chemistry"),
+            ("need help with python data science", "help with python data science"),
+        ],
+    )
+    def test_one_word_rephrasing_hits(self, cached, query):
+        """Adding or dropping one filler word should reuse the cached result by default."""
+        cache = NearDuplicateCache()
+        cache.put(cached, "cached")
+
+        value, similarity = cache.lookup(query)
+        assert value == "cached"
+        assert similarity < 1.0
+
+    def test_threshold_is_respected(self):
+        """Candidates below the threshold should miss."""
+        cache = NearDuplicateCache(threshold=0.95)
+        cache.put("python for data science", "A")
+        assert cache.lookup("python data science help") is None
+
+    def test_scope_separates_entries(self):
+        """Entries should only be reused within the same scope."""
+        cache = NearDuplicateCache()
+        cache.put("calculus exam", "five", scope=5)
+        assert cache.lookup("calculus exam", scope=3) is None
+        assert cache.lookup("calculus exam", scope=5) == ("five", 1.0)
+
+    def test_ttl_and_lru_eviction(self):
+        """Entries should expire after ttl and the least recently used is evicted."""
+        clock = FakeClock()
+        cache = NearDuplicateCache(ttl=10, max_entries=2, clock=clock)
+        cache.put("python", 1)
+        cache.put("calculus", 2)
+        cache.lookup("python")
+        cache.put("biology", 3)
+
+        assert cache.lookup("calculus") is None
+        assert cache.stats()["evictions"] == 1
+
+        clock.now = 11
+        assert cache.lookup("python") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 1
+
+    def test_disabled_with_zero_ttl(self):
+        """ttl=0 should disable caching."""
+        cache = NearDuplicateCache(ttl=0)
+        cache.put("python", 1)
+        assert cache.lookup("python") is None
+
+
+class TestRecommendWithCache:
+    """recommend_professors backed by the near-duplicate cache."""
+
+    @pytest.mark.asyncio
+    async def test_rephrased_query_reuses_recommendation(self, mock_professors):
+        """A near-duplicate query should not trigger a second upstream call."""
+        from learnai_mcp import server
+
+        fn = server.recommend_professors.fn
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = {"teachers": mock_professors, "explanation": "ML fit"}
+            first = await fn(query="I need help with calculus for my university exam")
+            second = await fn(query="Need help with calculus for university exams")
+            other_limit = await fn(query="Need help with calculus for university exams", limit=1)
+
+        assert mock_api.await_count == 2
+        assert second.professors == first.professors
+        assert second.query == "Need help with calculus for university exams"
+        assert other_limit.query == second.query
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, mock_professors):
+        """A failed recommendation should be retried on the next call."""
+        from learnai_mcp import server
+
+        fn = server.recommend_professors.fn
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.side_effect = [Exception("down"), {"teachers": mock_professors}]
+            failed = await fn(query="calculus help")
+            recovered = await fn(query="calculus help")
+
+        assert failed.professors == []
+        assert len(recovered.professors) == 2
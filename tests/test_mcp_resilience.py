@@ -0,0 +1,253 @@
+"""
+MCP Upstream Resilience Tests
+==============================
+Validates per-endpoint circuit breakers, jittered GET retries, hedged GETs
+and serving cached results while a circuit is open.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import orjson
+import pytest
+from conftest import FakeClock, make_response
+from fastmcp import Client
+
+from learnai_mcp.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    Resilience,
+    RetryPolicy,
+    endpoint_key,
+)
+
+
+async def _fail(exc):
+    raise exc
+
+
+async def _ok():
+    return "ok"
+
+
+class TestCircuitBreaker:
+    """State transitions of CircuitBreaker."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self):
+        """Consecutive overload failures should open the circuit and fail fast."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("GET /api/explore", failure_threshold=3, clock=clock)
+        for _ in range(3):
+            with pytest.raises(httpx.ConnectError):
+                await breaker.call(lambda: _fail(httpx.ConnectError("down")))
+        assert breaker.state == OPEN
+
+        called = False
+
+        async def probe():
+            nonlocal called
+            called = True
+
+        with pytest.raises(CircuitOpen) as exc:
+            await breaker.call(probe)
+        assert not called
+        assert exc.value.retry_after_ms == 30000
+        assert breaker.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip(self):
+        """A 4xx means the upstream answered and should reset the failure count."""
+        breaker = CircuitBreaker("GET /api/bookings/{id}", failure_threshold=2)
+        not_found = httpx.HTTPStatusError("nf", request=None, response=make_response(404))
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await breaker.call(lambda: _fail(not_found))
+        assert breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_half_open_trial_closes_or_reopens(self):
+        """After reset_timeout one trial goes through; its outcome decides the state."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("x", failure_threshold=1, reset_timeout=10, clock=clock)
+        with pytest.raises(httpx.ConnectError):
+            await breaker.call(lambda: _fail(httpx.ConnectError("down")))
+
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(httpx.ConnectError):
+            await breaker.call(lambda: _fail(httpx.ConnectError("still down")))
+        assert breaker.state == OPEN
+
+        clock.now = 20
+        assert await breaker.call(_ok) == "ok"
+        assert breaker.state == CLOSED
+        assert breaker.stats()["opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_admits_limited_trials(self):
+        """Only half_open_max calls may probe a recovering endpoint at once."""
+        clock = FakeClock()
+        breaker = CircuitBreaker("x", failure_threshold=1, reset_timeout=1, clock=clock)
+        with pytest.raises(httpx.ConnectError):
+            await breaker.call(lambda: _fail(httpx.ConnectError("down")))
+        clock.now = 1
+        release = asyncio.Event()
+
+        async def slow():
+            await release.wait()
+            return "ok"
+
+        trial = asyncio.create_task(breaker.call(slow))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpen):
+            await breaker.call(_ok)
+        release.set()
+        assert await trial == "ok"
+        assert breaker.state == CLOSED
+
+
+def test_endpoint_key_groups_ids():
+    """IDs in paths should collapse so all bookings share one circuit."""
+    assert endpoint_key("get", "/api/bookings/b12") == "GET /api/bookings/{id}"
+    assert endpoint_key("GET", "/api/explore?x=1") == "GET /api/explore"
+
+
+def test_decorrelated_jitter_bounds():
+    """Backoffs should stay within [base, cap] and grow from the previous sleep."""
+    policy = RetryPolicy(attempts=6, base=0.1, cap=1.0, rng=lambda lo, hi: hi)
+    assert policy.backoffs() == pytest.approx([0.3, 0.9, 1.0, 1.0, 1.0])
+    assert RetryPolicy(attempts=1).backoffs() == []
+
+
+class TestResilience:
+    """Retries and hedging in Resilience.call."""
+
+    @pytest.mark.asyncio
+    async def test_retries_idempotent_calls_only(self):
+        """GET-like calls are retried on overload errors; others fail on the first error."""
+        resilience = Resilience(retry=RetryPolicy(attempts=3, base=0, cap=0))
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise httpx.ReadTimeout("slow")
+            return "ok"
+
+        assert await resilience.call("GET /x", flaky, idempotent=True) == "ok"
+        assert resilience.stats()["retries"] == 2
+
+        calls = 0
+        with pytest.raises(httpx.ReadTimeout):
+            await resilience.call("POST /x", flaky, idempotent=False)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stops_retrying_when_circuit_opens(self):
+        """Retries should go through the breaker and stop once it opens."""
+        resilience = Resilience(
+            failure_threshold=2, retry=RetryPolicy(attempts=5, base=0, cap=0)
+        )
+        calls = 0
+
+        async def down():
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("down")
+
+        with pytest.raises(CircuitOpen):
+            await resilience.call("GET /x", down, idempotent=True)
+        assert calls == 2
+        assert resilience.stats()["circuits"]["GET /x"]["state"] == OPEN
+
+    @pytest.mark.asyncio
+    async def test_hedge_after_p95_wins(self):
+        """A stuck first attempt should be overtaken by a hedge sent after p95."""
+        resilience = Resilience(hedge=True)
+        for _ in range(20):
+            resilience.latency("GET /x").record(0.005)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return calls
+
+        result = await asyncio.wait_for(resilience.call("GET /x", fetch, idempotent=True), 1)
+        assert result == 2
+        assert resilience.stats()["hedges"] == 1
+        assert resilience.stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        """Endpoints without enough samples should never be hedged."""
+        resilience = Resilience(hedge=True)
+        assert await resilience.call("GET /x", _ok, idempotent=True) == "ok"
+        assert resilience.stats()["hedges"] == 0
+
+
+class TestServerIntegration:
+    """Resilience wired into the MCP server's upstream calls."""
+
+    @pytest.mark.asyncio
+    async def test_get_is_retried_on_server_error(self, mock_http_client):
+        """A transient 503 on a GET should be retried transparently."""
+        from learnai_mcp import server
+
+        responses = [make_response(503), make_response(json={"status": "confirmed"})]
+
+        async def request(method, path, **kwargs):
+            return responses.pop(0)
+
+        mock_http_client.request = request
+        with patch.object(server._resilience.retry, "base", 0), \
+                patch.object(server._resilience.retry, "cap", 0):
+            status = await server.get_booking_status.fn(booking_id="b1")
+        assert status.status == "confirmed"
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_serves_cached_subjects(self, mock_http_client):
+        """With the circuit open, expired cached results should still be served."""
+        from learnai_mcp import server
+
+        async def request(method, path, **kwargs):
+            return make_response(json={"subjects": ["Physics"]})
+
+        mock_http_client.request = request
+        await server.list_subjects.fn()
+        server._known_subjects = []
+        for entry in server._response_cache._entries.values():
+            entry.expires_at = entry.stale_until = 0
+
+        breaker = server._resilience.breaker("GET /api/explore")
+        breaker._state, breaker._opened_at = OPEN, breaker._clock()
+        result = await server.list_subjects.fn()
+
+        assert result.subjects == ["Physics"]
+        assert server._response_cache.stats()["stale_if_error"] == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_reports_circuit_open_error(self):
+        """Tools should surface an open circuit as a retryable structured error."""
+        from learnai_mcp import server
+
+        with patch(
+            "learnai_mcp.server._api_request",
+            side_effect=CircuitOpen("GET /api/bookings/{id}", 1500),
+        ):
+            async with Client(server.mcp) as client:
+                result = await client.call_tool(
+                    "get_booking_status", {"booking_id": "b1"}, raise_on_error=False
+                )
+
+        payload = orjson.loads(result.content[0].text)
+        assert payload["error"] == "circuit_open"
+        assert payload["retry_after_ms"] == 1500
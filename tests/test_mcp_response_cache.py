@@ -0,0 +1,140 @@
+"""
+MCP Response Cache Tests
+=========================
+Validates TTL expiry, LRU/size eviction, stale-while-revalidate and the
+cache integration of the read-only MCP tools.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from conftest import FakeClock
+
+from learnai_mcp.cache import ResponseCache
+
+
+class TestResponseCache:
+    """Unit tests for ResponseCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_miss(self):
+        """Second lookup for the same key should not call the loader."""
+        cache = ResponseCache(ttl=10)
+        loader = AsyncMock(return_value={"v": 1})
+
+        assert await cache.get_or_load("k", loader) == {"v": 1}
+        assert await cache.get_or_load("k", loader) == {"v": 1}
+
+        assert loader.await_count == 1
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_count(self):
+        """Least-recently-used entries should be evicted first."""
+        cache = ResponseCache(ttl=10, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        await cache.get_or_load("a", AsyncMock())  # touch "a"
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_eviction_by_size(self):
+        """Total entry size should stay under max_bytes."""
+        cache = ResponseCache(ttl=10, max_bytes=10, sizeof=lambda v: v)
+        cache.set("a", 6)
+        cache.set("b", 6)
+
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 6
+
+        cache.set("huge", 11)
+        assert cache.get("huge") is None
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Expired entries should be served immediately and refreshed in the background."""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, stale_ttl=30, clock=clock)
+        cache.set("k", "old")
+        clock.now = 15
+
+        loader = AsyncMock(return_value="new")
+        assert await cache.get_or_load("k", loader) == "old"
+        await asyncio.sleep(0)
+
+        assert loader.await_count == 1
+        assert cache.get("k") == "new"
+        assert cache.stats()["stale_hits"] == 1
+        assert cache.stats()["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_past_stale_window_is_a_miss(self):
+        """Entries beyond the stale window should be reloaded synchronously."""
+        clock = FakeClock()
+        cache = ResponseCache(ttl=10, stale_ttl=5, clock=clock)
+        cache.set("k", "old")
+        clock.now = 20
+
+        assert await cache.get_or_load("k", AsyncMock(return_value="new")) == "new"
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_loads(self):
+        """ttl=0 should bypass the cache entirely."""
+        cache = ResponseCache(ttl=0)
+        loader = AsyncMock(return_value=1)
+        await cache.get_or_load("k", loader)
+        await cache.get_or_load("k", loader)
+        assert loader.await_count == 2
+        assert len(cache) == 0
+
+
+class TestToolCaching:
+    """Cache integration of the read-only MCP tools."""
+
+    @pytest.mark.asyncio
+    async def test_search_professors_cached_by_normalized_args(self, mock_professors):
+        """Equivalent search arguments should share one upstream call."""
+        from learnai_mcp.server import search_professors
+
+        fn = search_professors.fn
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = {"teachers": mock_professors}
+            first = await fn(subject="Python", limit=5)
+            second = await fn(subject="  Python ", limit=5, min_rating=0.0)
+
+        assert mock_api.await_count == 1
+        assert first.total == second.total == 2
+
+    @pytest.mark.asyncio
+    async def test_search_errors_not_cached(self, mock_professors):
+        """A failed upstream call should not poison the cache."""
+        from learnai_mcp.server import search_professors
+
+        fn = search_professors.fn
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.side_effect = [Exception("boom"), {"teachers": mock_professors}]
+            assert (await fn(subject="Physics")).total == 0
+            assert (await fn(subject="Physics")).total == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics_resource_reports_cache(self):
+        """The metrics resource should expose cache counters."""
+        from learnai_mcp.server import list_subjects, server_metrics
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api:
+            mock_api.return_value = {"subjects": ["Math"]}
+            await list_subjects.fn()
+            await list_subjects.fn()
+
+        metrics = await server_metrics.fn()
+        assert metrics["response_cache"]["hits"] == 1
+        assert metrics["response_cache"]["misses"] == 1
@@ -0,0 +1,93 @@
+"""
+Production Runner Tests
+========================
+Validates the multi-worker serving options shared by the MCP server's HTTP
+transport and the A2A agent.
+"""
+
+import argparse
+import os
+from unittest.mock import patch
+
+import pytest
+from starlette.applications import Starlette
+
+from learnai_mcp import runner
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    runner.add_arguments(parser)
+    return parser.parse_args(list(argv))
+
+
+class TestUvicornOptions:
+    """Translation of command-line options into uvicorn settings."""
+
+    def test_defaults_single_process(self):
+        options = runner.uvicorn_options(_args())
+        assert options["workers"] == 1
+        assert options["loop"] == "auto" and options["http"] == "auto"
+        assert options["timeout_graceful_shutdown"] == 30
+        assert "limit_max_requests" not in options
+
+    def test_zero_workers_means_one_per_usable_core(self):
+        with patch("os.sched_getaffinity", return_value={0, 1, 2}, create=True), \
+                patch("os.cpu_count", return_value=12):
+            assert runner.uvicorn_options(_args("--workers", "0"))["workers"] == 3
+
+    def test_recycling_with_jitter(self):
+        """Workers should be recycled with jitter so they do not restart together."""
+        options = runner.uvicorn_options(_args("--workers", "4", "--max-requests", "10000"))
+        assert options["limit_max_requests"] == 10000
+        assert options["limit_max_requests_jitter"] == 1000
+
+    def test_recycling_needs_a_supervisor(self, caplog):
+        """A lone process is never restarted, so recycling it would stop the server."""
+        options = runner.uvicorn_options(_args("--max-requests", "10000"))
+        assert "limit_max_requests" not in options
+        assert "--max-requests is ignored" in caplog.text
+
+    def test_rejects_unknown_loop(self):
+        with pytest.raises(SystemExit):
+            _args("--loop", "trio")
+
+
+class TestEntryPoints:
+    """Both servers start through the runner with an importable app."""
+
+    def test_mcp_http_transport_uses_factory(self):
+        from learnai_mcp import server
+
+        argv = ["learnai-mcp", "--transport", "http", "--workers", "3"]
+        with patch("learnai_mcp.runner.uvicorn.run") as run, patch("sys.argv", argv), \
+                patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("FASTMCP_STATELESS_HTTP", None)
+            server.main()
+            stateless = os.environ.get("FASTMCP_STATELESS_HTTP")
+
+        assert run.call_args.args == ("learnai_mcp.server:http_app",)
+        assert run.call_args.kwargs["factory"] is True
+        assert run.call_args.kwargs["workers"] == 3
+        assert stateless == "true"
+
+    def test_single_worker_keeps_sessions(self):
+        from learnai_mcp import server
+
+        argv = ["learnai-mcp", "--transport", "http"]
+        with patch("learnai_mcp.runner.uvicorn.run"), patch("sys.argv", argv), \
+                patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("FASTMCP_STATELESS_HTTP", None)
+            server.main()
+            assert "FASTMCP_STATELESS_HTTP" not in os.environ
+
+    def test_http_app_restores_snapshot_per_worker(self):
+        from learnai_mcp import server
+
+        with patch.object(server, "_restore_snapshot") as restore:
+            app = server.http_app()
+
+        restore.assert_called_once()
+        assert isinstance(app, Starlette)
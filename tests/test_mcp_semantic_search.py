@@ -0,0 +1,158 @@
+"""
+MCP Semantic Search Tests
+==========================
+Validates the hashing embedder, the IVF index (recall, incremental updates,
+mmap persistence), query micro-batching and the semantic_search_professors tool.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from learnai_mcp.semantic import HashingEmbedder, IVFIndex, MicroBatcher, SemanticIndex
+from learnai_mcp.server import ProfessorInfo
+
+
+@pytest.fixture
+def index(mock_professors):
+    index = SemanticIndex()
+    index.rebuild(ProfessorInfo(**p) for p in mock_professors)
+    return index
+
+
+class TestHashingEmbedder:
+    def test_vectors_are_normalized_and_deterministic(self):
+        """Embeddings should be unit length and stable across instances."""
+        a = HashingEmbedder().embed(["linear algebra", ""])
+        b = HashingEmbedder().embed(["linear algebra", ""])
+        assert a.dtype == np.float32
+        assert np.allclose(a, b)
+        assert np.isclose(np.linalg.norm(a[0]), 1.0)
+        assert not a[1].any()
+
+    def test_partial_words_stay_close(self):
+        """Character n-grams should make 'calc' closer to calculus than to biology."""
+        q, calculus, biology = HashingEmbedder().embed(["calc", "calculus", "biology"])
+        assert q @ calculus > q @ biology
+
+
+class TestIVFIndex:
+    def test_recall_against_exact_search(self):
+        """Probing a handful of lists should recover most exact neighbours."""
+        rng = np.random.default_rng(0)
+        centers = rng.normal(size=(20, 32))
+        vectors = centers[rng.integers(0, 20, 2000)] + 0.3 * rng.normal(size=(2000, 32))
+        vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+        ids = [f"v{i}" for i in range(len(vectors))]
+        index = IVFIndex(32)
+        index.build(ids, vectors)
+
+        queries = vectors[:50]
+        exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+        results = index.search(queries, k=10, n_probe=8)
+        recall = np.mean([
+            len({ids[j] for j in row} & {doc_id for doc_id, _ in hits}) / 10
+            for row, hits in zip(exact, results)
+        ])
+        assert index.n_lists > 1
+        assert recall > 0.9
+
+
+class TestSemanticIndex:
+    """Unit tests for SemanticIndex."""
+
+    def test_paraphrased_query_ranks_best_match_first(self, index):
+        """A goal phrased differently from the bio should still match."""
+        hits = index.search(["help with calc and algebra homework"])[0]
+        assert hits[0][0] == "prof-2"
+
+    def test_batched_queries(self, index):
+        """Each query in a batch should get its own ranking."""
+        ml, maths = index.search(["deep learning with python", "calculus"], limit=1)
+        assert [d for d, _ in ml] == ["prof-1"]
+        assert [d for d, _ in maths] == ["prof-2"]
+
+    def test_incremental_updates(self, index):
+        """Upserts should replace old vectors; removals should hide rows."""
+        index.upsert([ProfessorInfo(id="prof-2", subjects=["Organic Chemistry"])])
+        assert index.search(["organic chemistry"], limit=1)[0][0][0] == "prof-2"
+        assert dict(index.search(["calculus"])[0])["prof-2"] < 0.1  # old vector is gone
+        assert len(index) == 2
+
+        index.remove(["prof-2"])
+        assert [d for d, _ in index.search(["organic chemistry"])[0]] == ["prof-1"]
+        assert len(index) == 1
+
+    def test_save_and_mmap_load(self, index, tmp_path):
+        """A saved index should load memory-mapped and answer identically."""
+        path = tmp_path / "semantic"
+        index.save(path)
+        index.save(path)  # replacing an existing index
+        loaded = SemanticIndex()
+
+        assert loaded.load(path)
+        assert isinstance(loaded._index._vectors, np.memmap)
+        assert loaded.search(["calculus"]) == index.search(["calculus"])
+
+    def test_load_rejects_other_embedder(self, index, tmp_path):
+        """Indexes built in another embedding space should not be loaded."""
+        index.save(tmp_path / "semantic")
+        assert not SemanticIndex(HashingEmbedder(dim=64)).load(tmp_path / "semantic")
+        assert not SemanticIndex().load(tmp_path / "missing")
+
+
+class TestMicroBatcher:
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_a_batch(self):
+        """Queries submitted together should reach the handler as one batch."""
+        seen = []
+
+        async def handler(queries):
+            seen.append(list(queries))
+            return [q.upper() for q in queries]
+
+        batcher = MicroBatcher(handler, max_batch=2)
+        results = await asyncio.gather(*(batcher.submit(q) for q in "abc"))
+
+        assert results == ["A", "B", "C"]
+        assert seen == [["a", "b"], ["c"]]
+
+
+class TestSemanticSearchTool:
+    """The semantic_search_professors MCP tool."""
+
+    @pytest.mark.asyncio
+    async def test_tool_builds_index_and_filters(self, mock_professors):
+        """The first query should build the index; filters apply to neighbours."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+        with patch.object(server, "_catalog_loaded_at", 0.0), \
+                patch("learnai_mcp.server._schedule_catalog_refresh"):
+            result = await server.semantic_search_professors.fn(query="calculus exam prep")
+            filtered = await server.semantic_search_professors.fn(
+                query="calculus exam prep", language="spanish"
+            )
+
+        assert result.professors[0].id == "prof-2"
+        assert [p.id for p in filtered.professors] == ["prof-1"]
+        assert not server._semantic_stale
+
+    @pytest.mark.asyncio
+    async def test_deltas_update_built_index(self, mock_professors):
+        """Delta rows should be applied to a built index without a rebuild."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+        with patch.object(server, "_catalog_loaded_at", 0.0), \
+                patch("learnai_mcp.server._schedule_catalog_refresh"):
+            await server.semantic_search_professors.fn(query="python")
+            await server._apply_catalog_rows(
+                [{"id": "prof-3", "subjects": ["Astronomy"], "rating": 4.0}], full=False
+            )
+            result = await server.semantic_search_professors.fn(query="astronomy", limit=1)
+
+        assert not server._semantic_stale
+        assert [p.id for p in result.professors] == ["prof-3"]
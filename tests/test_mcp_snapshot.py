@@ -0,0 +1,110 @@
+"""
+MCP Catalog Snapshot Tests
+===========================
+Validates the on-disk catalog snapshot format and how the MCP server uses
+it for warm starts and upstream-outage serving.
+"""
+
+import struct
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from learnai_mcp.snapshot import SnapshotError, read_snapshot, write_snapshot
+
+
+class TestSnapshotFile:
+    """Unit tests for snapshot read/write."""
+
+    def test_roundtrip(self, tmp_path, mock_professors):
+        """A written snapshot should read back unchanged."""
+        path = tmp_path / "catalog.snap"
+        write_snapshot(path, mock_professors, ["Mathematics"], created_at=1000.0)
+
+        snapshot = read_snapshot(path)
+        assert snapshot.professors == mock_professors
+        assert snapshot.subjects == ["Mathematics"]
+        assert snapshot.created_at == 1000.0
+
+    def test_missing_file_returns_none(self, tmp_path):
+        """A missing snapshot is not an error."""
+        assert read_snapshot(tmp_path / "absent.snap") is None
+
+    def test_replace_leaves_no_temp_files(self, tmp_path, mock_professors):
+        """Rewriting a snapshot should atomically replace the old file."""
+        path = tmp_path / "catalog.snap"
+        write_snapshot(path, mock_professors, [])
+        write_snapshot(path, mock_professors[:1], [])
+
+        assert [p.name for p in tmp_path.iterdir()] == ["catalog.snap"]
+        assert len(read_snapshot(path).professors) == 1
+
+    def test_corrupt_payload_rejected(self, tmp_path, mock_professors):
+        """A payload that fails its checksum should raise SnapshotError."""
+        path = tmp_path / "catalog.snap"
+        write_snapshot(path, mock_professors, [])
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="checksum"):
+            read_snapshot(path)
+
+    def test_unknown_format_version_rejected(self, tmp_path, mock_professors):
+        """Snapshots from another format version should not be loaded."""
+        path = tmp_path / "catalog.snap"
+        write_snapshot(path, mock_professors, [])
+        data = bytearray(path.read_bytes())
+        struct.pack_into("<H", data, 8, 99)
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(SnapshotError, match="version"):
+            read_snapshot(path)
+
+
+class TestServerSnapshot:
+    """Warm start and outage serving in the MCP server."""
+
+    @pytest.fixture
+    def snapshot_path(self, tmp_path):
+        from learnai_mcp import server
+
+        path = tmp_path / "catalog.snap"
+        with patch.object(server, "LEARNAI_SNAPSHOT_PATH", str(path)):
+            yield path
+
+    @pytest.mark.asyncio
+    async def test_outage_served_from_restored_snapshot(self, snapshot_path, mock_professors):
+        """After a restore, upstream failures should be answered from the snapshot."""
+        from learnai_mcp import server
+
+        write_snapshot(snapshot_path, mock_professors, ["Calculus", "Python"])
+        assert server._restore_snapshot()
+
+        with patch("learnai_mcp.server._api_request", new_callable=AsyncMock) as mock_api, \
+                patch("learnai_mcp.server._schedule_catalog_refresh"):
+            mock_api.side_effect = Exception("Connection refused")
+            search = await server.search_professors.fn(subject="Calculus")
+            subjects = await server.list_subjects.fn()
+
+        assert [p.id for p in search.professors] == ["prof-2"]
+        assert subjects.subjects == ["Calculus", "Python"]
+
+    @pytest.mark.asyncio
+    async def test_catalog_load_persists_snapshot(self, snapshot_path, mock_professors):
+        """A successful catalog load should write a snapshot."""
+        from learnai_mcp import server
+
+        await server._apply_catalog_rows(mock_professors, full=True)
+
+        snapshot = read_snapshot(snapshot_path)
+        assert [p["id"] for p in snapshot.professors] == ["prof-1", "prof-2"]
+        assert "Linear Algebra" in snapshot.subjects
+
+    def test_corrupt_snapshot_ignored(self, snapshot_path):
+        """A corrupt snapshot should be ignored rather than crash startup."""
+        from learnai_mcp import server
+
+        snapshot_path.write_bytes(b"garbage")
+        assert server._restore_snapshot() is False
+        assert len(server._catalog) == 0
@@ -0,0 +1,96 @@
+"""
+MCP Result View Tests
+======================
+Validates the compact/card/full projections of professor results, bio
+summaries, and that cached results serve every view.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from conftest import make_response
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+
+class TestSummarize:
+    """Unit tests for bio summaries."""
+
+    def test_short_bio_unchanged(self):
+        from learnai_mcp.server import _summarize
+
+        assert _summarize("Calculus  and\nalgebra.") == "Calculus and algebra."
+        assert _summarize(None) == ""
+
+    def test_long_bio_cut_at_word(self):
+        """Long bios should be cut at a word boundary within the limit."""
+        from learnai_mcp.server import _summarize
+
+        summary = _summarize("Expert in machine learning, deep learning and statistics", limit=30)
+        assert summary == "Expert in machine learning…"
+        assert len(summary) <= 30
+
+
+class TestProjection:
+    """Views applied to search and recommendation results."""
+
+    def test_views_keep_only_their_fields(self, mock_professors):
+        from learnai_mcp.server import ProfessorInfo, SearchResult, _project
+
+        result = SearchResult(
+            professors=[ProfessorInfo(**p) for p in mock_professors], total=2, query="q"
+        )
+        assert _project(result, "full") is result
+
+        compact = _project(result, "compact").model_dump()["professors"][0]
+        assert set(compact) == {"id", "name", "rating", "hourly_rate"}
+
+        card = _project(result, "card").model_dump()["professors"][0]
+        assert "bio" not in card and "image" not in card
+        assert card["summary"] == mock_professors[0]["bio"]
+        assert card["subjects"] == mock_professors[0]["subjects"]
+
+    @pytest.mark.asyncio
+    async def test_tool_returns_requested_view(self, mock_http_client, mock_professors):
+        """search_professors should honour view and reuse one cached upstream result."""
+        from learnai_mcp import server
+
+        mock_http_client.request = AsyncMock(
+            return_value=make_response(json={"teachers": mock_professors})
+        )
+        with patch.object(server, "_get_catalog", AsyncMock(return_value=None)):
+            async with Client(server.mcp) as client:
+                compact = await client.call_tool(
+                    "search_professors", {"subject": "math", "view": "compact"}
+                )
+                full = await client.call_tool("search_professors", {"subject": "math"})
+
+        assert set(compact.structured_content["professors"][0]) == {
+            "id", "name", "rating", "hourly_rate",
+        }
+        assert full.structured_content["professors"][0]["bio"] == mock_professors[0]["bio"]
+        assert mock_http_client.request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_recommendation_projected(self, mock_http_client, mock_professors):
+        """A cached recommendation should still be projected to the requested view."""
+        from learnai_mcp import server
+
+        mock_http_client.request = AsyncMock(
+            return_value=make_response(json={"teachers": mock_professors, "explanation": "ok"})
+        )
+        full = await server.recommend_professors.fn(query="calculus help")
+        card = await server.recommend_professors.fn(query="calculus help", view="card")
+
+        assert mock_http_client.request.await_count == 1
+        assert isinstance(full.professors[0], server.ProfessorInfo)
+        assert isinstance(card.professors[0], server.ProfessorCard)
+        assert card.explanation == "ok"
+
+    @pytest.mark.asyncio
+    async def test_unknown_view_rejected(self):
+        from learnai_mcp import server
+
+        async with Client(server.mcp) as client:
+            with pytest.raises(ToolError):
+                await client.call_tool("search_professors", {"view": "tiny"})
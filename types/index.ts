@@ -199,6 +199,14 @@ export interface ProfessorRecommendationResponse {
   explanation: string;
 }
 
+/**
+ * One line of a streamed professor recommendation (NDJSON): the matching
+ * teachers first, then the explanation in pieces as the model writes it
+ */
+export type ProfessorRecommendationChunk =
+  | { teachers: TeacherPublicInfo[] }
+  | { explanation: string };
+
 // ============================================================================
 // API Response Types
 // ============================================================================